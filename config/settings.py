@@ -2,9 +2,8 @@ import os
 from pathlib import Path
 from decouple import config # Untuk membaca .env
 import dj_database_url # Untuk database Render
-import cloudinary  # <--- TAMBAHKAN INI
-import cloudinary.uploader # <--- TAMBAHKAN INI
-import cloudinary.api
+# Hanya cloudinary.config(); uploader/api di-import oleh kode yang memakainya
+import cloudinary
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -13,6 +12,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = config('SECRET_KEY')
 DEBUG = os.environ.get('DEBUG', 'True') == 'True'
 ALLOWED_HOSTS = ['*']
+# Domain publik, dipakai untuk isi QR tiket
+SITE_DOMAIN = config('SITE_DOMAIN', default='portalevent.onrender.com')
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -32,8 +33,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'events.metrics.MetricsMiddleware', # Paling atas agar latency mencakup semua middleware
+    'events.tracing.TracingMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware', # <--- WAJIB: Di bawah SecurityMiddleware
+    'events.middleware.StaticFilesMiddleware', # WhiteNoise async-capable; WAJIB di bawah SecurityMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -82,6 +85,25 @@ if DATABASE_URL:
         conn_health_checks=True,
     )
 
+# Cache: default locmem per proses; set REDIS_URL agar cache dibagi antar worker
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portalevent',
+    }
+}
+REDIS_URL = config('REDIS_URL', default=None)
+if REDIS_URL:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+
+# Cache halaman publik (home & event_detail), lihat events/pagecache.py
+PAGE_CACHE_ALIAS = config('PAGE_CACHE_ALIAS', default='default')
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=300, cast=int)
+HOME_PAGE_SIZE = 12
+
 AUTH_USER_MODEL = 'events.User'
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -131,6 +153,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # 4. Konfigurasi Email & Telegram (Ambil dari .env)
 TELEGRAM_BOT_TOKEN = config('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = config('TELEGRAM_CHAT_ID')
+TELEGRAM_API_URL = config('TELEGRAM_API_URL', default='https://api.telegram.org')
+TELEGRAM_CONNECT_TIMEOUT = config('TELEGRAM_CONNECT_TIMEOUT', default=3.05, cast=float)
+TELEGRAM_READ_TIMEOUT = config('TELEGRAM_READ_TIMEOUT', default=10, cast=float)
+TELEGRAM_MAX_RETRIES = config('TELEGRAM_MAX_RETRIES', default=3, cast=int)
+# Kunci induk tanda tangan tiket offline (default: SECRET_KEY); tiket berlaku s.d. N jam setelah acara
+TICKET_SIGNING_KEY = config('TICKET_SIGNING_KEY', default='')
+TICKET_VALID_HOURS_AFTER_EVENT = config('TICKET_VALID_HOURS_AFTER_EVENT', default=24, cast=int)
+# Umur token perangkat scanner check-in (detik), lihat events/checkin.py
+SCANNER_TOKEN_MAX_AGE = config('SCANNER_TOKEN_MAX_AGE', default=60 * 60 * 24 * 7, cast=int)
+# Token Bearer untuk Prometheus men-scrape /metrics (superuser selalu boleh)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+# > 0: notifikasi event pending digabung jadi satu pesan per N detik
+TELEGRAM_DIGEST_SECONDS = config('TELEGRAM_DIGEST_SECONDS', default=0, cast=int)
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -139,6 +174,13 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 
+# Blast email: jumlah penerima per koneksi SMTP & batas kirim (email/detik, 0 = tanpa batas)
+BLAST_EMAIL_CHUNK_SIZE = config('BLAST_EMAIL_CHUNK_SIZE', default=100, cast=int)
+BLAST_EMAIL_RATE_LIMIT = config('BLAST_EMAIL_RATE_LIMIT', default=5, cast=float)
+
+# Jumlah proses untuk render sertifikat massal (ZIP); 0 = sesuai jumlah CPU
+CERTIFICATE_WORKERS = config('CERTIFICATE_WORKERS', default=0, cast=int)
+
 if not DEBUG:
     # --- PROD (RENDER) ---
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
@@ -175,7 +217,36 @@ cloudinary.config(
 
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
+# Pipeline gambar (events/images.py): upload mentah ke folder temp lokal, varian hasil worker ke IMAGE_STORAGE.
+# Worker harus bisa membaca IMAGE_UPLOAD_TEMP_DIR (host/volume yang sama dengan web).
+IMAGE_STORAGE = config('IMAGE_STORAGE', default='cloudinary_storage.storage.MediaCloudinaryStorage')
+IMAGE_UPLOAD_TEMP_DIR = config('IMAGE_UPLOAD_TEMP_DIR', default=os.path.join(BASE_DIR, 'media', 'uploads-tmp'))
+IMAGE_MAX_UPLOAD_MB = config('IMAGE_MAX_UPLOAD_MB', default=15, cast=int)
+
 STATICFILES_FINDERS = [
     'django.contrib.staticfiles.finders.FileSystemFinder',
     'django.contrib.staticfiles.finders.AppDirectoriesFinder',
-]
\ No newline at end of file
+]
+
+# Tracing (events/tracing.py): trace lambat selalu dilog, sisanya disampling
+TRACE_SAMPLE_RATE = config('TRACE_SAMPLE_RATE', default=0.01, cast=float)
+TRACE_SLOW_MS = config('TRACE_SLOW_MS', default=1000, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        # Pesan tracing sudah berupa JSON satu baris
+        'raw': {'format': '%(message)s'},
+        'simple': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+    },
+    'handlers': {
+        'trace_console': {'class': 'logging.StreamHandler', 'formatter': 'raw'},
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'simple'},
+    },
+    'loggers': {
+        'events.tracing': {'handlers': ['trace_console'], 'level': 'INFO', 'propagate': False},
+        # Log worker/notifikasi (kirim email, Telegram)
+        'events': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User, Event, Participant
+from .models import User, Event, Participant, Attendance, Blacklist, Job, BlastCampaign, WaitlistEntry
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
@@ -7,11 +7,45 @@ class UserAdmin(admin.ModelAdmin):
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('title', 'organizer', 'date_time', 'price')
+    list_display = ('title', 'organizer', 'date_time', 'price', 'capacity', 'participant_count')
     # Exclude slug karena auto-generate
     exclude = ('slug',) 
+    # Counter diisi otomatis, jangan diedit manual
+    readonly_fields = ('participant_count', 'verified_count', 'revenue')
 
 @admin.register(Participant)
 class ParticipantAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'event', 'is_verified', 'registered_at')
-    list_filter = ('event', 'is_verified')
\ No newline at end of file
+    list_filter = ('event', 'is_verified')
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'status', 'attempts', 'next_run_at', 'created_at')
+    list_filter = ('status', 'task')
+
+
+@admin.register(BlastCampaign)
+class BlastCampaignAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'event', 'status', 'sent', 'failed', 'total', 'created_at')
+    list_filter = ('status',)
+
+
+@admin.register(Blacklist)
+class BlacklistAdmin(admin.ModelAdmin):
+    list_display = ('email', 'reason', 'created_at')
+    search_fields = ('email',)
+
+
+@admin.register(Attendance)
+class AttendanceAdmin(admin.ModelAdmin):
+    list_display = ('participant', 'event', 'checked_in_at', 'checked_in_by', 'device')
+    list_filter = ('event',)
+    list_select_related = ('participant', 'event', 'checked_in_by')
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('full_name', 'email', 'event', 'status', 'created_at')
+    list_filter = ('status', 'event')
+    list_select_related = ('event',)
+    readonly_fields = ('participant', 'payment_proof_variants')
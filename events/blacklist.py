@@ -0,0 +1,167 @@
+"""
+Pencocokan blacklist di memori proses.
+
+Format aturan (kolom Blacklist.email):
+- `budi@spam.com`        -> alamat persis
+- `@spam.com`            -> semua alamat di domain spam.com (tanpa subdomain)
+- `*.spam.com` / `@*.spam.com` -> semua subdomain spam.com (mail.spam.com, a.b.spam.com)
+
+Alamat persis disimpan di set, aturan domain di trie dengan label terbalik
+(com -> spam -> mail), jadi lookup = O(jumlah label domain), bukan O(jumlah aturan).
+Matcher dibangun sekali per proses dan dibangun ulang jika versi di cache
+berubah (dinaikkan oleh signal save/delete Blacklist) atau umurnya lewat
+MATCHER_TTL: tanpa REDIS_URL cache default adalah locmem per proses, jadi versi
+yang dinaikkan satu worker tidak terlihat oleh worker lain.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = 'blacklist:version'
+# Umur maksimum matcher per proses (detik), batas basi jika cache tidak dipakai bersama
+MATCHER_TTL = 60
+
+_EXACT = '$'      # penanda: domain ini sendiri diblok
+_WILDCARD = '*'   # penanda: semua subdomain di bawah node ini diblok
+
+
+def parse_rule(pattern):
+    """
+    Normalisasi satu aturan. Return ('email', alamat) atau ('domain', domain, wildcard).
+    ValueError jika formatnya tidak dikenali.
+    """
+    value = (pattern or '').strip().lower()
+    if value.startswith('*@'):
+        value = value[1:]
+
+    if '@' in value and not value.startswith('@'):
+        local, _, domain = value.rpartition('@')
+        if not local or not _valid_domain(domain):
+            raise ValueError(f"Alamat email tidak valid: {pattern!r}")
+        return ('email', value)
+
+    domain = value.lstrip('@')
+    wildcard = domain.startswith('*.')
+    if wildcard:
+        domain = domain[2:]
+    if not _valid_domain(domain):
+        raise ValueError(f"Domain tidak valid: {pattern!r}")
+    return ('domain', domain, wildcard)
+
+
+def _valid_domain(domain):
+    labels = domain.split('.')
+    return len(labels) >= 2 and all(labels) and '*' not in domain and '@' not in domain
+
+
+class DomainTrie:
+    """Trie domain dengan label terbalik: 'mail.spam.com' disimpan sebagai com -> spam -> mail."""
+
+    def __init__(self):
+        self.root = {}
+        self.size = 0
+
+    def add(self, domain, wildcard=False):
+        node = self.root
+        for label in reversed(domain.split('.')):
+            node = node.setdefault(label, {})
+        marker = _WILDCARD if wildcard else _EXACT
+        if marker not in node:
+            node[marker] = True
+            self.size += 1
+
+    def match(self, domain):
+        node = self.root
+        labels = domain.split('.')
+        for depth, label in enumerate(reversed(labels), start=1):
+            node = node.get(label)
+            if node is None:
+                return False
+            # Wildcard hanya berlaku jika masih ada label di kiri (subdomain)
+            if _WILDCARD in node and depth < len(labels):
+                return True
+        return _EXACT in node
+
+    def __len__(self):
+        return self.size
+
+
+class BlacklistMatcher:
+    def __init__(self, patterns=()):
+        self.emails = set()
+        self.domains = DomainTrie()
+        self.invalid = 0
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern):
+        try:
+            rule = parse_rule(pattern)
+        except ValueError:
+            self.invalid += 1
+            return
+        if rule[0] == 'email':
+            self.emails.add(rule[1])
+        else:
+            self.domains.add(rule[1], wildcard=rule[2])
+
+    def is_blocked(self, email):
+        email = (email or '').strip().lower()
+        if email in self.emails:
+            return True
+        _, _, domain = email.rpartition('@')
+        return bool(domain) and self.domains.match(domain)
+
+    def __len__(self):
+        return len(self.emails) + len(self.domains)
+
+
+# --- Cache per proses ---
+_lock = threading.Lock()
+_matcher = None
+_matcher_version = None
+_matcher_loaded = 0.0
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(VERSION_KEY, version, None):
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def invalidate():
+    """Naikkan versi; semua proses membangun ulang matcher pada lookup berikutnya."""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def load_matcher():
+    from .models import Blacklist
+    return BlacklistMatcher(Blacklist.objects.values_list('email', flat=True).iterator(chunk_size=5000))
+
+
+def _is_fresh(version):
+    return (
+        _matcher is not None and _matcher_version == version
+        and time.monotonic() - _matcher_loaded < MATCHER_TTL
+    )
+
+
+def get_matcher():
+    global _matcher, _matcher_version, _matcher_loaded
+    version = current_version()
+    if _is_fresh(version):
+        return _matcher
+    with _lock:
+        if not _is_fresh(version):
+            _matcher = load_matcher()
+            _matcher_version = version
+            _matcher_loaded = time.monotonic()
+    return _matcher
+
+
+def is_blocked(email):
+    return get_matcher().is_blocked(email)
@@ -0,0 +1,127 @@
+"""
+Mesin blast email: alamat peserta dibaca per chunk (keyset by id), satu koneksi
+SMTP dipakai untuk satu chunk, dan setiap peserta menerima email pribadi
+(tidak ada lagi daftar penerima yang saling terlihat di kolom To:).
+
+Tiap chunk diklaim dengan memajukan cursor (dan `processed`, dasar progress) sebelum
+dikirim (compare-and-set), lalu job memanggil heartbeat. Job yang diulang (retry / dikira yatim) melanjutkan dari
+cursor dan tidak pernah mengirim chunk yang sama dua kali; jika worker mati di tengah
+chunk, sisa chunk itu dilewati (lebih baik daripada email ganda ke peserta).
+"""
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from . import jobs, tracing
+from .models import BlastCampaign, Participant
+
+
+def personalize(text, name):
+    # Placeholder sederhana, sengaja tidak pakai str.format agar kurung kurawal lain aman
+    return text.replace('{nama}', name)
+
+
+class Throttle:
+    """Batasi laju kirim ke `rate` email per detik (0 / None = tanpa batas)."""
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate else 0
+        self.clock = clock
+        self.sleep = sleep
+        self.next_at = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = self.clock()
+        if self.next_at is not None and now < self.next_at:
+            self.sleep(self.next_at - now)
+            now = self.next_at
+        self.next_at = now + self.interval
+
+
+@tracing.traced('smtp.blast_chunk')
+def send_chunk(campaign, rows, throttle, from_email=None):
+    """Kirim satu chunk lewat satu koneksi. Return (jumlah terkirim, daftar gagal)."""
+    from_email = from_email or settings.EMAIL_HOST_USER
+    sent = 0
+    failures = []
+
+    connection = get_connection(fail_silently=False)
+    connection.open()
+    try:
+        for _, full_name, email in rows:
+            throttle.wait()
+            msg = EmailMessage(
+                personalize(campaign.subject, full_name),
+                personalize(campaign.message, full_name),
+                from_email,
+                [email],
+                connection=connection,
+            )
+            try:
+                if connection.send_messages([msg]):
+                    sent += 1
+                else:
+                    failures.append({'email': email, 'error': 'Tidak terkirim'})
+            except Exception as e:
+                # Satu alamat bermasalah tidak menggagalkan seluruh blast
+                failures.append({'email': email, 'error': str(e)[:200]})
+    finally:
+        connection.close()
+    return sent, failures
+
+
+def run_campaign(campaign, chunk_size=None, rate_limit=None, throttle=None):
+    chunk_size = chunk_size or settings.BLAST_EMAIL_CHUNK_SIZE
+    if throttle is None:
+        throttle = Throttle(settings.BLAST_EMAIL_RATE_LIMIT if rate_limit is None else rate_limit)
+
+    # Bersyarat: salinan lama dari job yang diulang tidak menimpa status 'done'
+    if not BlastCampaign.objects.filter(pk=campaign.pk).exclude(status='done').update(status='sending'):
+        return campaign
+    campaign.status = 'sending'
+
+    recipients = (
+        Participant.objects.filter(event_id=campaign.event_id)
+        .order_by('id')
+        .values_list('id', 'full_name', 'email')
+    )
+    while True:
+        cursor = campaign.last_participant_id
+        rows = list(recipients.filter(id__gt=cursor)[:chunk_size])
+        if not rows:
+            break
+
+        # Klaim chunk: gagal jika pelaksana lain (job yang sama, diulang) sudah memajukan cursor
+        claimed = BlastCampaign.objects.filter(pk=campaign.pk, last_participant_id=cursor).update(
+            last_participant_id=rows[-1][0], processed=F('processed') + len(rows),
+        )
+        if not claimed:
+            # Lanjut dari cursor yang diklaim pelaksana lain, bukan dari hitungan lokal
+            campaign.refresh_from_db(fields=['last_participant_id', 'processed'])
+            continue
+        campaign.last_participant_id = rows[-1][0]
+        campaign.processed += len(rows)
+
+        sent, failures = send_chunk(campaign, rows, throttle)
+
+        # Simpan progress per chunk (F(): aman walau ada pelaksana lain di chunk berikutnya)
+        campaign.sent += sent
+        campaign.failed += len(failures)
+        BlastCampaign.objects.filter(pk=campaign.pk).update(
+            sent=F('sent') + sent, failed=F('failed') + len(failures),
+        )
+        room = BlastCampaign.MAX_FAILURES_STORED - len(campaign.failures)
+        if room > 0 and failures:
+            campaign.failures.extend(failures[:room])
+            campaign.save(update_fields=['failures'])
+        jobs.heartbeat()
+
+    campaign.status = 'done'
+    campaign.finished_at = timezone.now()
+    campaign.save(update_fields=['status', 'finished_at'])
+    return campaign
@@ -0,0 +1,219 @@
+"""
+Kuota kursi event dan daftar tunggu.
+
+Kursi terpakai = Event.participant_count. Reservasi adalah satu UPDATE bersyarat:
+
+    UPDATE events_event SET participant_count = participant_count + 1, ...
+    WHERE id = %s AND (capacity IS NULL OR participant_count < capacity)
+
+- PostgreSQL: UPDATE mengunci baris event; transaksi yang antre mengevaluasi ulang
+  WHERE setelah yang pertama commit, jadi kursi terakhir tidak bisa terjual dua kali.
+- SQLite: tanpa row lock, dan transaksi yang berebut bisa gagal 'database is locked',
+  jadi transaksi pendaftaran diserialisasi dengan lock proses (penulisan di SQLite
+  memang serial).
+
+Invarian: kursi kosong hanya ada jika daftar tunggu kosong. Kursi yang dilepas
+(peserta dihapus) langsung dialihkan ke antrean terdepan; kapasitas yang dinaikkan
+mengisi antrean lewat fill_from_waitlist() (dipanggil dari signal).
+
+Satu email hanya boleh punya satu pendaftaran per event (constraint unik di Participant
+dan di antrean 'waiting'). Submit ganda yang lolos find_registration() ditolak constraint
+dan register() mengembalikan pendaftaran yang sudah ada (DUPLICATE).
+"""
+import threading
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest, Lower
+
+from . import images
+from .jobs import enqueue
+from .models import Event, Participant, WaitlistEntry
+
+REGISTERED = 'registered'
+WAITLISTED = 'waitlisted'
+DUPLICATE = 'duplicate'
+
+# RLock: release_seat() memanggil fill_from_waitlist() di dalam lock yang sama
+_sqlite_lock = threading.RLock()
+
+_release_paused = ContextVar('release_paused', default=False)
+
+
+def serialized():
+    return _sqlite_lock if connection.vendor == 'sqlite' else nullcontext()
+
+
+@contextmanager
+def releases_paused():
+    """Hapus massal tanpa release_seat() per peserta; pemanggil wajib menghitung ulang counter sendiri."""
+    token = _release_paused.set(True)
+    try:
+        yield
+    finally:
+        _release_paused.reset(token)
+
+
+def reserve_seat(event, verified=False):
+    """Ambil satu kursi sekaligus update counter. Return False jika kuota penuh."""
+    verified = int(verified)
+    return bool(
+        Event.objects.filter(pk=event.pk)
+        .filter(Q(capacity__isnull=True) | Q(participant_count__lt=F('capacity')))
+        .update(
+            participant_count=F('participant_count') + 1,
+            verified_count=F('verified_count') + verified,
+            revenue=F('revenue') + F('price') * verified,
+        )
+    )
+
+
+def find_registration(event, key=None, email=None):
+    """
+    Pendaftaran yang sudah ada untuk token form `key` atau `email`: Participant,
+    WaitlistEntry yang masih menunggu, atau None.
+    """
+    if key:
+        try:
+            key = uuid.UUID(str(key))
+        except ValueError:
+            return None
+        participants = Participant.objects.filter(event=event, idempotency_key=key)
+        entries = waiting(event).filter(idempotency_key=key)
+    elif email:
+        participants = Participant.objects.filter(event=event).for_email(email)
+        entries = waiting(event).alias(email_lower=Lower('email')).filter(email_lower=email.lower())
+    else:
+        return None
+
+    participant = participants.first()
+    if participant is not None:
+        return participant
+    # Daftar tunggu hanya terisi selama kuota diset (kuota dihapus -> semua antrean dipromosikan)
+    return entries.first() if event.capacity is not None else None
+
+
+def same_applicant(registration, email, full_name):
+    """Data form (email & nama) sama dengan pendaftaran yang ditemukan lewat token form."""
+    return (
+        registration.email.lower() == (email or '').strip().lower()
+        and registration.full_name.strip().casefold() == (full_name or '').strip().casefold()
+    )
+
+
+def register(event, participant):
+    """
+    Simpan pendaftaran (participant belum disimpan, bukti bayar sudah di-stage).
+    Return (REGISTERED, participant), (WAITLISTED, entri daftar tunggu), atau
+    (DUPLICATE, pendaftaran yang sudah ada) jika email ini sudah terdaftar lebih dulu.
+    """
+    staged = participant.payment_proof_variants.get('status') == images.PENDING
+    try:
+        with serialized(), transaction.atomic():
+            if reserve_seat(event, participant.is_verified):
+                participant.event = event
+                participant.save()
+                if staged:
+                    images.schedule(participant, 'payment_proof')
+                return REGISTERED, participant
+
+            entry = WaitlistEntry.objects.create(
+                event=event, full_name=participant.full_name, email=participant.email,
+                phone=participant.phone, institution=participant.institution,
+                payment_proof_variants=participant.payment_proof_variants,
+                idempotency_key=participant.idempotency_key,
+            )
+            if staged:
+                images.schedule(entry, 'payment_proof')
+            return WAITLISTED, entry
+    except IntegrityError:
+        # Submit bersamaan: yang kalah ditolak constraint unik (reservasi kursinya ikut di-rollback)
+        try:
+            existing = find_registration(event, email=participant.email)
+        finally:
+            # Bukti bayar yang sudah di-stage tidak dimiliki baris mana pun, apa pun hasilnya
+            if staged:
+                images.temp_storage().delete(participant.payment_proof_variants['temp'])
+        if existing is None:
+            raise
+        return DUPLICATE, existing
+
+
+def waiting(event):
+    return WaitlistEntry.objects.filter(event=event, status='waiting').order_by('created_at', 'id')
+
+
+def position(entry):
+    """Nomor antrean (1 = berikutnya dapat kursi)."""
+    return waiting(entry.event_id).filter(
+        Q(created_at__lt=entry.created_at) | Q(created_at=entry.created_at, id__lte=entry.id)
+    ).count()
+
+
+def promotion_email(participant, event):
+    subject = f"Kursi Tersedia: {event.title}"
+    message = (
+        f"Halo {participant.full_name},\n\n"
+        f"Ada kursi yang kosong untuk event '{event.title}' dan Anda yang berada di urutan terdepan "
+        f"daftar tunggu kini sudah TERDAFTAR sebagai peserta.\n"
+        f"Cek tiket Anda di: https://{settings.SITE_DOMAIN}/cek-tiket/\n\n"
+        f"Salam,\n"
+        f"Admin Seminar Portal"
+    )
+    return [subject, message, settings.EMAIL_HOST_USER, [participant.email]]
+
+
+def fill_from_waitlist(event):
+    """Promosikan antrean terdepan selama masih ada kursi. Return list peserta baru."""
+    promoted = []
+    with serialized(), transaction.atomic():
+        while True:
+            entry = waiting(event).select_for_update(skip_locked=True).first()
+            if entry is None:
+                break
+            try:
+                with transaction.atomic():
+                    seated = reserve_seat(event, event.is_free)
+                    if seated:
+                        participant = Participant.objects.create(
+                            event=event, full_name=entry.full_name, email=entry.email, phone=entry.phone,
+                            institution=entry.institution, is_verified=event.is_free,
+                            # Jika masih 'pending', WaitlistEntry.on_image_ready menyalin hasilnya nanti
+                            payment_proof_variants=entry.payment_proof_variants,
+                            idempotency_key=entry.idempotency_key,
+                        )
+            except IntegrityError:
+                # Email ini sudah jadi peserta lewat jalur lain (mis. admin): entri antrean gugur
+                entry.status = 'cancelled'
+                entry.save(update_fields=['status', 'updated_at'])
+                continue
+            if not seated:
+                break
+            entry.status = 'promoted'
+            entry.participant = participant
+            entry.save(update_fields=['status', 'participant', 'updated_at'])
+            enqueue('send_email', *promotion_email(participant, event))
+            promoted.append(participant)
+    return promoted
+
+
+def release_seat(participant):
+    """Peserta dihapus: kembalikan kursinya lalu alihkan ke antrean terdepan (jika ada)."""
+    if _release_paused.get():
+        return []
+    verified = int(participant.is_verified)
+    with serialized(), transaction.atomic():
+        # Greatest: counter lama bisa drift (lihat reconcile_event_counters), jangan sampai negatif
+        Event.objects.filter(pk=participant.event_id).update(
+            participant_count=Greatest(F('participant_count') - 1, Value(0)),
+            verified_count=Greatest(F('verified_count') - verified, Value(0)),
+            revenue=Greatest(F('revenue') - F('price') * verified, Value(0)),
+        )
+        event = Event.objects.filter(pk=participant.event_id).first()
+        if event is not None and event.capacity is not None:
+            return fill_from_waitlist(event)
+    return []
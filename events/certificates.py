@@ -0,0 +1,199 @@
+"""
+Generate sertifikat PDF.
+
+- Background sertifikat dibaca & di-decode sekali per proses (ImageReader di-cache).
+- PDF hasil render di-cache berdasarkan hash isi (nama, event, nomor ID).
+- Untuk unduhan massal, sertifikat dirender paralel di process pool lalu
+  dialirkan sebagai ZIP tanpa menampung semuanya di memori. Pool dibuat sekali
+  per proses (spawn, bukan fork dari worker yang sudah multi-thread) dan dipakai
+  ulang oleh semua request.
+- reportlab baru di-import saat sertifikat pertama dirender, bukan saat worker boot.
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import tracing
+
+# Naikkan jika desain sertifikat berubah agar cache lama tidak terpakai
+TEMPLATE_VERSION = 1
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+BATCH_SIZE = 50
+
+PAGE_SIZE = (841.8897637795277, 595.2755905511812)  # landscape(A4) dalam point
+BG_PATH = os.path.join(settings.BASE_DIR, 'events', 'static', 'images', 'sertifikat_bg.png')
+
+
+def certificate_data(participant, event=None):
+    """Data minimal (picklable) yang menentukan isi sertifikat."""
+    event = event or participant.event
+    return {
+        'full_name': participant.full_name,
+        'certificate_id': participant.get_certificate_id(),
+        'event_title': event.title,
+        'event_date': event.date_time.strftime("%d %B %Y"),
+    }
+
+
+def cache_key(data):
+    raw = "|".join([str(TEMPLATE_VERSION), data['full_name'], data['certificate_id'], data['event_title'], data['event_date']])
+    return "certificate:" + hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_background():
+    """Background di-decode sekali per proses; None jika file tidak ada."""
+    if os.path.exists(BG_PATH):
+        from reportlab.lib.utils import ImageReader
+        return ImageReader(BG_PATH)
+    return None
+
+
+def draw_certificate(c, data):
+    from reportlab.lib.colors import HexColor
+    width, height = PAGE_SIZE
+
+    # Background digambar sebagai Form XObject: satu kali per dokumen, dipakai ulang tiap halaman
+    if not c.hasForm('certificate_bg'):
+        c.beginForm('certificate_bg')
+        background = get_background()
+        if background is not None:
+            c.drawImage(background, 0, 0, width=width, height=height)
+        else:
+            c.setFillColor(HexColor("#cccccc"))
+            c.rect(0, 0, width, height, fill=1)
+        c.endForm()
+    c.doForm('certificate_bg')
+
+    c.setFont("Helvetica-Bold", 36)
+    c.setFillColor(HexColor("#1a1a1a"))
+    c.drawCentredString(width/2, height - 130, "SERTIFIKAT PENGHARGAAN")
+
+    c.setFont("Helvetica", 14)
+    c.setFillColor(HexColor("#555555"))
+    c.drawCentredString(width/2, height - 170, "No. ID: " + data['certificate_id'])
+    c.drawCentredString(width/2, height - 210, "Diberikan kepada:")
+
+    c.setFont("Helvetica-Bold", 42)
+    c.setFillColor(HexColor("#000000"))
+    c.drawCentredString(width/2, height/2 + 10, data['full_name'].upper())
+
+    c.setLineWidth(1)
+    c.line(width/2 - 150, height/2, width/2 + 150, height/2)
+
+    c.setFont("Helvetica", 16)
+    c.setFillColor(HexColor("#333333"))
+    c.drawCentredString(width/2, height/2 - 40, "Atas partisipasinya sebagai Peserta dalam acara:")
+
+    c.setFont("Helvetica-Bold", 24)
+    c.setFillColor(HexColor("#1e3a8a"))
+    c.drawCentredString(width/2, height/2 - 80, data['event_title'])
+
+    c.setFont("Helvetica", 12)
+    c.setFillColor(HexColor("#555555"))
+    c.drawCentredString(width/2, height/2 - 110, f"Dilaksanakan pada: {data['event_date']}")
+
+    c.showPage()
+
+
+@tracing.traced('pdf.render_certificate')
+def render_certificate(data):
+    from reportlab.pdfgen import canvas
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=PAGE_SIZE)
+    draw_certificate(c, data)
+    c.save()
+    return buffer.getvalue()
+
+
+def certificate_pdf(participant):
+    """PDF satu peserta, diambil dari cache jika isinya sama."""
+    data = certificate_data(participant)
+    key = cache_key(data)
+    pdf = cache.get(key)
+    if pdf is None:
+        pdf = render_certificate(data)
+        cache.set(key, pdf, CACHE_TIMEOUT)
+    return pdf
+
+
+def render_many(items, executor=None):
+    """
+    items: list (filename, data). Yield (filename, pdf). Yang sudah ada di cache
+    tidak dirender ulang; sisanya dirender di executor (process pool) jika ada.
+    """
+    for start in range(0, len(items), BATCH_SIZE):
+        batch = items[start:start + BATCH_SIZE]
+        keys = [cache_key(data) for _, data in batch]
+        cached = cache.get_many(keys)
+
+        missing = [data for (_, data), key in zip(batch, keys) if key not in cached]
+        mapper = executor.map if executor is not None else map
+        rendered = dict(zip((cache_key(d) for d in missing), mapper(render_certificate, missing)))
+        if rendered:
+            cache.set_many(rendered, CACHE_TIMEOUT)
+        cached.update(rendered)
+
+        for (filename, _), key in zip(batch, keys):
+            yield filename, cached[key]
+
+
+class _ZipStream:
+    """Target tulis tanpa seek untuk zipfile; isi diambil bertahap via pop()."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+# --- Process pool per proses ---
+_lock = threading.Lock()
+_executor = None
+
+
+def get_executor():
+    """Process pool bersama; dibuat saat unduhan ZIP pertama, bukan per request."""
+    global _executor
+    with _lock:
+        # Pool rusak (proses anak mati) tidak bisa dipakai lagi: buat baru
+        if _executor is None or _executor._broken:
+            workers = getattr(settings, 'CERTIFICATE_WORKERS', None) or os.cpu_count() or 1
+            # spawn: fork dari proses uvicorn/gunicorn yang sudah punya thread bisa mewarisi lock terkunci
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def stream_zip(items, executor=None):
+    """Generator byte ZIP berisi sertifikat untuk `items` (filename, data)."""
+    executor = executor or get_executor()
+    stream = _ZipStream()
+    # PDF sudah terkompresi, ZIP_STORED lebih cepat tanpa beda ukuran berarti
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for filename, pdf in render_many(items, executor):
+            archive.writestr(filename, pdf)
+            yield stream.pop()
+    yield stream.pop()
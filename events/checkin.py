@@ -0,0 +1,198 @@
+"""
+Check-in peserta di pintu masuk (scan QR tiket).
+
+- Satu scan: 1 query lookup (participant + event via select_related) + 1 INSERT.
+  Scan ganda ditolak oleh constraint unik Attendance.participant, bukan
+  cek-lalu-tulis, jadi aman walau dua pintu memindai tiket yang sama bersamaan.
+- Batch (scanner yang sempat offline): lookup, cek kehadiran lama & insert
+  masing-masing satu query untuk ratusan scan sekaligus.
+- Perangkat scanner (bukan browser) memakai token bertanda tangan di header
+  `Authorization: Bearer <token>`, bukan cookie sesi + CSRF.
+"""
+import hmac
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Attendance, Participant, User
+
+MAX_BATCH = 500
+
+# Status hasil scan -> HTTP status untuk endpoint satuan
+OK = 'ok'
+DUPLICATE = 'duplicate'
+NOT_FOUND = 'not_found'
+UNVERIFIED = 'unverified'
+FORBIDDEN = 'forbidden'
+INVALID = 'invalid'
+
+HTTP_STATUS = {OK: 200, DUPLICATE: 409, UNVERIFIED: 409, NOT_FOUND: 404, FORBIDDEN: 403, INVALID: 400}
+
+
+def _lookup():
+    return Participant.objects.select_related('event').only(
+        'id', 'full_name', 'is_verified', 'validation_id',
+        'event__id', 'event__title', 'event__organizer_id', 'event__status',
+    )
+
+
+SCANNER_TOKEN_SALT = 'events.checkin.scanner'
+
+
+def _auth_fingerprint(user):
+    # Turunan hash password: ganti password = semua token scanner lama dicabut
+    return user.get_session_auth_hash()[:16]
+
+
+def issue_scanner_token(user):
+    """Token perangkat scanner milik `user`, berlaku SCANNER_TOKEN_MAX_AGE detik."""
+    return signing.dumps({'u': user.pk, 'h': _auth_fingerprint(user)}, salt=SCANNER_TOKEN_SALT)
+
+
+def scanner_user(token):
+    """User pemilik token scanner, atau None jika token rusak, kedaluwarsa atau sudah dicabut."""
+    try:
+        data = signing.loads(token, salt=SCANNER_TOKEN_SALT, max_age=settings.SCANNER_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if not isinstance(data, dict):
+        return None
+    user = User.objects.filter(pk=data.get('u'), is_active=True).first()
+    if user is None or not hmac.compare_digest(_auth_fingerprint(user), str(data.get('h'))):
+        return None
+    return user
+
+
+def can_check_in(user, event):
+    return user.is_superuser or event.organizer_id == user.pk
+
+
+def parse_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def parse_scanned_at(value, now):
+    """Waktu scan dari perangkat (ISO 8601). Kosong/rusak/di masa depan -> sekarang."""
+    if not value:
+        return now
+    try:
+        scanned_at = datetime.fromisoformat(str(value))
+    except ValueError:
+        return now
+    if timezone.is_naive(scanned_at):
+        scanned_at = timezone.make_aware(scanned_at)
+    return min(scanned_at, now)
+
+
+def _result(status, participant=None, checked_in_at=None, validation_id=None):
+    result = {'status': status}
+    if validation_id is not None:
+        result['validation_id'] = str(validation_id)
+    if participant is not None:
+        result.update(name=participant.full_name, event=participant.event.title)
+    if checked_in_at is not None:
+        result['checked_in_at'] = checked_in_at.isoformat()
+    return result
+
+
+def _reject(user, participant):
+    if not can_check_in(user, participant.event):
+        return FORBIDDEN
+    if not participant.is_verified:
+        return UNVERIFIED
+    return None
+
+
+def _device_label(device):
+    # Dari JSON klien: bisa angka/null/objek, bukan hanya string
+    return str(device or '')[:100]
+
+
+def check_in(user, validation_id, scanned_at=None, device=''):
+    """Check-in satu tiket. Return dict hasil (lihat konstanta status)."""
+    validation_id = parse_uuid(validation_id)
+    if validation_id is None:
+        return _result(INVALID)
+    participant = _lookup().filter(validation_id=validation_id).first()
+    if participant is None:
+        return _result(NOT_FOUND, validation_id=validation_id)
+
+    rejected = _reject(user, participant)
+    if rejected == FORBIDDEN:
+        return _result(FORBIDDEN, validation_id=validation_id)
+    if rejected:
+        return _result(rejected, participant, validation_id=validation_id)
+
+    checked_in_at = parse_scanned_at(scanned_at, timezone.now())
+    try:
+        with transaction.atomic():
+            Attendance.objects.create(
+                participant=participant, event_id=participant.event.id,
+                checked_in_at=checked_in_at, checked_in_by=user, device=_device_label(device),
+            )
+    except IntegrityError:
+        first = Attendance.objects.filter(participant=participant).values_list('checked_in_at', flat=True).first()
+        return _result(DUPLICATE, participant, first, validation_id)
+    return _result(OK, participant, checked_in_at, validation_id)
+
+
+def check_in_many(user, scans, device=''):
+    """
+    scans: list {'validation_id': ..., 'scanned_at': ...}. Return list hasil dengan urutan sama.
+    Scan ganda di dalam batch yang sama: yang pertama OK, sisanya duplicate.
+    """
+    now = timezone.now()
+    parsed = [(parse_uuid(s.get('validation_id')), parse_scanned_at(s.get('scanned_at'), now)) for s in scans]
+    ids = {vid for vid, _ in parsed if vid is not None}
+    participants = {p.validation_id: p for p in _lookup().filter(validation_id__in=ids)}
+    existing = dict(
+        Attendance.objects.filter(participant__in=[p.id for p in participants.values()])
+        .values_list('participant_id', 'checked_in_at')
+    )
+
+    results = []
+    new_rows = {}
+    for vid, scanned_at in parsed:
+        if vid is None:
+            results.append(_result(INVALID))
+            continue
+        participant = participants.get(vid)
+        if participant is None:
+            results.append(_result(NOT_FOUND, validation_id=vid))
+            continue
+        rejected = _reject(user, participant)
+        if rejected:
+            results.append(_result(rejected, None if rejected == FORBIDDEN else participant, validation_id=vid))
+            continue
+        if participant.id in existing or participant.id in new_rows:
+            first = existing.get(participant.id) or new_rows[participant.id].checked_in_at
+            results.append(_result(DUPLICATE, participant, first, vid))
+            continue
+        new_rows[participant.id] = Attendance(
+            participant=participant, event_id=participant.event.id,
+            checked_in_at=scanned_at, checked_in_by=user, device=_device_label(device),
+        )
+        results.append(None)  # diisi setelah insert
+
+    if new_rows:
+        Attendance.objects.bulk_create(new_rows.values(), ignore_conflicts=True)
+        # Tiket yang sama bisa saja masuk lewat pintu lain di sela-sela; cocokkan waktu yang tersimpan
+        stored = dict(
+            Attendance.objects.filter(participant__in=list(new_rows))
+            .values_list('participant_id', 'checked_in_at')
+        )
+        pending = iter(new_rows.values())
+        for index, result in enumerate(results):
+            if result is not None:
+                continue
+            row = next(pending)
+            status = OK if stored.get(row.participant_id) == row.checked_in_at else DUPLICATE
+            results[index] = _result(status, row.participant, stored.get(row.participant_id), row.participant.validation_id)
+    return results
@@ -0,0 +1,92 @@
+"""
+Conditional GET (ETag / Last-Modified / 304) untuk halaman publik.
+
+Validator dihitung dari satu query agregat (Max updated_at + jumlah baris),
+dicek sebelum view jalan, sehingga 304 tidak merender template maupun
+menjalankan query berat.
+
+View `async def` memakai validator `async def` (ORM async); user di-load
+lebih dulu lewat request.auser() karena ETag & Cache-Control bergantung padanya.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(request, *parts):
+    # Navbar berbeda per user, jadi user ikut menentukan ETag
+    user_part = request.user.pk if request.user.is_authenticated else 'anon'
+    raw = "|".join(str(p) for p in (user_part, *parts))
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+
+def conditional_page(validators):
+    """
+    Decorator view. validators(request, *args, **kwargs) -> (last_modified, etag_parts)
+    atau None jika tidak bisa dihitung (view berjalan normal tanpa validator).
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                # Di event loop, request.user (lazy, query sync) tidak boleh disentuh sebelum di-load
+                request.user = await request.auser()
+                if _bypass(request):
+                    return await view(request, *args, **kwargs)
+
+                result = await validators(request, *args, **kwargs)
+                if result is None:
+                    return await view(request, *args, **kwargs)
+
+                etag, timestamp = _validators(request, result)
+                response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _finish(request, response, etag, timestamp)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if _bypass(request):
+                return view(request, *args, **kwargs)
+
+            result = validators(request, *args, **kwargs)
+            if result is None:
+                return view(request, *args, **kwargs)
+
+            etag, timestamp = _validators(request, result)
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _finish(request, response, etag, timestamp)
+        return wrapper
+    return decorator
+
+
+def _bypass(request):
+    # Flash message bersifat sekali tampil, jangan sampai tertahan oleh 304
+    return request.method not in ('GET', 'HEAD') or len(get_messages(request))
+
+
+def _validators(request, result):
+    last_modified, etag_parts = result
+    etag = make_etag(request, last_modified.isoformat() if last_modified else '', *etag_parts)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return etag, timestamp
+
+
+def _finish(request, response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response.headers.setdefault('ETag', etag)
+        if timestamp is not None:
+            response.headers.setdefault('Last-Modified', http_date(timestamp))
+        # Simpan boleh, tapi browser wajib revalidasi dulu
+        if request.user.is_authenticated:
+            patch_cache_control(response, no_cache=True, private=True)
+        else:
+            patch_cache_control(response, no_cache=True)
+    return response
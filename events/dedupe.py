@@ -0,0 +1,148 @@
+"""
+Gabungkan pendaftaran ganda: email sama (tanpa peduli huruf besar/kecil) di event yang sama.
+
+Dipakai migrasi 0018 (dengan model historis, sebelum constraint unik dipasang) dan
+`manage.py merge_duplicate_participants`. Per grup dipertahankan satu peserta dengan
+prioritas lunas > sudah check-in > paling awal mendaftar; bukti bayar dan kehadiran
+peserta lain dipindahkan ke sana, sisanya dihapus. Entri daftar tunggu 'waiting' yang
+ganda, atau yang emailnya sudah menjadi peserta, dibatalkan. Counter event yang terdampak
+dihitung ulang.
+
+Jumlah query tetap per batch grup (bukan per peserta).
+"""
+from collections import defaultdict
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+BATCH_SIZE = 500
+
+
+def _keeper_order(row, attended):
+    return (not row.is_verified, row.id not in attended, row.registered_at, row.id)
+
+
+def duplicate_groups(Participant, event_ids=None):
+    """[(event_id, email_lower, jumlah), ...] untuk setiap grup berisi lebih dari satu peserta."""
+    queryset = Participant._base_manager.annotate(email_lower=Lower('email')).order_by()
+    if event_ids is not None:
+        queryset = queryset.filter(event_id__in=event_ids)
+    return list(
+        queryset.values_list('event_id', 'email_lower').annotate(n=Count('id')).filter(n__gt=1).order_by('event_id')
+    )
+
+
+def _merge_batch(Participant, Attendance, groups):
+    """Gabungkan satu batch grup. Return jumlah peserta yang dihapus."""
+    match = Q()
+    for event_id, email_lower, _ in groups:
+        match |= Q(event_id=event_id, email_lower=email_lower)
+    rows = list(
+        Participant._base_manager.annotate(email_lower=Lower('email')).filter(match)
+        .only('id', 'event_id', 'is_verified', 'registered_at', 'payment_proof', 'payment_proof_variants')
+    )
+    attended = dict(
+        Attendance._base_manager.filter(participant_id__in=[row.id for row in rows]).values_list('participant_id', 'id')
+    )
+
+    members = defaultdict(list)
+    for row in rows:
+        members[(row.event_id, row.email_lower)].append(row)
+
+    now = timezone.now()
+    keepers, moved, removed = [], [], []
+    for group in members.values():
+        group.sort(key=lambda row: _keeper_order(row, attended))
+        keeper, others = group[0], group[1:]
+        changed = False
+        for other in others:
+            if not keeper.payment_proof and other.payment_proof:
+                keeper.payment_proof = other.payment_proof
+                changed = True
+            if not keeper.payment_proof_variants and other.payment_proof_variants:
+                keeper.payment_proof_variants = other.payment_proof_variants
+                changed = True
+            if keeper.id not in attended and other.id in attended:
+                # Peserta lain sudah check-in: kehadirannya pindah ke tiket yang dipertahankan
+                attended[keeper.id] = attended.pop(other.id)
+                moved.append(Attendance(pk=attended[keeper.id], participant_id=keeper.id))
+        if changed:
+            keeper.updated_at = now
+            keepers.append(keeper)
+        removed.extend(other.id for other in others)
+
+    if keepers:
+        Participant._base_manager.bulk_update(keepers, ['payment_proof', 'payment_proof_variants', 'updated_at'])
+    if moved:
+        Attendance._base_manager.bulk_update(moved, ['participant'])
+    Participant._base_manager.filter(id__in=removed).delete()
+    return len(removed)
+
+
+def conflicting_waitlist(WaitlistEntry, Participant, event_ids=None):
+    """Entri 'waiting' yang emailnya sudah peserta, atau ganda dengan entri yang lebih awal."""
+    waiting = WaitlistEntry._base_manager.filter(status='waiting').annotate(email_lower=Lower('email'))
+    if event_ids is not None:
+        waiting = waiting.filter(event_id__in=event_ids)
+    registered = (
+        Participant._base_manager.annotate(email_lower=Lower('email'))
+        .filter(event_id=OuterRef('event_id'), email_lower=OuterRef('email_lower'))
+    )
+    earlier = (
+        WaitlistEntry._base_manager.annotate(email_lower=Lower('email'))
+        .filter(event_id=OuterRef('event_id'), email_lower=OuterRef('email_lower'), status='waiting')
+        .filter(Q(created_at__lt=OuterRef('created_at')) | Q(created_at=OuterRef('created_at'), id__lt=OuterRef('id')))
+    )
+    return waiting.filter(Exists(registered) | Exists(earlier))
+
+
+def recount(Event, Participant, event_ids):
+    """Hitung ulang participant_count, verified_count & revenue untuk event_ids (satu GROUP BY)."""
+    stats = {
+        row['event_id']: row
+        for row in Participant._base_manager.filter(event_id__in=event_ids).order_by()
+        .values('event_id').annotate(total=Count('id'), verified=Count('id', filter=Q(is_verified=True)))
+    }
+    events = list(Event._base_manager.filter(pk__in=event_ids).only('id', 'price'))
+    for event in events:
+        row = stats.get(event.pk, {})
+        event.participant_count = row.get('total', 0)
+        event.verified_count = row.get('verified', 0)
+        event.revenue = event.verified_count * event.price
+    Event._base_manager.bulk_update(events, ['participant_count', 'verified_count', 'revenue'])
+    return events
+
+
+def merge_duplicates(apps=global_apps, event_ids=None, dry_run=False, batch_size=BATCH_SIZE):
+    """
+    Return {'groups', 'removed', 'waitlist_cancelled', 'event_ids'}.
+    `apps`: registry model; migrasi mengoper model historisnya sendiri.
+    """
+    Event, Participant, Attendance, WaitlistEntry = (
+        apps.get_model('events', name) for name in ('Event', 'Participant', 'Attendance', 'WaitlistEntry')
+    )
+    groups = duplicate_groups(Participant, event_ids)
+    report = {
+        'groups': len(groups),
+        'removed': sum(n - 1 for _, _, n in groups),
+        'waitlist_cancelled': 0,
+        'event_ids': sorted({event_id for event_id, _, _ in groups}),
+    }
+    if dry_run:
+        report['waitlist_cancelled'] = conflicting_waitlist(WaitlistEntry, Participant, event_ids).count()
+        return report
+
+    for start in range(0, len(groups), batch_size):
+        batch = groups[start:start + batch_size]
+        with transaction.atomic():
+            _merge_batch(Participant, Attendance, batch)
+            recount(Event, Participant, sorted({event_id for event_id, _, _ in batch}))
+
+    cancelled = list(conflicting_waitlist(WaitlistEntry, Participant, event_ids).values_list('id', flat=True))
+    if cancelled:
+        WaitlistEntry._base_manager.filter(id__in=cancelled).update(status='cancelled', updated_at=timezone.now())
+    report['waitlist_cancelled'] = len(cancelled)
+    return report
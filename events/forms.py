@@ -1,15 +1,34 @@
+import uuid
+
 from django import forms
-from .models import Participant, Event, Blacklist
+from django.template.defaultfilters import filesizeformat
+from .models import Participant, Event
+from . import blacklist, images
+
+
+def clean_image_upload(upload):
+    # Isi gambar sudah divalidasi Pillow oleh ImageField; di sini hanya batas ukuran
+    if upload and upload.size > images.max_upload_bytes():
+        raise forms.ValidationError(f"Ukuran file maksimal {filesizeformat(images.max_upload_bytes())}.")
+    return upload
+
 
 class RegistrationForm(forms.ModelForm):
+    # Bukan field model: file tidak diupload di dalam save(), tapi di-stage ke worker (views + images.py)
+    payment_proof = forms.ImageField(required=False, label="Bukti Pembayaran", widget=forms.FileInput(attrs={'accept': 'image/*'}))
+    # Token unik per form yang dirender: klik ganda / refresh mengirim token yang sama
+    idempotency_key = forms.UUIDField(required=False, widget=forms.HiddenInput)
+
     class Meta:
         model = Participant
-        fields = ['full_name', 'email', 'phone', 'institution', 'payment_proof']
+        fields = ['full_name', 'email', 'phone', 'institution']
         
     def __init__(self, *args, **kwargs):
         # Menerima argumen 'is_free' dari views
         is_free = kwargs.pop('is_free', False)
         super(RegistrationForm, self).__init__(*args, **kwargs)
+        if not self.is_bound:
+            self.initial.setdefault('idempotency_key', uuid.uuid4())
         
         # Tambahkan class Bootstrap agar rapi
         for field in self.fields:
@@ -24,14 +43,23 @@ class RegistrationForm(forms.ModelForm):
 
     def clean_email(self):
         email = self.cleaned_data.get('email')
-        if Blacklist.objects.filter(email=email).exists():
+        # Dicek di memori (set + trie domain), tanpa query DB per pendaftaran
+        if blacklist.is_blocked(email):
             raise forms.ValidationError("Maaf, email ini telah diblacklist dan tidak dapat mendaftar.")
         return email
 
+    def clean_payment_proof(self):
+        return clean_image_upload(self.cleaned_data.get('payment_proof'))
+
+    def reject_duplicate(self):
+        self.add_error('email', "Email ini sudah terdaftar di event ini. Tiket Anda bisa dilihat lewat menu Cek Tiket.")
+
 class EventForm(forms.ModelForm):
+    poster = forms.ImageField(required=False, label="Poster", widget=forms.FileInput(attrs={'accept': 'image/*'}))
+
     class Meta:
         model = Event
-        fields = ['title', 'category', 'description', 'date_time', 'location', 'price', 'poster']
+        fields = ['title', 'category', 'description', 'date_time', 'location', 'price', 'capacity']
         widgets = {
             'date_time': forms.DateTimeInput(attrs={'type': 'datetime-local'}), # Agar muncul kalender
             'description': forms.Textarea(attrs={'rows': 4}),
@@ -42,6 +70,43 @@ class EventForm(forms.ModelForm):
         for field in self.fields:
             self.fields[field].widget.attrs.update({'class': 'form-control mb-3'})
 
+    def clean_poster(self):
+        return clean_image_upload(self.cleaned_data.get('poster'))
+
 class BlastEmailForm(forms.Form):
     subject = forms.CharField(max_length=200, label="Judul Email", widget=forms.TextInput(attrs={'class': 'form-control mb-3'}))
-    message = forms.CharField(widget=forms.Textarea(attrs={'class': 'form-control mb-3', 'rows': 5}), label="Isi Pesan")
\ No newline at end of file
+    message = forms.CharField(widget=forms.Textarea(attrs={'class': 'form-control mb-3', 'rows': 5}), label="Isi Pesan")
+
+class EventSearchForm(forms.Form):
+    PRICE_CHOICES = (
+        ('', 'Semua Harga'),
+        ('free', 'Gratis'),
+        ('paid', 'Berbayar'),
+    )
+
+    q = forms.CharField(required=False, max_length=200, label="Kata Kunci",
+                        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Cari judul, lokasi, topik...'}))
+    category = forms.ChoiceField(required=False, label="Kategori",
+                                 choices=(('', 'Semua Kategori'),) + Event.CATEGORY_CHOICES,
+                                 widget=forms.Select(attrs={'class': 'form-select'}))
+    date_from = forms.DateField(required=False, label="Dari Tanggal",
+                                widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}))
+    date_to = forms.DateField(required=False, label="Sampai Tanggal",
+                              widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}))
+    price = forms.ChoiceField(required=False, label="Harga", choices=PRICE_CHOICES,
+                              widget=forms.Select(attrs={'class': 'form-select'}))
+
+
+class ParticipantFilterForm(forms.Form):
+    STATUS_CHOICES = (
+        ('', 'Semua Status'),
+        ('verified', 'Lunas / Valid'),
+        ('pending', 'Pending'),
+    )
+
+    q = forms.CharField(required=False, max_length=100, label="Cari",
+                        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Nama, email, instansi...'}))
+    status = forms.ChoiceField(required=False, label="Status", choices=STATUS_CHOICES,
+                               widget=forms.Select(attrs={'class': 'form-select'}))
+    institution = forms.CharField(required=False, max_length=100, label="Instansi",
+                                  widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Instansi (persis)'}))
@@ -0,0 +1,175 @@
+"""
+Pipeline gambar upload (poster event & bukti bayar).
+
+Request hanya menyimpan file mentah ke folder temp lokal (IMAGE_UPLOAD_TEMP_DIR)
+lalu mengantrikan job `process_image`. Worker kemudian:
+  1. memutar gambar sesuai orientasi EXIF lalu membuang seluruh metadata (lokasi GPS, dsb);
+  2. mengecilkan ke beberapa lebar (VARIANTS) dalam format WebP & JPEG;
+  3. mengunggah hasilnya ke storage IMAGE_STORAGE (Cloudinary di produksi,
+     FileSystemStorage untuk test/dev) dan mencatatnya di field `<field>_variants`.
+
+Catatan deploy: worker harus bisa membaca IMAGE_UPLOAD_TEMP_DIR (host/volume yang sama).
+Pillow hanya di-import di fungsi yang mengolah gambar; proses web cukup men-stage file.
+
+Isi `<field>_variants`:
+    {'status': 'pending', 'temp': 'abc.jpg'}
+    {'status': 'ready', 'width': 3000, 'height': 2000,
+     'items': [{'label': 'thumb', 'format': 'webp', 'width': 320, 'height': 213, 'name': ..., 'url': ...}, ...]}
+"""
+import io
+import os
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.module_loading import import_string
+
+from . import tracing
+
+# label -> lebar maksimum (px); gambar yang lebih kecil tidak diperbesar
+VARIANTS = {'thumb': 320, 'medium': 960, 'large': 1600}
+FORMATS = {'webp': ('WEBP', {'quality': 80, 'method': 4}), 'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True})}
+FOLDERS = {'poster': 'posters', 'payment_proof': 'payments'}
+
+ORIENTATION_TAG = 0x0112
+
+PENDING = 'pending'
+READY = 'ready'
+
+
+def temp_storage():
+    return FileSystemStorage(location=settings.IMAGE_UPLOAD_TEMP_DIR)
+
+
+def image_storage():
+    return import_string(settings.IMAGE_STORAGE)()
+
+
+def max_upload_bytes():
+    return settings.IMAGE_MAX_UPLOAD_MB * 1024 * 1024
+
+
+def stage(instance, field, upload):
+    """
+    Simpan upload mentah ke folder temp dan tandai `<field>_variants` pending.
+    Dipanggil sebelum instance.save(); lanjutkan dengan schedule() setelah save.
+    """
+    ext = os.path.splitext(upload.name)[1].lower()[:5] or '.img'
+    name = temp_storage().save(f'{uuid.uuid4().hex}{ext}', upload)
+    setattr(instance, f'{field}_variants', {'status': PENDING, 'temp': name})
+    return name
+
+
+def schedule(instance, field):
+    """Antrikan pemrosesan upload yang sudah di-stage (argumen job harus JSON)."""
+    from .jobs import enqueue
+    variants = getattr(instance, f'{field}_variants')
+    return enqueue('process_image', instance._meta.label_lower, instance.pk, field, variants['temp'])
+
+
+def _flatten(image):
+    """RGB tanpa alpha (latar putih) agar bisa disimpan sebagai JPEG."""
+    from PIL import Image
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_variants(fileobj):
+    """
+    Return (lebar asli, tinggi asli, list (label, format, lebar, tinggi, bytes)).
+    Metadata tidak ikut tersimpan karena Pillow hanya menulis EXIF/ICC jika diminta.
+    """
+    from PIL import Image, ImageOps
+    with Image.open(fileobj) as source:
+        width, height = source.size
+        # Orientasi 5-8 = diputar 90/270 derajat: lebar tampilan = tinggi piksel tersimpan
+        rotated = source.getexif().get(ORIENTATION_TAG, 1) in (5, 6, 7, 8)
+        if rotated:
+            width, height = height, width
+        # JPEG besar: decoder langsung men-downscale (1/2, 1/4, 1/8) -> jauh lebih cepat & hemat memori
+        largest = max(VARIANTS.values())
+        source.draft('RGB', (1, largest) if rotated else (largest, 1))
+        image = _flatten(ImageOps.exif_transpose(source))
+
+    results = []
+    previous_width = None
+    for label, max_width in VARIANTS.items():
+        if image.width > max_width:
+            size = (max_width, max(1, round(image.height * max_width / image.width)))
+            resized = image.resize(size, Image.Resampling.LANCZOS)
+        else:
+            resized = image
+        if resized.width == previous_width:
+            # Gambar kecil: varian lebih besar identik dengan sebelumnya, tidak perlu disimpan
+            break
+        previous_width = resized.width
+        for fmt, (pil_format, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, **options)
+            results.append((label, fmt, resized.width, resized.height, buffer.getvalue()))
+    return width, height, results
+
+
+@tracing.traced('image.process')
+def process(model_label, pk, field, temp_name):
+    """Task worker: olah file temp milik `<model>.<field>` lalu simpan hasilnya."""
+    model = apps.get_model(model_label)
+    temp = temp_storage()
+    instance = model._base_manager.filter(pk=pk).first()
+    if instance is None:
+        # Data sudah dihapus sebelum sempat diproses
+        temp.delete(temp_name)
+        return None
+
+    current = getattr(instance, f'{field}_variants') or {}
+    if current.get('temp') != temp_name:
+        # Sudah diganti upload yang lebih baru (atau retry setelah berhasil)
+        temp.delete(temp_name)
+        return current
+
+    with temp.open(temp_name, 'rb') as fileobj:
+        width, height, rendered = render_variants(fileobj)
+
+    storage = image_storage()
+    stem = os.path.splitext(temp_name)[0]
+    items = []
+    for label, fmt, w, h, data in rendered:
+        with tracing.span('image.upload', variant=f'{label}.{fmt}', bytes=len(data)):
+            name = storage.save(f'{FOLDERS.get(field, field)}/{stem}-{label}.{fmt}', ContentFile(data))
+            url = storage.url(name)
+        items.append({'label': label, 'format': fmt, 'width': w, 'height': h, 'name': name, 'url': url})
+
+    variants = {'status': READY, 'width': width, 'height': height, 'items': items}
+    setattr(instance, f'{field}_variants', variants)
+    # save() biasa (bukan update) agar updated_at & signal invalidasi cache halaman ikut jalan
+    instance.save(update_fields=[f'{field}_variants', 'updated_at'])
+    if hasattr(instance, 'on_image_ready'):
+        instance.on_image_ready(field, variants)
+    temp.delete(temp_name)
+    return variants
+
+
+# --- Helper tampilan (dipakai templatetags event_images) ---
+def sources(variants, fmt):
+    if not variants or variants.get('status') != READY:
+        return []
+    return [item for item in variants['items'] if item['format'] == fmt]
+
+
+def srcset(variants, fmt):
+    """'url 320w, url 960w, ...' untuk atribut srcset."""
+    return ', '.join(f"{item['url']} {item['width']}w" for item in sources(variants, fmt))
+
+
+def variant_url(variants, label='medium', fmt='jpeg'):
+    items = sources(variants, fmt)
+    for item in items:
+        if item['label'] == label:
+            return item['url']
+    return items[-1]['url'] if items else None
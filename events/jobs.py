@@ -0,0 +1,280 @@
+"""
+Antrian job sederhana berbasis database (tanpa broker).
+
+- `enqueue('send_email', ...)` menyimpan job ke tabel Job.
+- `manage.py run_worker` mengambil job dengan select_for_update(skip_locked=True),
+  menjalankannya di thread pool yang dibatasi, lalu retry dengan exponential backoff.
+  Job baru diklaim setiap ada slot thread yang kosong (lihat dispatch), jadi satu job
+  panjang tidak menahan job lain.
+- Task `async def` (I/O jaringan: Telegram, SMTP) dari satu batch dijalankan bersamaan
+  di satu event loop, jadi satu thread worker bisa menunggu banyak kiriman sekaligus.
+- Task yang bisa berjalan lebih lama dari STALE_AFTER (blast email) wajib memanggil
+  `heartbeat()` secara berkala, agar tidak dikira yatim lalu dijalankan dua kali.
+"""
+import asyncio
+import contextvars
+import random
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import timedelta
+from functools import partial
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Min
+from django.utils import timezone
+
+from . import tracing
+from .models import Job
+
+TASKS = {}
+
+# Backoff: 30s, 60s, 120s, ... maksimal 1 jam
+BACKOFF_BASE = 30
+BACKOFF_MAX = 3600
+# Job 'running' tanpa heartbeat lebih lama dari ini dianggap yatim (worker mati) dan diulang
+STALE_AFTER = timedelta(minutes=15)
+# Coroutine tanpa argumen yang ditunggu di akhir tiap batch task async, sebelum event loop-nya
+# ditutup (mis. menutup klien HTTP async yang terikat ke loop tersebut)
+ASYNC_BATCH_CLEANUP = []
+JOB_RESULT_FIELDS = ['status', 'last_error', 'next_run_at', 'finished_at']
+
+_current_job = contextvars.ContextVar('job', default=None)
+
+
+def task(name):
+    """Decorator untuk mendaftarkan fungsi sebagai task yang bisa di-enqueue."""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(task_name, *args, run_at=None, max_attempts=5, **kwargs):
+    """Simpan job ke antrian. Argumen harus bisa di-serialize ke JSON."""
+    return Job.objects.create(
+        task=task_name,
+        payload={'args': list(args), 'kwargs': kwargs},
+        next_run_at=run_at or timezone.now(),
+        max_attempts=max_attempts,
+    )
+
+
+def enqueue_many(task_name, arg_lists, max_attempts=5):
+    """Simpan banyak job sekaligus dalam satu INSERT (satu job per daftar argumen)."""
+    now = timezone.now()
+    return Job.objects.bulk_create(
+        [
+            Job(task=task_name, payload={'args': list(args), 'kwargs': {}}, next_run_at=now, max_attempts=max_attempts)
+            for args in arg_lists
+        ],
+        batch_size=500,
+    )
+
+
+def enqueue_batched(task_name, item, delay):
+    """
+    Gabungkan `item` ke job `task_name` yang masih pending (argumen pertamanya list item);
+    jika belum ada, buat job baru yang jalan `delay` detik lagi. Dipakai untuk digest.
+    """
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update()
+            .filter(task=task_name, status='pending', attempts=0)
+            .order_by('id')
+            .first()
+        )
+        if job is None:
+            return enqueue(task_name, [item], run_at=timezone.now() + timedelta(seconds=delay))
+        job.payload['args'][0].append(item)
+        job.save(update_fields=['payload'])
+        return job
+
+
+def backoff_delay(attempts):
+    delay = min(BACKOFF_BASE * (2 ** (attempts - 1)), BACKOFF_MAX)
+    # Jitter agar job yang gagal bersamaan tidak retry serentak
+    return timedelta(seconds=delay + random.uniform(0, delay * 0.1))
+
+
+def claim_jobs(limit):
+    """
+    Ambil maksimal `limit` job yang siap jalan dan tandai 'running'.
+    Di PostgreSQL baris yang sedang dikunci worker lain dilewati (skip_locked);
+    di SQLite penulisan sudah serial, update bersyarat status mencegah double-claim.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_run_at__lte=now)
+            .order_by('next_run_at')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        claimed = Job.objects.filter(id__in=ids, status='pending').update(
+            status='running', started_at=now, attempts=F('attempts') + 1,
+        )
+        if not claimed:
+            return []
+        # Hanya baris yang benar-benar dipindahkan UPDATE di atas; sisanya sudah diklaim worker lain
+        return list(Job.objects.filter(id__in=ids, status='running', started_at=now))
+
+
+def is_async(job):
+    return iscoroutinefunction(TASKS.get(job.task))
+
+
+def _mark_failed(job, e):
+    job.last_error = f"{e}\n{traceback.format_exc()}"[-4000:]
+    if job.attempts >= job.max_attempts:
+        job.status = 'failed'
+        job.finished_at = timezone.now()
+    else:
+        job.status = 'pending'
+        job.next_run_at = timezone.now() + backoff_delay(job.attempts)
+
+
+def _mark_done(job):
+    job.status = 'done'
+    job.finished_at = timezone.now()
+
+
+def heartbeat():
+    """
+    Tandai job yang sedang berjalan (di thread/task ini) masih hidup: started_at
+    dimajukan sehingga requeue_stale() tidak mengulangnya. Di luar worker: no-op.
+    """
+    job = _current_job.get()
+    if job is None:
+        return
+    job.started_at = timezone.now()
+    Job.objects.filter(pk=job.pk, status='running').update(started_at=job.started_at)
+
+
+def run_job(job):
+    """Jalankan satu job dan simpan hasilnya (done / retry / failed)."""
+    if is_async(job):
+        return async_to_sync(arun_job)(job)
+    token = _current_job.set(job)
+    try:
+        func = TASKS[job.task]
+        with tracing.trace(f'job {job.task}') as current:
+            current.attrs.update(job_id=job.pk, attempt=job.attempts)
+            func(*job.payload.get('args', []), **job.payload.get('kwargs', {}))
+    except Exception as e:
+        _mark_failed(job, e)
+    else:
+        _mark_done(job)
+    finally:
+        _current_job.reset(token)
+        job.save(update_fields=JOB_RESULT_FIELDS)
+    return job
+
+
+async def arun_job(job):
+    """run_job untuk task `async def`; hasil disimpan lewat thread sync (ORM)."""
+    token = _current_job.set(job)
+    try:
+        with tracing.trace(f'job {job.task}') as current:
+            current.attrs.update(job_id=job.pk, attempt=job.attempts)
+            await TASKS[job.task](*job.payload.get('args', []), **job.payload.get('kwargs', {}))
+    except Exception as e:
+        _mark_failed(job, e)
+    else:
+        _mark_done(job)
+    finally:
+        _current_job.reset(token)
+        await sync_to_async(job.save)(update_fields=JOB_RESULT_FIELDS)
+    return job
+
+
+async def arun_jobs(jobs):
+    """Jalankan task async bersamaan di event loop yang sama. Return list job."""
+    try:
+        return await asyncio.gather(*(arun_job(job) for job in jobs))
+    finally:
+        for cleanup in ASYNC_BATCH_CLEANUP:
+            await cleanup()
+
+
+def _run_in_thread(func, *args):
+    # Tiap thread pool punya koneksi DB sendiri, tutup setelah selesai
+    try:
+        return func(*args)
+    finally:
+        connection.close()
+
+
+def _units(jobs):
+    units = [partial(run_job, job) for job in jobs if not is_async(job)]
+    concurrent = [job for job in jobs if is_async(job)]
+    if concurrent:
+        # Semua task async satu batch = satu unit kerja (satu thread, satu event loop)
+        units.append(partial(async_to_sync(arun_jobs), concurrent))
+    return units
+
+
+def submit_pending(executor, limit):
+    """Claim maksimal `limit` job lalu serahkan ke executor tanpa menunggu. Return set future."""
+    return {executor.submit(_run_in_thread, unit) for unit in _units(claim_jobs(limit))}
+
+
+def run_pending(limit=10, executor=None):
+    """Claim satu batch lalu jalankan sampai selesai (di executor jika ada). Return jumlah job."""
+    jobs = claim_jobs(limit)
+    units = _units(jobs)
+    if executor is None:
+        for unit in units:
+            unit()
+    else:
+        for future in wait([executor.submit(_run_in_thread, unit) for unit in units]).done:
+            future.result()
+    return len(jobs)
+
+
+def dispatch(executor, running, slots, batch_size=10, timeout=2.0):
+    """
+    Satu putaran loop worker: isi slot yang kosong dengan job baru, lalu tunggu sampai
+    ada yang selesai (maks. `timeout` detik). Job panjang (blast, ZIP) hanya memakai satu
+    slot; slot lain tetap diisi job berikutnya tanpa menunggu seluruh batch selesai.
+    running: set future yang masih berjalan. Return set future yang masih berjalan.
+    """
+    free = slots - len(running)
+    if free > 0:
+        running = running | submit_pending(executor, min(free, batch_size))
+    if not running:
+        time.sleep(timeout)
+        return running
+    done, running = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+    for future in done:
+        future.result()
+    return running
+
+
+def requeue_stale():
+    """Kembalikan job 'running' milik worker yang mati (heartbeat terakhir > STALE_AFTER) ke antrian."""
+    cutoff = timezone.now() - STALE_AFTER
+    return Job.objects.filter(status='running', started_at__lt=cutoff).update(status='pending')
+
+
+def queue_stats():
+    """Metrik antrian: kedalaman per status & latensi (detik)."""
+    now = timezone.now()
+    depth = {status: 0 for status, _ in Job.STATUS_CHOICES}
+    for row in Job.objects.values('status').annotate(n=Count('id')):
+        depth[row['status']] = row['n']
+
+    oldest = Job.objects.filter(status='pending', next_run_at__lte=now).aggregate(t=Min('next_run_at'))['t']
+    recent = Job.objects.filter(status='done', finished_at__gte=now - timedelta(hours=1)).aggregate(
+        wait=Avg(F('started_at') - F('created_at')),
+        run=Avg(F('finished_at') - F('started_at')),
+    )
+    return {
+        'depth': depth,
+        'oldest_pending_age': (now - oldest).total_seconds() if oldest else 0.0,
+        'avg_wait_last_hour': recent['wait'].total_seconds() if recent['wait'] else 0.0,
+        'avg_run_last_hour': recent['run'].total_seconds() if recent['run'] else 0.0,
+    }
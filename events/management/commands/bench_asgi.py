@@ -0,0 +1,139 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from events import perf
+from events.management.commands.seed_perf_data import PREFIX
+from events.models import Event, Participant, User
+
+# nama -> argumen `python` untuk menjalankan server; {port} & {workers} diisi saat start
+SERVERS = {
+    'gunicorn': [
+        '-m', 'gunicorn', 'config.wsgi:application', '--bind', '127.0.0.1:{port}',
+        '--workers', '{workers}', '--log-level', 'warning',
+    ],
+    'uvicorn': [
+        '-m', 'uvicorn', 'config.asgi:application', '--host', '127.0.0.1', '--port', '{port}',
+        '--workers', '{workers}', '--log-level', 'warning', '--no-access-log',
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Bandingkan gunicorn (WSGI, worker sync) dengan uvicorn (ASGI) pada check_ticket, event_detail "
+        "dan validate_scan di data `seed_perf_data`: throughput & latency per tingkat konkurensi. "
+        "Juga membandingkan kirim notifikasi Telegram sync vs async ke API tiruan lokal."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=sorted(SERVERS))
+        parser.add_argument('--workers', type=int, default=2, help="Jumlah proses worker tiap server.")
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64], help="Client bersamaan.")
+        parser.add_argument('--requests', type=int, default=200, help="Jumlah request per endpoint per tingkat.")
+        parser.add_argument('--messages', type=int, default=100, help="Jumlah pesan untuk uji notifier (0 = lewati).")
+        parser.add_argument('--latency', type=float, default=0.2, help="Latency API Telegram tiruan (detik).")
+
+    def paths(self):
+        organizer = User.objects.filter(username=f'{PREFIX}org-0').first()
+        active = Event.objects.filter(status='active').order_by('id').first()
+        if organizer is None or active is None:
+            raise CommandError("Data benchmark belum ada. Jalankan `manage.py seed_perf_data` dulu.")
+        ticket = Participant.objects.filter(event__organizer=organizer).order_by('id').first()
+        return {
+            'check_ticket': reverse('check_ticket') + f'?email={PREFIX}peserta-0@example.com',
+            'event_detail': reverse('event_detail', args=[active.slug]),
+            'validate_scan': reverse('validate_scan', args=[ticket.validation_id]),
+        }, organizer
+
+    def session_cookie(self, user):
+        # Sesi login organizer (validate_scan wajib login), sama seperti hasil login biasa
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session
+
+    def start(self, name, workers):
+        port = free_port()
+        argv = [sys.executable] + [arg.format(port=port, workers=workers) for arg in SERVERS[name]]
+        # Tanpa sampling trace: log per request ikut membebani server & mengotori output
+        env = dict(os.environ, TRACE_SAMPLE_RATE='0')
+        proc = subprocess.Popen(argv, cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL)
+        base_url = f'http://127.0.0.1:{port}'
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise CommandError(f"{name} berhenti saat start (exit {proc.returncode}).")
+            try:
+                # /ready/ sekaligus memanaskan worker (template, koneksi DB)
+                if requests.get(base_url + reverse('readiness'), timeout=2).status_code == 200:
+                    return proc, base_url
+            except requests.ConnectionError:
+                pass
+            time.sleep(0.2)
+        self.stop(proc)
+        raise CommandError(f"{name} tidak siap dalam 30 detik.")
+
+    @staticmethod
+    def stop(proc):
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def handle(self, *args, **options):
+        paths, organizer = self.paths()
+        session = self.session_cookie(organizer)
+        headers = {'Cookie': f'{settings.SESSION_COOKIE_NAME}={session.session_key}'}
+        try:
+            for name in options['servers']:
+                proc, base_url = self.start(name, options['workers'])
+                try:
+                    self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({options['workers']} worker)"))
+                    for concurrency in options['concurrency']:
+                        results = perf.run_http(base_url, paths, options['requests'], concurrency, headers=headers)
+                        for path_name, r in results.items():
+                            self.stdout.write(
+                                f"  c={concurrency:<4} {path_name:<14} {r['rps']:8.1f} req/s  "
+                                f"p50 {r['p50_ms']:8.2f} ms  p95 {r['p95_ms']:8.2f} ms  error {r['errors']}"
+                            )
+                finally:
+                    self.stop(proc)
+        finally:
+            session.delete()
+
+        if options['messages']:
+            stub = perf.serve_stub_telegram(options['latency'])
+            try:
+                results = perf.notifier_throughput(
+                    f'http://127.0.0.1:{stub.server_port}', options['messages'], threads=4,
+                )
+            finally:
+                stub.shutdown()
+                stub.server_close()
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"Notifier Telegram ({options['messages']} pesan, latency API {options['latency'] * 1000:.0f} ms)"
+            ))
+            for mode, label in (('sync', 'sync, 4 thread'), ('async', 'async, 1 event loop')):
+                r = results[mode]
+                self.stdout.write(f"  {label:<20} {r['per_second']:8.1f} pesan/s  {r['seconds']:6.2f} s")
+        self.stdout.write(self.style.SUCCESS("Selesai."))
@@ -0,0 +1,57 @@
+import random
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.blacklist import BlacklistMatcher
+
+
+def rss_mb():
+    # ru_maxrss dalam KB di Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark matcher blacklist (murni di memori, tanpa DB)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=1000000)
+        parser.add_argument('--domain-ratio', type=float, default=0.1, help="Porsi aturan domain/wildcard")
+        parser.add_argument('--lookups', type=int, default=200000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        total = options['entries']
+        n_domains = int(total * options['domain_ratio'])
+        tlds = ['com', 'net', 'org', 'id', 'co.id', 'xyz', 'top']
+
+        def domain(i):
+            return f'spam{i}.{tlds[i % len(tlds)]}'
+
+        patterns = [f'user{i}@example.com' for i in range(total - n_domains)]
+        patterns += [('*.' if i % 2 else '@') + domain(i) for i in range(n_domains)]
+
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        matcher = BlacklistMatcher(patterns)
+        build = time.perf_counter() - start
+        self.stdout.write(
+            f"Build {len(matcher)} aturan ({len(matcher.emails)} alamat, {len(matcher.domains)} domain): "
+            f"{build:.2f}s, +{rss_mb() - rss_before:.0f} MB RSS"
+        )
+
+        n = options['lookups']
+        cases = {
+            'alamat persis (hit)': [f'user{rng.randrange(total - n_domains)}@example.com' for _ in range(n)],
+            'domain (hit)': [f'x@{domain(rng.randrange(0, n_domains, 2))}' for _ in range(n)],
+            'subdomain (hit)': [f'x@mail.{domain(rng.randrange(1, n_domains, 2))}' for _ in range(n)],
+            'lolos (miss)': [f'orang{i}@gmail.com' for i in range(n)],
+        }
+        for label, emails in cases.items():
+            start = time.perf_counter()
+            blocked = sum(1 for email in emails if matcher.is_blocked(email))
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{label:<22}: {elapsed / n * 1e9:7.0f} ns/lookup ({blocked}/{n} diblok)"
+            )
@@ -0,0 +1,62 @@
+import time
+from datetime import timedelta
+
+from django.core import mail
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from events.blast import run_campaign
+from events.models import BlastCampaign, Event, Participant, User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark mesin blast email dengan backend locmem (data dummy di-rollback)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=50000)
+        parser.add_argument('--chunk-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        n = options['recipients']
+        try:
+            with transaction.atomic(), override_settings(
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+            ):
+                mail.outbox = []
+                organizer = User.objects.create(username='bench-blast-organizer')
+                event = Event.objects.create(
+                    organizer=organizer, title='Bench Blast', description='-',
+                    date_time=timezone.now() + timedelta(days=1), location='-',
+                )
+                Participant.objects.bulk_create(
+                    (
+                        Participant(
+                            event=event, full_name=f'Peserta {i}', email=f'peserta{i}@example.com',
+                            phone='0', qr_code='bench',
+                        )
+                        for i in range(n)
+                    ),
+                    batch_size=2000,
+                )
+                campaign = BlastCampaign.objects.create(
+                    event=event, subject='Halo {nama}', message='Pengumuman untuk {nama}', total=n,
+                )
+
+                start = time.perf_counter()
+                run_campaign(campaign, chunk_size=options['chunk_size'], rate_limit=0)
+                elapsed = time.perf_counter() - start
+
+                self.stdout.write(
+                    f"{campaign.sent} terkirim, {campaign.failed} gagal, "
+                    f"{elapsed:.2f}s ({campaign.sent / elapsed:.0f} email/detik, "
+                    f"chunk={options['chunk_size']})"
+                )
+                raise Rollback
+        except Rollback:
+            pass
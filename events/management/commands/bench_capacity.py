@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from events import capacity
+from events.models import Event, Participant, User, WaitlistEntry
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulasi flash crowd: banyak pendaftaran paralel ke satu event berkuota. "
+        "Cek tidak ada overselling & ukur throughput. Data dihapus setelah selesai."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--registrations', type=int, default=2000)
+        parser.add_argument('--capacity', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=16)
+
+    def handle(self, *args, **options):
+        total, limit = options['registrations'], options['capacity']
+        # Thread memakai koneksi DB sendiri-sendiri, jadi data harus benar-benar di-commit (bukan rollback)
+        organizer = User.objects.create(username='bench-capacity-organizer', is_organizer=True)
+        try:
+            event = Event.objects.create(
+                organizer=organizer, title='Bench Kuota', description='-', price=0, capacity=limit,
+                date_time=timezone.now() + timedelta(days=1), location='-', status='active',
+            )
+
+            def attempt(i):
+                try:
+                    participant = Participant(
+                        full_name=f'Pendaftar {i}', email=f'd{i}@example.com', phone='0812', is_verified=True,
+                    )
+                    return capacity.register(event, participant)[0]
+                finally:
+                    connections.close_all()
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                outcomes = list(pool.map(attempt, range(total)))
+            elapsed = time.perf_counter() - started
+
+            event.refresh_from_db()
+            seated = Participant.objects.filter(event=event).count()
+            waiting = WaitlistEntry.objects.filter(event=event, status='waiting').count()
+            self.stdout.write(
+                f"{total} pendaftaran, {options['concurrency']} thread: {total / elapsed:.0f} pendaftaran/detik "
+                f"({elapsed:.2f}s)"
+            )
+            self.stdout.write(
+                f"Terdaftar {seated}/{limit} (counter {event.participant_count}), daftar tunggu {waiting}, "
+                f"status {outcomes.count(capacity.REGISTERED)} registered / {outcomes.count(capacity.WAITLISTED)} waitlisted"
+            )
+            if seated > limit or event.participant_count != seated or seated + waiting != total:
+                raise CommandError("Overselling / data tidak konsisten!")
+            self.stdout.write(self.style.SUCCESS("Tidak ada overselling."))
+        finally:
+            organizer.delete()
@@ -0,0 +1,46 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from events import certificates
+
+
+class Command(BaseCommand):
+    help = "Benchmark render sertifikat (halaman/detik) serial vs process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=300)
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        pages = options['pages']
+        items = [
+            {
+                'full_name': f'Peserta Ke {i}',
+                'certificate_id': f'2025-01-01-PESERTA-KE-{i}-{i:03d}',
+                'event_title': 'Seminar Nasional Teknologi',
+                'event_date': '01 January 2025',
+            }
+            for i in range(pages)
+        ]
+
+        start = time.perf_counter()
+        for data in items:
+            certificates.render_certificate(data)
+        serial = time.perf_counter() - start
+        self.stdout.write(f"Serial      : {pages / serial:8.1f} halaman/detik ({serial:.2f}s)")
+
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            start = time.perf_counter()
+            list(executor.map(certificates.render_certificate, items, chunksize=10))
+            pooled = time.perf_counter() - start
+        self.stdout.write(
+            f"Pool ({options['workers']} proses): {pages / pooled:8.1f} halaman/detik ({pooled:.2f}s)"
+        )
+
+        # Cache hit: key hash + lookup saja
+        start = time.perf_counter()
+        for data in items:
+            certificates.cache_key(data)
+        self.stdout.write(f"Hitung cache key: {(time.perf_counter() - start) / pages * 1e6:.1f} µs/halaman")
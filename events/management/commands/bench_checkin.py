@@ -0,0 +1,86 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from events.models import Attendance, Event, Participant, User
+from events.perf import percentile
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark endpoint check-in (satuan & batch) dengan peserta dummy (data di-rollback)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scans', type=int, default=2000)
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        n = options['scans']
+        try:
+            with transaction.atomic():
+                organizer = User.objects.create(username='bench-checkin-organizer', is_organizer=True)
+                event = Event.objects.create(
+                    organizer=organizer, title='Bench Check-in', description='-',
+                    date_time=timezone.now() + timedelta(hours=1), location='-', status='active',
+                )
+                Participant.objects.bulk_create(
+                    (
+                        Participant(event=event, full_name=f'Peserta {i}', email=f'p{i}@example.com',
+                                    phone='0812', is_verified=True)
+                        for i in range(2 * n)
+                    ),
+                    batch_size=5000,
+                )
+                ids = [str(v) for v in event.participants.order_by('id').values_list('validation_id', flat=True)]
+                single, batched = ids[:n], ids[n:]
+
+                client = Client()
+                client.force_login(organizer)
+                url = reverse('api_checkin')
+
+                def scan(validation_id):
+                    return client.post(url, json.dumps({'validation_id': validation_id}), content_type='application/json')
+
+                with CaptureQueriesContext(connection) as ctx:
+                    scan(single[0])
+                queries = len(ctx.captured_queries)
+
+                timings = []
+                started = time.perf_counter()
+                for validation_id in single[1:]:
+                    t = time.perf_counter()
+                    scan(validation_id)
+                    timings.append((time.perf_counter() - t) * 1000)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"Satuan : {len(timings) / elapsed:7.0f} scan/detik, p50 {statistics.median(timings):.2f} ms, "
+                    f"p95 {percentile(timings, 95):.2f} ms, {queries} query/scan"
+                )
+
+                duplicate = scan(single[0])
+                self.stdout.write(f"Scan ulang -> HTTP {duplicate.status_code} {duplicate.json()['status']}")
+
+                size = options['batch_size']
+                batch_url = reverse('api_checkin_batch')
+                started = time.perf_counter()
+                for start in range(0, len(batched), size):
+                    body = {'scans': [{'validation_id': v} for v in batched[start:start + size]], 'device': 'bench'}
+                    client.post(batch_url, json.dumps(body), content_type='application/json')
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"Batch {size}: {len(batched) / elapsed:7.0f} scan/detik")
+
+                self.stdout.write(f"Total kehadiran tercatat: {Attendance.objects.filter(event=event).count()}")
+                raise Rollback
+        except Rollback:
+            pass
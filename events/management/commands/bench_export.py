@@ -0,0 +1,71 @@
+import time
+import resource
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from events import exports
+from events.models import Event, Participant, User
+
+
+class Rollback(Exception):
+    pass
+
+
+def drain(chunks):
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+    return size
+
+
+class Command(BaseCommand):
+    help = "Benchmark waktu & memori export peserta (data dummy di-rollback)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                organizer = User.objects.create(username='bench-export-organizer')
+                event = Event.objects.create(
+                    organizer=organizer, title='Bench Export', description='-',
+                    date_time=timezone.now() + timedelta(days=1), location='-',
+                )
+                seeded = 0
+                for size in sorted(options['sizes']):
+                    Participant.objects.bulk_create(
+                        (
+                            Participant(
+                                event=event, full_name=f'Peserta {i}', email=f'p{i}@example.com',
+                                phone='08123456789', institution='Universitas Contoh', is_verified=i % 2 == 0,
+                            )
+                            for i in range(seeded, size)
+                        ),
+                        batch_size=5000,
+                    )
+                    seeded = size
+
+                    for fmt in ('xlsx', 'csv', 'ndjson'):
+                        start = time.perf_counter()
+                        if fmt == 'xlsx':
+                            with exports.xlsx_file(event) as fileobj:
+                                nbytes = drain(iter(lambda: fileobj.read(65536), b''))
+                        elif fmt == 'csv':
+                            nbytes = drain(exports.stream_csv(event))
+                        else:
+                            nbytes = drain(exports.stream_ndjson(event))
+                        elapsed = time.perf_counter() - start
+                        # ru_maxrss (KB di Linux) = puncak RSS proses sejauh ini
+                        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+                        self.stdout.write(
+                            f"{size:>9} peserta | {fmt:<6} | {elapsed:7.2f}s | "
+                            f"peak RSS {peak / 1024 / 1024:7.1f} MB | {nbytes / 1024 / 1024:7.1f} MB output"
+                        )
+                raise Rollback
+        except Rollback:
+            pass
@@ -0,0 +1,79 @@
+import statistics
+import time
+from datetime import timedelta
+from io import BytesIO
+
+import qrcode
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from events import qr
+from events.models import Event, Participant, User
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_qr_png(validation_id):
+    # Replikasi kerja CPU Participant.save() versi lama (tanpa upload Cloudinary)
+    code = qrcode.QRCode(box_size=10, border=4)
+    code.add_data(f"https://portalevent.onrender.com/scan/{validation_id}/")
+    code.make(fit=True)
+    buffer = BytesIO()
+    code.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer
+
+
+class Command(BaseCommand):
+    help = "Bandingkan latensi simpan pendaftaran: QR inline (lama) vs QR on-demand (baru)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=200)
+
+    def handle(self, *args, **options):
+        runs = options['runs']
+        try:
+            with transaction.atomic():
+                organizer = User.objects.create(username='bench-registration-organizer')
+                event = Event.objects.create(
+                    organizer=organizer, title='Bench Registrasi', description='-',
+                    date_time=timezone.now() + timedelta(days=1), location='-',
+                )
+
+                def register(i, legacy):
+                    p = Participant(
+                        event=event, full_name=f'Peserta {i}', phone='0',
+                        email=f"{'lama' if legacy else 'baru'}-{i}@example.com",
+                    )
+                    start = time.perf_counter()
+                    if legacy:
+                        legacy_qr_png(p.validation_id)
+                    p.save()
+                    return time.perf_counter() - start
+
+                before = [register(i, legacy=True) for i in range(runs)]
+                after = [register(i, legacy=False) for i in range(runs)]
+
+                # Request QR pertama (cache miss) vs berikutnya (LRU hit)
+                vid = Participant.objects.filter(event=event).values_list('validation_id', flat=True).first()
+                start = time.perf_counter()
+                qr.get_qr(vid, 'png')
+                miss = time.perf_counter() - start
+                start = time.perf_counter()
+                qr.get_qr(vid, 'png')
+                hit = time.perf_counter() - start
+
+                for label, samples in (("Lama (QR inline)", before), ("Baru (on-demand)", after)):
+                    self.stdout.write(
+                        f"{label}: median {statistics.median(samples) * 1000:.2f} ms, "
+                        f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1] * 1000:.2f} ms"
+                    )
+                self.stdout.write(
+                    "Catatan: angka 'lama' belum termasuk round-trip upload Cloudinary.\n"
+                    f"QR on-demand: miss {miss * 1000:.2f} ms, hit {hit * 1000000:.1f} µs"
+                )
+                raise Rollback
+        except Rollback:
+            pass
@@ -0,0 +1,80 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from events import search
+from events.models import Event, User
+
+
+class Rollback(Exception):
+    pass
+
+
+WORDS = (
+    'python data sains karier desain startup bisnis kesehatan hukum robotik '
+    'jaringan keamanan cloud marketing fotografi musik literasi keuangan ai web'
+).split()
+CITIES = ['Jakarta', 'Bandung', 'Surabaya', 'Yogyakarta', 'Medan', 'Makassar', 'Online']
+
+
+class Command(BaseCommand):
+    help = "Benchmark pencarian full-text pada event sintetis (data di-rollback) dan tampilkan query plan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=100000)
+        parser.add_argument('--runs', type=int, default=50)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        now = timezone.now()
+        self.stdout.write(f"Backend pencarian: {search.backend() or 'fallback icontains'}")
+        try:
+            with transaction.atomic():
+                organizer = User.objects.create(username='bench-search-organizer')
+                start = time.perf_counter()
+                Event.objects.bulk_create(
+                    (
+                        Event(
+                            organizer=organizer,
+                            title=' '.join(rng.sample(WORDS, 3)).title(),
+                            slug=f'bench-search-{i}',
+                            description=' '.join(rng.choices(WORDS, k=30)),
+                            location=rng.choice(CITIES),
+                            category=rng.choice(['seminar', 'lomba', 'workshop']),
+                            price=rng.choice([0, 25000, 50000]),
+                            date_time=now + timedelta(hours=rng.randint(1, 24 * 365)),
+                            status='active',
+                        )
+                        for i in range(options['events'])
+                    ),
+                    batch_size=2000,
+                )
+                self.stdout.write(f"Seed {options['events']} event: {time.perf_counter() - start:.1f}s")
+
+                for label, kwargs in (
+                    ("1 kata", {'q': 'robotik'}),
+                    ("2 kata + filter", {'q': 'data sains', 'category': 'workshop', 'price': 'paid'}),
+                    ("prefix", {'q': 'foto'}),
+                ):
+                    timings = []
+                    for _ in range(options['runs']):
+                        t = time.perf_counter()
+                        results, cursor = search.search_events(**kwargs)
+                        if cursor:
+                            search.search_events(cursor=cursor, **kwargs)
+                        timings.append(time.perf_counter() - t)
+                    self.stdout.write(
+                        f"{label:<16}: median {statistics.median(timings) * 1000:.1f} ms "
+                        f"(halaman 1 + 2, {len(results)} hasil/halaman)"
+                    )
+
+                queryset = search._with_rank(Event.objects.filter(status='active'), 'robotik').order_by('-rank', 'id')[:20]
+                self.stdout.write("\nQuery plan:\n" + queryset.explain())
+                raise Rollback
+        except Rollback:
+            pass
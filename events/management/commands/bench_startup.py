@@ -0,0 +1,47 @@
+from subprocess import CalledProcessError
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events import perf
+
+
+class Command(BaseCommand):
+    help = (
+        "Ukur boot worker (aplikasi WSGI + URLconf) di interpreter baru dengan `python -X importtime`: "
+        "waktu boot, total waktu import, RSS dan import termahal. Gagal jika modul berat ikut dimuat."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--compare', action='store_true', help="Bandingkan dengan boot yang memuat semua modul berat.")
+
+    def handle(self, *args, **options):
+        variants = [('lazy', ())]
+        if options['compare']:
+            variants.append(('eager', perf.EAGER_IMPORTS))
+
+        results = {}
+        for label, extra in variants:
+            try:
+                results[label] = r = perf.startup_profile(options['runs'], extra)
+            except CalledProcessError as exc:
+                raise CommandError(f"Boot gagal:\n{exc.stderr[-2000:]}")
+            self.stdout.write(
+                f"{label:<6} boot {r['boot_ms']:7.1f} ms  import {r['import_ms']:7.1f} ms  RSS {r['rss_kb'] / 1024:6.1f} MB"
+            )
+
+        self.stdout.write("Import level atas termahal (lazy):")
+        for name, ms in results['lazy']['top']:
+            self.stdout.write(f"  {ms:8.1f} ms  {name}")
+
+        if 'eager' in results:
+            lazy, eager = results['lazy'], results['eager']
+            self.stdout.write(
+                f"Hemat per worker: {eager['boot_ms'] - lazy['boot_ms']:.1f} ms boot, "
+                f"{(eager['rss_kb'] - lazy['rss_kb']) / 1024:.1f} MB RSS"
+            )
+
+        heavy = results['lazy']['heavy']
+        if heavy:
+            raise CommandError(f"Modul berat dimuat saat boot: {', '.join(heavy)}")
+        self.stdout.write(self.style.SUCCESS("Tidak ada modul berat yang dimuat saat boot."))
@@ -0,0 +1,142 @@
+import itertools
+import os
+import platform
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+
+from events import perf
+from events.management.commands.seed_perf_data import PREFIX
+from events.models import Event, Participant, User
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'perf', 'baseline.json')
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark view utama (p50/p95, jumlah query, memori) pada data `seed_perf_data` "
+        "dan bandingkan dengan baseline JSON. Perubahan data selama benchmark di-rollback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument('--only', nargs='+', help="Nama skenario yang dijalankan")
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+        parser.add_argument('--update-baseline', action='store_true', help="Tulis hasil sebagai baseline baru")
+        parser.add_argument('--tolerance', type=float, default=0.5)
+        parser.add_argument('--url', help="Base URL server yang sedang jalan untuk uji beban konkuren (GET publik)")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200, help="Jumlah request per path untuk --url")
+
+    def scenarios(self):
+        organizer = User.objects.filter(username=f'{PREFIX}org-0').first()
+        if organizer is None:
+            raise CommandError("Data benchmark belum ada. Jalankan `manage.py seed_perf_data` dulu.")
+        peserta = User.objects.get(username=f'{PREFIX}peserta-0')
+        finished = Event.objects.filter(organizer=organizer, status='finished').order_by('id').first()
+        active = Event.objects.filter(status='active').order_by('id').first()
+        free = Event.objects.filter(status='active', price=0).order_by('id').first()
+        ticket = Participant.objects.filter(event=finished, email=peserta.email, is_verified=True).order_by('id').first()
+        # Email unik per request: email yang sama di event yang sama ditolak sebagai duplikat
+        signups = itertools.count()
+
+        return {
+            'home': {'url': reverse('home')},
+            'home_login': {'url': reverse('home'), 'user': peserta},
+            'event_detail': {'url': reverse('event_detail', args=[active.slug])},
+            'event_detail_post': {
+                'url': reverse('event_detail', args=[free.slug]), 'method': 'post',
+                'data': lambda: {
+                    'full_name': 'Bench', 'email': f'bench-{next(signups)}@example.com', 'phone': '0812',
+                    'idempotency_key': uuid.uuid4(),
+                },
+            },
+            'organizer_dashboard': {'url': reverse('organizer_dashboard'), 'user': organizer},
+            'event_participants': {'url': reverse('event_participants', args=[finished.id]), 'user': organizer},
+            'participants_search': {
+                'url': reverse('event_participants', args=[finished.id]), 'user': organizer,
+                'data': {'q': 'peserta 1', 'status': 'verified'},
+            },
+            'check_ticket': {'url': reverse('check_ticket'), 'data': {'email': peserta.email}},
+            'export_xlsx': {'url': reverse('export_participants', args=[finished.id]), 'user': organizer},
+            'export_csv': {
+                'url': reverse('export_participants', args=[finished.id]), 'user': organizer,
+                'data': {'format': 'csv'},
+            },
+            'generate_certificate': {
+                'url': reverse('generate_certificate', args=[ticket.validation_id]), 'user': peserta,
+            },
+        }
+
+    def handle(self, *args, **options):
+        if options['url']:
+            return self.handle_http(options)
+
+        results = {}
+        try:
+            with transaction.atomic():
+                scenarios = self.scenarios()
+                for name, scenario in scenarios.items():
+                    if options['only'] and name not in options['only']:
+                        continue
+                    cache.clear()
+                    client = Client()
+                    if scenario.get('user'):
+                        client.force_login(scenario['user'])
+                    results[name] = perf.run_scenario(client, scenario, runs=options['runs'])
+                    r = results[name]
+                    self.stdout.write(
+                        f"{name:<22} {r['status']}  p50 {r['p50_ms']:8.2f} ms  p95 {r['p95_ms']:8.2f} ms  "
+                        f"{r['queries']:3d} query  {r['peak_kb']:6d} KB"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+        errors = [name for name, r in results.items() if r['status'] >= 400]
+        if errors:
+            raise CommandError(f"Skenario gagal (status >= 400): {', '.join(errors)}")
+
+        if options['update_baseline']:
+            meta = {
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'database': settings.DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+                'runs': options['runs'],
+            }
+            perf.save_baseline(options['baseline'], results, meta)
+            self.stdout.write(self.style.SUCCESS(f"Baseline disimpan ke {options['baseline']}"))
+            return
+
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(self.style.WARNING("Baseline belum ada; jalankan dengan --update-baseline."))
+            return
+        regressions = perf.compare(results, perf.load_baseline(options['baseline']), options['tolerance'])
+        if regressions:
+            raise CommandError("Regresi performa:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("Tidak ada regresi dibanding baseline."))
+
+    def handle_http(self, options):
+        active = Event.objects.filter(status='active').order_by('id').first()
+        paths = {
+            'home': reverse('home'),
+            'event_detail': reverse('event_detail', args=[active.slug]) if active else None,
+            'check_ticket': reverse('check_ticket') + f'?email={PREFIX}peserta-0@example.com',
+            'search': reverse('search_events') + '?q=seminar',
+        }
+        paths = {name: path for name, path in paths.items() if path}
+        results = perf.run_http(options['url'], paths, options['requests'], options['concurrency'])
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<16} p50 {r['p50_ms']:8.2f} ms  p95 {r['p95_ms']:8.2f} ms  "
+                f"{r['rps']:7.1f} req/s  {r['errors']} error"
+            )
@@ -0,0 +1,51 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events import blacklist
+from events.models import Blacklist
+
+
+class Command(BaseCommand):
+    help = (
+        "Import blacklist massal dari file teks (satu aturan per baris, '#' = komentar). "
+        "Aturan yang sudah ada dilewati."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path file, atau '-' untuk stdin")
+        parser.add_argument('--reason', default='', help="Alasan yang dicatat untuk semua aturan")
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        try:
+            source = sys.stdin if options['path'] == '-' else open(options['path'], encoding='utf-8')
+        except OSError as e:
+            raise CommandError(str(e))
+
+        before = Blacklist.objects.count()
+        batch, seen, invalid = [], set(), 0
+        with source:
+            for line in source:
+                rule = line.split('#', 1)[0].strip().lower()
+                if not rule or rule in seen:
+                    continue
+                try:
+                    blacklist.parse_rule(rule)
+                except ValueError:
+                    invalid += 1
+                    continue
+                seen.add(rule)
+                batch.append(Blacklist(email=rule, reason=options['reason']))
+                if len(batch) >= options['batch_size']:
+                    Blacklist.objects.bulk_create(batch, ignore_conflicts=True)
+                    batch = []
+        if batch:
+            Blacklist.objects.bulk_create(batch, ignore_conflicts=True)
+
+        # bulk_create tidak memicu signal, jadi versi matcher dinaikkan manual
+        blacklist.invalidate()
+        added = Blacklist.objects.count() - before
+        self.stdout.write(self.style.SUCCESS(
+            f"{added} aturan baru ditambahkan, {len(seen) - added} sudah ada, {invalid} baris tidak valid."
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from events import capacity, dedupe
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Gabungkan peserta ganda (email sama, tanpa peduli huruf besar/kecil, di event yang sama) "
+        "dan batalkan entri daftar tunggu yang ganda. Counter event dihitung ulang."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, action='append', dest='event_ids', help="Batasi ke event ini (boleh berulang).")
+        parser.add_argument('--batch-size', type=int, default=dedupe.BATCH_SIZE, help="Jumlah grup duplikat per transaksi.")
+        parser.add_argument('--dry-run', action='store_true', help="Hanya hitung duplikat, tanpa mengubah data.")
+
+    def handle(self, *args, **options):
+        # Counter dihitung ulang per batch; jangan lepas kursi satu per satu lewat signal
+        with capacity.releases_paused():
+            report = dedupe.merge_duplicates(
+                event_ids=options['event_ids'], dry_run=options['dry_run'], batch_size=options['batch_size'],
+            )
+
+        promoted = 0
+        if not options['dry_run'] and report['event_ids']:
+            # Kursi yang dibebaskan duplikat diberikan ke antrean terdepan
+            for event in Event.objects.filter(pk__in=report['event_ids'], capacity__isnull=False, waitlist__status='waiting').distinct():
+                promoted += len(capacity.fill_from_waitlist(event))
+
+        label = "ditemukan (dry-run)" if options['dry_run'] else "dihapus"
+        self.stdout.write(
+            f"{report['groups']} grup duplikat di {len(report['event_ids'])} event: "
+            f"{report['removed']} peserta {label}, {report['waitlist_cancelled']} entri daftar tunggu dibatalkan"
+            + (f", {promoted} dipromosikan dari daftar tunggu." if promoted else ".")
+        )
+        self.stdout.write(self.style.SUCCESS("Selesai."))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from events.models import Participant
+
+
+class Command(BaseCommand):
+    help = "Kosongkan kolom qr_code lama (QR kini dirender on-demand), opsional hapus file di Cloudinary."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--delete-remote', action='store_true', help="Hapus juga gambar QR lama di Cloudinary.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        legacy = Participant.objects.exclude(qr_code__isnull=True).exclude(qr_code='')
+
+        total = 0
+        while True:
+            rows = list(legacy.order_by('id').values_list('id', 'qr_code')[:batch_size])
+            if not rows:
+                break
+
+            if options['delete_remote']:
+                import cloudinary.api
+                public_ids = [str(public_id) for _, public_id in rows]
+                # API Cloudinary menerima maksimal 100 public_id per panggilan
+                for i in range(0, len(public_ids), 100):
+                    cloudinary.api.delete_resources(public_ids[i:i + 100])
+
+            total += Participant.objects.filter(id__in=[pk for pk, _ in rows]).update(qr_code=None)
+            self.stdout.write(f"{total} peserta diproses...")
+
+        self.stdout.write(self.style.SUCCESS(f"Selesai. {total} QR lama dilepas dari database."))
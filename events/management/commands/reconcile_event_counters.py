@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang participant_count, verified_count & revenue setiap event dan perbaiki yang tidak sesuai."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Hanya tampilkan event yang drift, tanpa menyimpan.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        events = (
+            Event.objects.with_stats()
+            .only('id', 'price', 'participant_count', 'verified_count', 'revenue')
+            .order_by('id')
+        )
+
+        drifted = []
+        total_fixed = 0
+        for event in events.iterator(chunk_size=batch_size):
+            if (event.participant_count, event.verified_count, event.revenue) == (
+                event.num_participants, event.num_verified, event.total_revenue
+            ):
+                continue
+
+            self.stdout.write(
+                f"Event #{event.id}: peserta {event.participant_count} -> {event.num_participants}, "
+                f"verified {event.verified_count} -> {event.num_verified}, "
+                f"revenue {event.revenue} -> {event.total_revenue}"
+            )
+            event.participant_count = event.num_participants
+            event.verified_count = event.num_verified
+            event.revenue = event.total_revenue
+            drifted.append(event)
+
+            if len(drifted) >= batch_size:
+                total_fixed += self._flush(drifted, dry_run)
+                drifted = []
+
+        total_fixed += self._flush(drifted, dry_run)
+
+        label = "ditemukan (dry-run)" if dry_run else "diperbaiki"
+        self.stdout.write(self.style.SUCCESS(f"{total_fixed} event {label}."))
+
+    def _flush(self, events, dry_run):
+        if events and not dry_run:
+            Event.objects.bulk_update(events, ['participant_count', 'verified_count', 'revenue'])
+        return len(events)
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from events import jobs
+import events.tasks  # noqa: F401  (mendaftarkan task)
+
+
+class Command(BaseCommand):
+    help = "Jalankan worker antrian Job (email, telegram, dll)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help="Jumlah thread maksimal.")
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--sleep', type=float, default=2.0, help="Jeda (detik) saat antrian kosong.")
+        parser.add_argument('--once', action='store_true', help="Proses satu batch lalu berhenti.")
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        batch_size = options['batch_size']
+
+        stale = jobs.requeue_stale()
+        if stale:
+            self.stdout.write(f"{stale} job yatim dikembalikan ke antrian.")
+
+        if options['once']:
+            count = jobs.run_pending(batch_size)
+            self.stdout.write(f"{count} job diproses.")
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Worker jalan (concurrency={concurrency}). Ctrl+C untuk berhenti."))
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            running = set()
+            try:
+                while True:
+                    close_old_connections()
+                    running = jobs.dispatch(executor, running, concurrency, batch_size, options['sleep'])
+            except KeyboardInterrupt:
+                self.stdout.write("Worker berhenti.")
@@ -0,0 +1,116 @@
+import random
+import time
+from datetime import timedelta
+
+from allauth.socialaccount.models import SocialApp
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from events import blacklist
+from events.models import Blacklist, Event, Participant, User
+
+# Semua data seed memakai prefix ini agar bisa dihapus ulang dengan --clear
+PREFIX = 'perf-'
+PASSWORD = 'perf-password'
+
+
+class Command(BaseCommand):
+    help = (
+        "Isi database dengan data sintetis untuk benchmark (user, event, peserta, blacklist). "
+        "Tanpa upload Cloudinary / QR. Per --scale 1: 10 organizer, 100 event, 100 peserta per event, 1000 blacklist."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1)
+        parser.add_argument('--participants-per-event', type=int, default=100)
+        parser.add_argument('--clear', action='store_true', help="Hapus data seed sebelumnya dulu")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        per_event = options['participants_per_event']
+        rng = random.Random(options['seed'])
+        start = time.perf_counter()
+
+        if options['clear']:
+            deleted, _ = User.objects.filter(username__startswith=PREFIX).delete()
+            Blacklist.objects.filter(email__contains=f'{PREFIX}spam-').delete()
+            self.stdout.write(f"Data seed lama dihapus ({deleted} baris).")
+
+        now = timezone.now()
+        # Hash password sekali saja; PBKDF2 per user terlalu lambat untuk ribuan akun
+        password = make_password(PASSWORD)
+        with transaction.atomic():
+            organizers = User.objects.bulk_create(
+                User(username=f'{PREFIX}org-{i}', email=f'{PREFIX}org-{i}@example.com',
+                     password=password, is_organizer=True)
+                for i in range(10 * scale)
+            )
+            User.objects.bulk_create(
+                User(username=f'{PREFIX}peserta-{i}', email=f'{PREFIX}peserta-{i}@example.com', password=password)
+                for i in range(100 * scale)
+            )
+
+            events = []
+            for i in range(100 * scale):
+                # 1/5 event sudah selesai (untuk sertifikat), 1/10 gratis (untuk form daftar tanpa upload)
+                finished = i % 5 == 0
+                events.append(Event(
+                    organizer=organizers[i % len(organizers)],
+                    title=f'Perf Event {i} {rng.choice(["Seminar", "Workshop", "Lomba"])} {rng.choice(["AI", "Data", "Web", "Karier"])}',
+                    slug=f'{PREFIX}event-{i}',
+                    description='Event sintetis untuk benchmark. ' * 5,
+                    category=rng.choice(['seminar', 'lomba', 'workshop']),
+                    date_time=now + timedelta(days=-7 if finished else rng.randint(1, 180)),
+                    location=rng.choice(['Jakarta', 'Bandung', 'Online']),
+                    price=0 if i % 10 == 1 else rng.choice([25000, 50000]),
+                    status='finished' if finished else 'active',
+                ))
+            events = Event.objects.bulk_create(events)
+
+            participants = []
+            for event in events:
+                verified = 0
+                for j in range(per_event):
+                    # Peserta ke-j memakai email akun peserta-j (j < jumlah akun), jadi tiap akun punya
+                    # riwayat di banyak event. Email unik per event (constraint participant_event_email_uniq)
+                    is_verified = event.price == 0 or j % 2 == 0
+                    verified += is_verified
+                    participants.append(Participant(
+                        event=event, full_name=f'Peserta {j}', email=f'{PREFIX}peserta-{j}@example.com',
+                        phone='08123456789', institution='Universitas Contoh', is_verified=is_verified,
+                    ))
+                event.participant_count = per_event
+                event.verified_count = verified
+                event.revenue = verified * event.price
+                if len(participants) >= 5000:
+                    Participant.objects.bulk_create(participants, batch_size=5000)
+                    participants = []
+            Participant.objects.bulk_create(participants, batch_size=5000)
+            Event.objects.bulk_update(events, ['participant_count', 'verified_count', 'revenue'], batch_size=1000)
+
+            Blacklist.objects.bulk_create(
+                (
+                    Blacklist(email=f'{PREFIX}spam-{i}@example.com' if i % 10 else f'@{PREFIX}spam-{i}.xyz')
+                    for i in range(1000 * scale)
+                ),
+                batch_size=5000,
+            )
+        blacklist.invalidate()
+
+        # base.html memanggil provider_login_url 'google'; DB lokal kosong belum punya SocialApp
+        if not settings.SOCIALACCOUNT_PROVIDERS.get('google', {}).get('APP'):
+            app, created = SocialApp.objects.get_or_create(
+                provider='google', defaults={'name': 'Google (dummy perf)', 'client_id': 'perf', 'secret': 'perf'},
+            )
+            if created:
+                app.sites.add(settings.SITE_ID)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seed selesai dalam {time.perf_counter() - start:.1f}s: {len(organizers)} organizer, "
+            f"{len(events)} event, {len(events) * per_event} peserta, {1000 * scale} blacklist. "
+            f"Password semua akun: {PASSWORD}"
+        ))
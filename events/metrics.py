@@ -0,0 +1,176 @@
+"""
+Metrik per view (nama URL): jumlah request, histogram latency, jumlah & durasi
+query DB, dan ukuran response. Diagregasi di memori proses lalu diekspos di
+/metrics dalam format teks Prometheus.
+
+Catatan: tiap worker gunicorn punya registry sendiri; Prometheus men-scrape per
+proses atau dijumlahkan di sisi query (sum by view).
+"""
+import bisect
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connection
+
+# Batas bucket latency (detik), mengikuti default client Prometheus
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNRESOLVED = '<unresolved>'
+# Method lain digabung agar label tidak bisa dibanjiri nilai acak dari client
+METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+
+class ViewStats:
+    __slots__ = ('requests', 'buckets', 'duration', 'queries', 'query_duration', 'response_bytes')
+
+    def __init__(self):
+        self.requests = {}  # (method, status) -> jumlah
+        self.buckets = [0] * (len(BUCKETS) + 1)  # non-kumulatif, terakhir = +Inf
+        self.duration = 0.0
+        self.queries = 0
+        self.query_duration = 0.0
+        self.response_bytes = 0
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def observe(self, view, method, status, duration, queries, query_duration, response_bytes):
+        with self.lock:
+            stats = self.views.get(view)
+            if stats is None:
+                stats = self.views[view] = ViewStats()
+            key = (method, status)
+            stats.requests[key] = stats.requests.get(key, 0) + 1
+            stats.buckets[bisect.bisect_left(BUCKETS, duration)] += 1
+            stats.duration += duration
+            stats.queries += queries
+            stats.query_duration += query_duration
+            stats.response_bytes += response_bytes
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+    def render(self):
+        """Teks exposition format Prometheus 0.0.4."""
+        with self.lock:
+            views = sorted(self.views.items())
+            lines = [
+                '# HELP portalevent_http_requests_total Jumlah request per view, method & status.',
+                '# TYPE portalevent_http_requests_total counter',
+            ]
+            for view, stats in views:
+                for (method, status), count in sorted(stats.requests.items()):
+                    lines.append(
+                        f'portalevent_http_requests_total{{view="{_escape(view)}",method="{method}",status="{status}"}} {count}'
+                    )
+
+            lines += [
+                '# HELP portalevent_http_request_duration_seconds Latency request per view.',
+                '# TYPE portalevent_http_request_duration_seconds histogram',
+            ]
+            for view, stats in views:
+                label = _escape(view)
+                cumulative = 0
+                for bound, count in zip(BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'portalevent_http_request_duration_seconds_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+                total = cumulative + stats.buckets[-1]
+                lines.append(f'portalevent_http_request_duration_seconds_bucket{{view="{label}",le="+Inf"}} {total}')
+                lines.append(f'portalevent_http_request_duration_seconds_sum{{view="{label}"}} {stats.duration:.6f}')
+                lines.append(f'portalevent_http_request_duration_seconds_count{{view="{label}"}} {total}')
+
+            for name, help_text, attr in (
+                ('portalevent_db_queries_total', 'Jumlah query DB per view.', 'queries'),
+                ('portalevent_db_query_duration_seconds_total', 'Total durasi query DB per view.', 'query_duration'),
+                ('portalevent_http_response_size_bytes_total', 'Total ukuran response per view.', 'response_bytes'),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for view, stats in views:
+                    value = getattr(stats, attr)
+                    value = f'{value:.6f}' if isinstance(value, float) else value
+                    lines.append(f'{name}{{view="{_escape(view)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = default_registry = Registry()
+
+
+class _QueryCounter:
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def _attach(counter):
+    connection.execute_wrappers.append(counter)
+
+
+def _detach(counter):
+    connection.execute_wrappers.remove(counter)
+
+
+class MetricsMiddleware:
+    """Pasang di MIDDLEWARE sedini mungkin agar latency mencakup middleware lain."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response, registry=None):
+        self.get_response = get_response
+        self.registry = registry or default_registry
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start, counter)
+        return response
+
+    async def __acall__(self, request):
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        # ASGI: query (ORM async maupun kode sync) jalan di thread sync milik request ini
+        # (ThreadSensitiveContext), bukan di thread event loop; pasang wrapper di koneksi thread itu
+        await sync_to_async(_attach)(counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_detach)(counter)
+        self._observe(request, response, time.perf_counter() - start, counter)
+        return response
+
+    def _observe(self, request, response, duration, counter):
+        match = request.resolver_match
+        if response.streaming:
+            # Body streaming belum dibaca di sini; pakai Content-Length jika ada
+            size = int(response.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+        self.registry.observe(
+            match.view_name if match else UNRESOLVED,
+            request.method if request.method in METHODS else 'OTHER', response.status_code,
+            duration, counter.count, counter.duration, size,
+        )
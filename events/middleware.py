@@ -0,0 +1,49 @@
+"""
+WhiteNoise yang bisa jalan native di ASGI.
+
+WhiteNoiseMiddleware bawaan hanya sync: di bawah uvicorn Django membungkusnya dengan
+sync_to_async, sehingga setiap request (bukan cuma static file) memegang satu thread
+selama view async berjalan. Versi ini async-capable: request biasa diteruskan langsung
+di event loop, hanya pembacaan file static yang dikerjakan di thread pool.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+# Ukuran potongan file static yang dibaca per giliran thread
+CHUNK_SIZE = 64 * 1024
+
+
+async def _aread(filelike):
+    read = sync_to_async(filelike.read, thread_sensitive=False)
+    while chunk := await read(CHUNK_SIZE):
+        yield chunk
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+
+        response = await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        if response.file_to_stream is not None:
+            # Iterator async: Django ASGI tidak perlu membaca seluruh file ke memori lebih dulu
+            response.streaming_content = _aread(response.file_to_stream)
+        return response
@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-18 09:02
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_counters(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    events = Event.objects.annotate(
+        n_all=Count('participants'),
+        n_verified=Count('participants', filter=Q(participants__is_verified=True)),
+    )
+    for event in events.iterator():
+        event.participant_count = event.n_all
+        event.verified_count = event.n_verified
+        event.revenue = event.n_verified * event.price
+        event.save(update_fields=['participant_count', 'verified_count', 'revenue'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_alter_event_poster_alter_event_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='revenue',
+            field=models.DecimalField(decimal_places=0, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='verified_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
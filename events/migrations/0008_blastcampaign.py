@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-18 09:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlastCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('status', models.CharField(choices=[('queued', 'Dalam Antrian'), ('sending', 'Sedang Dikirim'), ('done', 'Selesai'), ('failed', 'Gagal')], default='queued', max_length=10)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('sent', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('failures', models.JSONField(blank=True, default=list)),
+                ('last_participant_id', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blasts', to='events.event')),
+            ],
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 10:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_blastcampaign'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-18 11:10
+
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from events.search import install
+    install(schema_editor.connection)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from events.search import uninstall
+    uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_participant_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-18 09:25
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_event_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', '-date_time'], name='event_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'created_at'], name='event_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', '-created_at'], name='event_organizer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='participant_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['email', '-registered_at'], name='participant_email_reg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['event', '-registered_at'], name='participant_event_reg_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 09:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blacklist',
+            name='email',
+            field=models.CharField(help_text='Alamat (budi@spam.com), domain (@spam.com) atau semua subdomain (*.spam.com)', max_length=254, unique=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 09:37
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_blacklist_rules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Attendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checked_in_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('device', models.CharField(blank=True, help_text='ID perangkat scanner', max_length=100)),
+                ('checked_in_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='events.event')),
+                ('participant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='events.participant')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', 'checked_in_at'], name='events_atte_event_i_b8b235_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 09:45
+
+from django.db import migrations, models
+
+
+def install_trigram_index(apps, schema_editor):
+    from events.roster import install
+    install(schema_editor.connection)
+
+
+def uninstall_trigram_index(apps, schema_editor):
+    from events.roster import uninstall
+    uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_attendance'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='participant',
+            name='participant_event_reg_idx',
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['event', '-registered_at', '-id'], name='participant_event_reg_idx'),
+        ),
+        migrations.RunPython(install_trigram_index, uninstall_trigram_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 09:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_participant_roster_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='poster_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='participant',
+            name='payment_proof_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
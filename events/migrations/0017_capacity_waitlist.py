@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-18 09:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0016_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Kuota peserta; pendaftar setelah penuh masuk daftar tunggu', null=True),
+        ),
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('full_name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('phone', models.CharField(max_length=20)),
+                ('institution', models.CharField(blank=True, max_length=100)),
+                ('payment_proof_variants', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('waiting', 'Menunggu'), ('promoted', 'Dapat Kursi'), ('cancelled', 'Batal')], default='waiting', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='events.event')),
+                ('participant', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='waitlist_entry', to='events.participant')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', 'status', 'created_at', 'id'], name='waitlist_queue_idx')],
+            },
+        ),
+    ]
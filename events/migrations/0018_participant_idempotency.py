@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+def merge_duplicate_participants(apps, schema_editor):
+    # Constraint unik di 0019 gagal dipasang selama masih ada pendaftaran ganda
+    from events.dedupe import merge_duplicates
+    merge_duplicates(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_capacity_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participant',
+            name='idempotency_key',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='waitlistentry',
+            name='idempotency_key',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.RunPython(merge_duplicate_participants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-18 10:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0018_participant_idempotency'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='participant',
+            constraint=models.UniqueConstraint(models.F('event'), django.db.models.functions.text.Lower('email'), name='participant_event_email_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='waitlistentry',
+            constraint=models.UniqueConstraint(models.F('event'), django.db.models.functions.text.Lower('email'), condition=models.Q(('status', 'waiting')), name='waitlist_event_email_waiting_uniq'),
+        ),
+    ]
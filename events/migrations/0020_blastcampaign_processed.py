@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 11:00
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_processed(apps, schema_editor):
+    BlastCampaign = apps.get_model('events', 'BlastCampaign')
+    BlastCampaign.objects.update(processed=F('sent') + F('failed'))
+    # Blast yang sudah selesai: semua penerima sudah diproses
+    BlastCampaign.objects.filter(status='done').update(processed=F('total'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0019_participant_event_email_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blastcampaign',
+            name='processed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_processed, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,14 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.text import slugify
+from django.utils import timezone
 import uuid
-import qrcode 
-from io import BytesIO 
 
-from django.core.files.base import ContentFile 
-from django.conf import settings
 from cloudinary.models import CloudinaryField 
-import cloudinary.uploader
 
 # 1. Custom User (Admin & Organizer)
 class User(AbstractUser):
@@ -16,6 +16,22 @@ class User(AbstractUser):
     phone_number = models.CharField(max_length=15, blank=True, null=True)
 
 # 2. Model Event (Seminar/Lomba)
+class EventQuerySet(models.QuerySet):
+    def with_stats(self):
+        """
+        Hitung jumlah peserta, peserta terverifikasi & pendapatan
+        dalam satu query GROUP BY (menghindari N+1 di dashboard).
+        """
+        verified = models.Count('participants', filter=models.Q(participants__is_verified=True))
+        return self.annotate(
+            num_participants=models.Count('participants'),
+            num_verified=verified,
+            total_revenue=models.ExpressionWrapper(
+                verified * models.F('price'),
+                output_field=models.DecimalField(max_digits=20, decimal_places=0),
+            ),
+        )
+
 class Event(models.Model):
     CATEGORY_CHOICES = (
         ('seminar', 'Seminar'),
@@ -36,18 +52,48 @@ class Event(models.Model):
     description = models.TextField()
     
     # SUDAH BENAR
+    # LEGACY: upload baru diolah worker menjadi varian WebP/JPEG di poster_variants (lihat events/images.py)
     poster = CloudinaryField('image', folder='posters', blank=True, null=True)
+    poster_variants = models.JSONField(default=dict, blank=True)
     
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='seminar')
     date_time = models.DateTimeField()
     location = models.CharField(max_length=200)
     price = models.DecimalField(max_digits=10, decimal_places=0, default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Kosong = tanpa batas. participant_count sekaligus jumlah kursi terpakai (lihat events/capacity.py)
+    capacity = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Kuota peserta; pendaftar setelah penuh masuk daftar tunggu",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Counter denormalisasi (dibaca O(1) oleh dashboard & blast email).
+    # Diupdate pakai F() di views; perbaiki drift via `manage.py reconcile_event_counters`
+    participant_count = models.PositiveIntegerField(default=0)
+    verified_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=0, default=0)
+    COUNTER_FIELDS = ('participant_count', 'verified_count', 'revenue')
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        # Index mengikuti pola query di views: filter kolom kiri, urutan kolom kanan
+        indexes = [
+            models.Index(fields=['status', '-date_time'], name='event_status_date_idx'),       # home
+            models.Index(fields=['status', 'created_at'], name='event_status_created_idx'),    # admin_approval_list
+            models.Index(fields=['organizer', '-created_at'], name='event_organizer_created_idx'),  # organizer_dashboard
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title) + "-" + str(uuid.uuid4())[:4]
+        # Counter hanya berubah lewat UPDATE atomik (F()); save() penuh dari instance lama (admin,
+        # approve, finish) jangan sampai menimpanya dengan nilai basi -> kuota bisa jebol
+        if not self._state.adding and not args and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -59,10 +105,31 @@ class Event(models.Model):
     
     @property
     def current_revenue(self):
-        verified_count = self.participants.filter(is_verified=True).count()
-        return verified_count * self.price
+        # Pakai hasil annotate dari with_stats() jika ada
+        if hasattr(self, 'total_revenue'):
+            return self.total_revenue
+        return self.revenue
+
+    def bump_counters(self, participants=0, verified=0):
+        """
+        Update counter secara atomik di level database (UPDATE ... SET x = x + n),
+        aman walau banyak pendaftaran masuk bersamaan.
+        """
+        Event.objects.filter(pk=self.pk).update(
+            participant_count=models.F('participant_count') + participants,
+            verified_count=models.F('verified_count') + verified,
+            revenue=models.F('revenue') + models.F('price') * verified,
+        )
 
 # 3. Model Peserta
+class ParticipantQuerySet(models.QuerySet):
+    def for_email(self, email):
+        """
+        Cari peserta berdasarkan email tanpa peduli huruf besar/kecil.
+        Pakai LOWER(email) = ... (bukan iexact) agar index fungsional terpakai.
+        """
+        return self.alias(email_lower=Lower('email')).filter(email_lower=email.lower())
+
 class Participant(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='participants')
     full_name = models.CharField(max_length=100)
@@ -72,49 +139,44 @@ class Participant(models.Model):
     
     # Field Cloudinary
     payment_proof = CloudinaryField('image', folder='payments', blank=True, null=True)
+    payment_proof_variants = models.JSONField(default=dict, blank=True)
+    # LEGACY: QR sekarang dirender on-demand di /ticket/<uuid>/qr.png (lihat events/qr.py).
+    # Kosongkan data lama dengan `manage.py migrate_qr_codes`.
     qr_code = CloudinaryField('image', folder='qrcodes', blank=True, null=True)
 
     is_verified = models.BooleanField(default=False)
     registered_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     validation_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    # Token dari form pendaftaran: submit ulang dengan token yang sama mengembalikan pendaftaran ini
+    idempotency_key = models.UUIDField(null=True, blank=True, unique=True, editable=False)
 
-    def save(self, *args, **kwargs):
-        if not self.qr_code:
-            domain = "portalevent.onrender.com" 
-            protocol = "https"
-            validation_url = f"{protocol}://{domain}/scan/{self.validation_id}/"
-            
-            # Generate QR
-            qr = qrcode.QRCode(box_size=10, border=4)
-            qr.add_data(validation_url)
-            qr.make(fit=True)
-            img = qr.make_image(fill_color="black", back_color="white")
-
-            buffer = BytesIO()
-            img.save(buffer, format="PNG")
-            buffer.seek(0)
-            
-            # --- HAPUS TRY/EXCEPT, BIARKAN CRASH JIKA ERROR ---
-            # Kita ingin melihat error aslinya!
-            
-            print("Mencoba upload ke Cloudinary...") # Debug log
-            
-            response = cloudinary.uploader.upload(
-                buffer, 
-                folder="qrcodes", 
-                public_id=f"qr-{self.validation_id}",
-                overwrite=True, 
-                resource_type="image"
-            )
-            
-            print("Upload Sukses! ID:", response['public_id']) # Debug log
-            self.qr_code = response['public_id']
-            # --------------------------------------------------
+    objects = ParticipantQuerySet.as_manager()
 
-        super().save(*args, **kwargs)
+    class Meta:
+        indexes = [
+            models.Index(Lower('email'), name='participant_email_lower_idx'),                  # check_ticket
+            models.Index(fields=['email', '-registered_at'], name='participant_email_reg_idx'),  # participant_dashboard
+            models.Index(fields=['event', '-registered_at', '-id'], name='participant_event_reg_idx'),  # roster (keyset)
+        ]
+        constraints = [
+            # Satu email satu tiket per event (duplikat lama digabung: manage.py merge_duplicate_participants)
+            models.UniqueConstraint('event', Lower('email'), name='participant_event_email_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.event.title}"
+
+    @cached_property
+    def ticket_token(self):
+        from .tickets import issue_token
+        return issue_token(self)
+
+    @property
+    def qr_url(self):
+        # URL ikut berubah jika isi token berubah (mis. setelah lunas), jadi aman di-cache immutable
+        return reverse('ticket_qr', args=[self.validation_id, 'png']) + f'?t={self.ticket_token}'
+
     
     def get_certificate_id(self):
         tgl = self.registered_at.strftime("%Y-%m-%d")
@@ -123,9 +185,154 @@ class Participant(models.Model):
         return f"{tgl}-{nama_safe}-{nomor_urut}"
         
 class Blacklist(models.Model):
-    email = models.EmailField(unique=True)
+    # Bukan EmailField: selain alamat persis, juga menerima aturan domain (lihat events/blacklist.py)
+    email = models.CharField(
+        max_length=254, unique=True,
+        help_text="Alamat (budi@spam.com), domain (@spam.com) atau semua subdomain (*.spam.com)",
+    )
     reason = models.TextField(blank=True, help_text="Alasan pemblokiran")
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return self.email
\ No newline at end of file
+        return self.email
+
+    def clean(self):
+        from .blacklist import parse_rule
+        try:
+            parse_rule(self.email)
+        except ValueError as e:
+            raise ValidationError({'email': str(e)})
+
+    def save(self, *args, **kwargs):
+        self.email = self.email.strip().lower()
+        super().save(*args, **kwargs)
+
+# 4. Antrian Job (pengganti threading.Thread, tahan restart worker)
+class Job(models.Model):
+    STATUS_CHOICES = (
+        ('pending', 'Menunggu'),
+        ('running', 'Diproses'),
+        ('done', 'Selesai'),
+        ('failed', 'Gagal'),
+    )
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    next_run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_run_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+# 5. Blast Email (progress bisa dipantau organizer)
+class BlastCampaign(models.Model):
+    STATUS_CHOICES = (
+        ('queued', 'Dalam Antrian'),
+        ('sending', 'Sedang Dikirim'),
+        ('done', 'Selesai'),
+        ('failed', 'Gagal'),
+    )
+    # Simpan maksimal sekian alamat gagal agar baris tidak membengkak
+    MAX_FAILURES_STORED = 500
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='blasts')
+    subject = models.CharField(max_length=200)
+    message = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    failures = models.JSONField(default=list, blank=True)
+    # Cursor keyset (id peserta terakhir yang diproses) agar bisa lanjut setelah retry
+    last_participant_id = models.BigIntegerField(default=0)
+    # Jumlah penerima di chunk yang sudah diklaim (maju bersama cursor)
+    processed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.subject} ({self.sent}/{self.total})"
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 100
+        # Dari chunk yang sudah diklaim, bukan hitungan kirim: sisa chunk yang terlewat
+        # karena worker mati tetap terhitung, jadi blast 'done' selalu 100%
+        return min(100, int(self.processed * 100 / self.total))
+
+
+# 6. Kehadiran (check-in di pintu masuk lewat scan QR)
+class Attendance(models.Model):
+    # OneToOne: satu tiket hanya bisa check-in sekali, dijaga constraint unik di DB
+    participant = models.OneToOneField(Participant, on_delete=models.CASCADE, related_name='attendance')
+    # Denormalisasi dari participant.event agar rekap per event tidak perlu JOIN
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='attendances')
+    checked_in_at = models.DateTimeField(default=timezone.now)
+    checked_in_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    device = models.CharField(max_length=100, blank=True, help_text="ID perangkat scanner")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event', 'checked_in_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.participant_id} @ {self.checked_in_at:%Y-%m-%d %H:%M}"
+
+
+# 7. Daftar tunggu (pendaftar setelah kuota penuh), dipromosikan berurutan saat ada kursi kosong
+class WaitlistEntry(models.Model):
+    STATUS_CHOICES = (
+        ('waiting', 'Menunggu'),
+        ('promoted', 'Dapat Kursi'),
+        ('cancelled', 'Batal'),
+    )
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='waitlist')
+    full_name = models.CharField(max_length=100)
+    email = models.EmailField()
+    phone = models.CharField(max_length=20)
+    institution = models.CharField(max_length=100, blank=True)
+    payment_proof_variants = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='waiting')
+    # Diisi saat dipromosikan; varian bukti bayar yang selesai diproses belakangan ikut disalin ke sini
+    participant = models.OneToOneField(
+        Participant, on_delete=models.SET_NULL, null=True, blank=True, related_name='waitlist_entry',
+    )
+    # Disalin ke Participant saat dipromosikan
+    idempotency_key = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event', 'status', 'created_at', 'id'], name='waitlist_queue_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                'event', Lower('email'), condition=models.Q(status='waiting'), name='waitlist_event_email_waiting_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.full_name} ({self.get_status_display()}) - {self.event_id}"
+
+    def on_image_ready(self, field, variants):
+        # Dipanggil events/images.py. Baca ulang dari DB: promosi bisa terjadi selama gambar diproses
+        participant_id = WaitlistEntry.objects.filter(pk=self.pk).values_list('participant_id', flat=True).first()
+        if participant_id:
+            Participant.objects.filter(pk=participant_id).update(**{f'{field}_variants': variants})
+
@@ -0,0 +1,241 @@
+"""
+Client notifikasi Telegram.
+
+- Satu requests.Session per proses (koneksi TLS dipakai ulang, pool dibatasi).
+- Timeout connect/read, tidak pernah menggantung tanpa batas.
+- Retry dengan exponential backoff + jitter untuk error jaringan, 5xx & 429.
+- Mode digest: notifikasi "event menunggu validasi" digabung jadi satu pesan
+  per TELEGRAM_DIGEST_SECONDS (lihat `notify_pending_event`).
+- `asend()`: versi async (httpx, di-import saat pertama dipakai) untuk task worker
+  `async def`; satu AsyncClient per event loop, aturan retry sama dengan `send()`.
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from . import tracing
+from .jobs import ASYNC_BATCH_CLEANUP, enqueue, enqueue_batched
+
+# Batas panjang pesan Telegram
+MAX_MESSAGE_LENGTH = 4096
+# Koneksi paralel maksimal ke API Telegram (per session / per event loop)
+MAX_CONNECTIONS = 10
+
+
+class TelegramError(Exception):
+    pass
+
+
+class TelegramNotifier:
+    def __init__(self, token, chat_id, api_url='https://api.telegram.org',
+                 connect_timeout=3.05, read_timeout=10, max_retries=3, backoff=0.5, sleep=time.sleep,
+                 async_sleep=asyncio.sleep):
+        self.token = token
+        self.chat_id = chat_id
+        self.api_url = api_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.async_sleep = async_sleep
+        self._session = None
+        self._lock = threading.Lock()
+        # Klien httpx terikat ke event loop pembuatnya
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONNECTIONS)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    @property
+    def async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import httpx
+            client = self._async_clients[loop] = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            )
+        return client
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self):
+        """Tutup klien async milik event loop yang sedang jalan."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after:
+            return float(retry_after)
+        # Full jitter: acak antara 0 .. backoff * 2^attempt
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    def _request(self, text, parse_mode):
+        url = f"{self.api_url}/bot{self.token}/sendMessage"
+        return url, {'chat_id': self.chat_id, 'text': text[:MAX_MESSAGE_LENGTH], 'parse_mode': parse_mode}
+
+    def _outcome(self, status_code, body, text):
+        """
+        Return (True, result) jika terkirim, atau (False, (error, retry_after)) jika boleh diulang.
+        4xx selain 429 (token salah, chat tidak ada, markdown rusak) tidak akan berhasil jika diulang: raise.
+        """
+        if status_code == 200 and body.get('ok'):
+            return True, body.get('result')
+        error = TelegramError(f"HTTP {status_code}: {body.get('description', text[:200])}")
+        if status_code == 429:
+            return False, (error, (body.get('parameters') or {}).get('retry_after'))
+        if status_code < 500:
+            raise error
+        return False, (error, None)
+
+    def _exhausted(self, last_error):
+        return TelegramError(f"Gagal kirim Telegram setelah {self.max_retries + 1} percobaan: {last_error}")
+
+    def send(self, text, parse_mode='Markdown'):
+        """Kirim pesan; return objek `result` dari Telegram. TelegramError jika tetap gagal."""
+        url, payload = self._request(text, parse_mode)
+        last_error = retry_after = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.sleep(self._delay(attempt - 1, retry_after))
+                retry_after = None
+            try:
+                with tracing.span('telegram.send', attempt=attempt + 1):
+                    response = self.session.post(url, data=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                continue
+
+            sent, result = self._outcome(response.status_code, _json(response), response.text)
+            if sent:
+                return result
+            last_error, retry_after = result
+        raise self._exhausted(last_error)
+
+    async def asend(self, text, parse_mode='Markdown'):
+        """Versi async `send()`: menunggu jaringan tanpa memblokir thread."""
+        import httpx
+        url, payload = self._request(text, parse_mode)
+        last_error = retry_after = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await self.async_sleep(self._delay(attempt - 1, retry_after))
+                retry_after = None
+            try:
+                with tracing.span('telegram.send', attempt=attempt + 1):
+                    response = await self.async_client.post(url, data=payload)
+            except httpx.TransportError as e:
+                last_error = e
+                continue
+
+            sent, result = self._outcome(response.status_code, _json(response), response.text)
+            if sent:
+                return result
+            last_error, retry_after = result
+        raise self._exhausted(last_error)
+
+
+def _json(response):
+    try:
+        return response.json()
+    except ValueError:
+        return {}
+
+
+_notifier = None
+
+
+def get_notifier():
+    """Notifier bersama untuk proses ini (session dipakai ulang antar job)."""
+    global _notifier
+    if _notifier is None:
+        _notifier = TelegramNotifier(
+            settings.TELEGRAM_BOT_TOKEN,
+            settings.TELEGRAM_CHAT_ID,
+            api_url=getattr(settings, 'TELEGRAM_API_URL', 'https://api.telegram.org'),
+            connect_timeout=getattr(settings, 'TELEGRAM_CONNECT_TIMEOUT', 3.05),
+            read_timeout=getattr(settings, 'TELEGRAM_READ_TIMEOUT', 10),
+            max_retries=getattr(settings, 'TELEGRAM_MAX_RETRIES', 3),
+        )
+    return _notifier
+
+
+def reset_notifier():
+    global _notifier
+    if _notifier is not None:
+        _notifier.close()
+    _notifier = None
+
+
+async def aclose_notifier():
+    if _notifier is not None:
+        await _notifier.aclose()
+
+
+# Worker membuat event loop baru per batch task async; klien httpx-nya ditutup di akhir batch
+ASYNC_BATCH_CLEANUP.append(aclose_notifier)
+
+
+# --- Notifikasi event menunggu validasi ---
+def pending_event_line(event):
+    return (
+        f"📝 *{event.title}* oleh {event.organizer.username} "
+        f"({event.date_time.strftime('%d %b %Y, %H:%M')}, Rp {event.price})"
+    )
+
+
+def pending_event_message(event):
+    return (
+        f"🔔 *PERMINTAAN VALIDASI BARU*\n\n"
+        f"Halo Admin, ada seminar baru masuk:\n\n"
+        f"📝 *Judul:* {event.title}\n"
+        f"👤 *Organizer:* {event.organizer.username}\n"
+        f"📅 *Tanggal:* {event.date_time.strftime('%d %b %Y, %H:%M')}\n"
+        f"💰 *Harga:* Rp {event.price}\n\n"
+        f"Mohon segera validasi di dashboard admin.\n"
+        f"👉 [Klik Disini untuk Validasi](https://{settings.SITE_DOMAIN}/admin-panel/approval/)"
+    )
+
+
+def digest_message(lines):
+    header = f"🔔 *{len(lines)} EVENT MENUNGGU VALIDASI*\n\n"
+    footer = f"\n\n👉 [Validasi di dashboard admin](https://{settings.SITE_DOMAIN}/admin-panel/approval/)"
+    body = ''
+    for i, line in enumerate(lines):
+        candidate = body + line + '\n'
+        if len(header) + len(candidate) + len(footer) + 40 > MAX_MESSAGE_LENGTH:
+            body += f"… dan {len(lines) - i} event lainnya\n"
+            break
+        body = candidate
+    return header + body.rstrip('\n') + footer
+
+
+def notify_pending_event(event):
+    """
+    Antrikan notifikasi admin untuk event baru. Dengan TELEGRAM_DIGEST_SECONDS > 0
+    notifikasi digabung ke satu job digest yang jalan paling lambat N detik lagi.
+    """
+    window = getattr(settings, 'TELEGRAM_DIGEST_SECONDS', 0)
+    if window > 0:
+        return enqueue_batched('send_telegram_digest', pending_event_line(event), delay=window)
+    return enqueue('send_telegram', pending_event_message(event))
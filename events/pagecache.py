@@ -0,0 +1,170 @@
+"""
+Cache halaman publik (home & event_detail).
+
+- Full page: hanya untuk GET/HEAD anonim tanpa flash message; POST & user login selalu bypass.
+- Fragment: kartu/info event di-key dengan id + updated_at, jadi otomatis basi saat event berubah.
+- Invalidasi: signal post_save/post_delete Event menaikkan versi daftar event & menghapus cache slug.
+
+Backend mengikuti settings.PAGE_CACHE_ALIAS (locmem, file, Redis, dll).
+"""
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+LIST_VERSION_KEY = 'pagecache:events:version'
+
+
+def get_cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def timeout():
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', 300)
+
+
+class CacheStats:
+    """Counter hit/miss per namespace (in-process, thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def record(self, namespace, hits=0, misses=0):
+        with self.lock:
+            self.counts[namespace]['hits'] += hits
+            self.counts[namespace]['misses'] += misses
+
+    def snapshot(self):
+        with self.lock:
+            result = {}
+            for namespace, c in self.counts.items():
+                total = c['hits'] + c['misses']
+                result[namespace] = dict(c, hit_rate=round(c['hits'] / total, 4) if total else 0.0)
+            return result
+
+    def reset(self):
+        with self.lock:
+            self.counts.clear()
+
+
+stats = CacheStats()
+
+
+# --- Versi & invalidasi ---
+def list_version():
+    version = get_cache().get(LIST_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        get_cache().add(LIST_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_event(event):
+    cache = get_cache()
+    cache.set(LIST_VERSION_KEY, time.time_ns(), None)
+    cache.delete(f'pagecache:event:slug:{event.slug}')
+
+
+def _version(event):
+    return int(event.updated_at.timestamp() * 1000000) if event.updated_at else 0
+
+
+# --- Full page ---
+def is_cacheable(request):
+    if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+        return False
+    # Jangan cache halaman yang membawa flash message milik user tertentu
+    return not len(get_messages(request))
+
+
+def cache_page(namespace, key_func):
+    """Decorator view: cache HTML untuk request anonim. key_func(request, *args, **kwargs) -> str."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_cacheable(request):
+                return view(request, *args, **kwargs)
+
+            cache = get_cache()
+            key = f'pagecache:page:{namespace}:{key_func(request, *args, **kwargs)}'
+            cached = cache.get(key)
+            if cached is not None:
+                stats.record(namespace, hits=1)
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Page-Cache'] = 'HIT'
+                return response
+
+            stats.record(namespace, misses=1)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(key, (response.content, response['Content-Type']), timeout())
+                response['X-Page-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+# --- Objek & fragment ---
+def get_event_by_slug(slug, queryset):
+    """Lookup event by slug lewat cache; None jika tidak ada."""
+    cache = get_cache()
+    key = f'pagecache:event:slug:{slug}'
+    event = cache.get(key)
+    if event is not None:
+        stats.record('event_lookup', hits=1)
+        return event
+
+    stats.record('event_lookup', misses=1)
+    event = queryset.filter(slug=slug).first()
+    if event is not None:
+        cache.set(key, event, timeout())
+    return event
+
+
+async def aget_event_by_slug(slug, queryset):
+    """Versi async get_event_by_slug (cache & ORM async, untuk view ASGI)."""
+    cache = get_cache()
+    key = f'pagecache:event:slug:{slug}'
+    event = await cache.aget(key)
+    if event is not None:
+        stats.record('event_lookup', hits=1)
+        return event
+
+    stats.record('event_lookup', misses=1)
+    event = await queryset.filter(slug=slug).afirst()
+    if event is not None:
+        await cache.aset(key, event, timeout())
+    return event
+
+
+def render_fragments(template_name, events, name='event'):
+    """Render fragment per event (key: id + updated_at), ambil sekaligus via get_many."""
+    cache = get_cache()
+    keys = {
+        event.pk: f'pagecache:frag:{template_name}:{event.pk}:{_version(event)}'
+        for event in events
+    }
+    cached = cache.get_many(list(keys.values()))
+    stats.record('fragment', hits=len(cached), misses=len(keys) - len(cached))
+
+    fresh = {}
+    result = []
+    for event in events:
+        key = keys[event.pk]
+        html = cached.get(key)
+        if html is None:
+            html = render_to_string(template_name, {name: event})
+            fresh[key] = html
+        result.append(mark_safe(html))
+    if fresh:
+        cache.set_many(fresh, timeout())
+    return result
@@ -0,0 +1,82 @@
+"""
+Verifikasi pembayaran peserta (satuan maupun massal).
+
+Satu batch = 1 SELECT (izin dicek di SQL lewat join ke event) + 1 UPDATE
+peserta + 1 UPDATE counter event + 1 INSERT job email, berapa pun jumlahnya.
+Status diubah lewat satu queryset.update() bersyarat (is_verified=False) untuk
+seluruh batch, bukan Participant.save() per peserta (N query UPDATE). Counter &
+email hanya untuk baris yang benar-benar diubah UPDATE tersebut, jadi verifikasi
+bersamaan tidak membuatnya dobel walau select_for_update tidak mengunci (SQLite).
+"""
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .jobs import enqueue_many
+from .models import Event, Participant
+
+# Batas id per request, aman untuk batas parameter SQLite dan ukuran payload
+MAX_BULK_VERIFY = 1000
+
+
+def confirmation_email(full_name, email, event_title):
+    """Argumen task 'send_email' untuk konfirmasi pembayaran satu peserta."""
+    subject = f"Pembayaran Terverifikasi: {event_title}"
+    message = (
+        f"Halo {full_name},\n\n"
+        f"Pembayaran Anda untuk event '{event_title}' telah diverifikasi oleh penyelenggara.\n"
+        f"Tiket (QR Code) dapat dilihat di: https://{settings.SITE_DOMAIN}{reverse('check_ticket')}?{urlencode({'email': email})}\n\n"
+        f"Sampai jumpa di acara!\n"
+        f"Admin Seminar Portal"
+    )
+    return [subject, message, settings.EMAIL_HOST_USER, [email]]
+
+
+def verify_participants(user, event_id, participant_ids):
+    """
+    Tandai lunas peserta `participant_ids` milik event `event_id` yang boleh diverifikasi `user`.
+    Id yang sudah lunas, tidak ada, milik event lain, atau tanpa izin dilewati (skipped).
+    """
+    ids = set(participant_ids)
+    pending = Participant.objects.filter(id__in=ids, event_id=event_id, is_verified=False)
+    if not user.is_superuser:
+        pending = pending.filter(event__organizer=user)
+
+    with transaction.atomic():
+        # Kunci baris (PostgreSQL) agar klik ganda / dua tab tidak mengirim email dua kali
+        rows = list(
+            pending.select_for_update(of=('self',))
+            .order_by('id')
+            .values_list('id', 'full_name', 'email', 'event__title')
+        )
+        candidates = {row[0]: row for row in rows}
+        verified_ids = []
+        if candidates:
+            now = timezone.now()
+            changed = Participant.objects.filter(id__in=candidates, is_verified=False).update(
+                is_verified=True, updated_at=now,
+            )
+            verified_ids = list(candidates)
+            if changed != len(candidates):
+                # SQLite tidak mengunci baris: sebagian sudah diverifikasi request lain di antara
+                # SELECT dan UPDATE. Hanya baris yang diubah UPDATE ini yang dihitung & dikirimi email
+                verified_ids = list(
+                    Participant.objects.filter(id__in=candidates, is_verified=True, updated_at=now)
+                    .order_by('id').values_list('id', flat=True)
+                )
+        if verified_ids:
+            Event(pk=event_id).bump_counters(verified=len(verified_ids))
+            enqueue_many('send_email', [
+                confirmation_email(name, email, title) for _, name, email, title in map(candidates.get, verified_ids)
+            ])
+
+    return {
+        'requested': len(ids),
+        'verified': len(verified_ids),
+        'skipped': len(ids) - len(verified_ids),
+        'verified_ids': verified_ids,
+        'emails_queued': len(verified_ids),
+    }
@@ -0,0 +1,272 @@
+"""
+Harness benchmark view (dipakai oleh `manage.py bench_views`).
+
+Tiap skenario dijalankan lewat django.test.Client: latency p50/p95 dari beberapa
+run, jumlah query (harus stabil), dan puncak alokasi memori Python (tracemalloc,
+diukur di run terpisah karena tracemalloc memperlambat eksekusi).
+Hasil dibandingkan dengan baseline JSON yang di-commit.
+"""
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _request(client, scenario):
+    method = getattr(client, scenario.get('method', 'get'))
+    data = scenario.get('data')
+    # Callable: data baru per request (mis. pendaftaran dengan email unik)
+    response = method(scenario['url'], data() if callable(data) else data, secure=True)
+    # Response streaming baru menjalankan query saat body dibaca
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    else:
+        response.content
+    return response
+
+
+def run_scenario(client, scenario, runs=20, warmup=2):
+    for _ in range(warmup):
+        _request(client, scenario)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = _request(client, scenario)
+    queries = len(ctx.captured_queries)
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _request(client, scenario)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        _request(client, scenario)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'status': response.status_code,
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'queries': queries,
+        'peak_kb': round(peak / 1024),
+    }
+
+
+def run_http(base_url, paths, requests_per_path=100, concurrency=8, headers=None):
+    """Beban konkuren (GET) ke server yang sedang jalan (runserver/gunicorn/uvicorn)."""
+    import requests
+
+    results = {}
+    for name, path in paths.items():
+        url = base_url.rstrip('/') + path
+
+        def hit(_):
+            with requests.Session() as session:
+                start = time.perf_counter()
+                response = session.get(url, headers=headers, timeout=30)
+                return (time.perf_counter() - start) * 1000, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(hit, range(requests_per_path)))
+        elapsed = time.perf_counter() - started
+        timings = [t for t, _ in samples]
+        results[name] = {
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'rps': round(len(samples) / elapsed, 1),
+            'errors': sum(1 for _, status in samples if status >= 400),
+        }
+    return results
+
+
+# --- API eksternal tiruan (bench_asgi) ---
+def serve_stub_telegram(latency=0.2):
+    """
+    Server lokal pengganti api.telegram.org: setiap sendMessage dijawab OK setelah
+    `latency` detik. Return server yang sudah jalan (panggil shutdown() + server_close()).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            time.sleep(latency)
+            body = b'{"ok": true, "result": {}}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def notifier_throughput(api_url, messages=50, threads=4):
+    """
+    Kirim `messages` pesan lewat TelegramNotifier ke `api_url`:
+    - 'sync': send() di `threads` thread (model worker lama, satu thread per kiriman);
+    - 'async': asend() bersamaan di satu event loop (task `async def` di worker).
+    Return {mode: {'seconds', 'per_second'}}.
+    """
+    import asyncio
+
+    from .notifier import TelegramNotifier
+
+    def measure(run):
+        notifier = TelegramNotifier('BENCH', '1', api_url=api_url)
+        try:
+            start = time.perf_counter()
+            run(notifier)
+            elapsed = time.perf_counter() - start
+        finally:
+            notifier.close()
+        return {'seconds': round(elapsed, 2), 'per_second': round(messages / elapsed, 1)}
+
+    def run_sync(notifier):
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(notifier.send, (f'bench {i}' for i in range(messages))))
+
+    async def run_async(notifier):
+        try:
+            await asyncio.gather(*(notifier.asend(f'bench {i}') for i in range(messages)))
+        finally:
+            await notifier.aclose()
+
+    return {
+        'sync': measure(run_sync),
+        'async': measure(lambda notifier: asyncio.run(run_async(notifier))),
+    }
+
+
+# --- Boot worker (bench_startup & test import) ---
+# Tidak boleh ikut dimuat saat aplikasi WSGI + URLconf di-load
+HEAVY_MODULES = ('openpyxl', 'reportlab', 'qrcode', 'PIL', 'httpx')
+# Pembanding: modul yang dulu di-import di level modul views/models/settings
+EAGER_IMPORTS = (
+    'openpyxl', 'reportlab.pdfgen.canvas', 'reportlab.lib.utils', 'qrcode', 'qrcode.image.svg',
+    'PIL.Image', 'cloudinary.api',
+)
+
+BOOT_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+application = get_wsgi_application()
+get_resolver().url_patterns
+{extra}
+print(json.dumps({{
+    'boot_ms': (time.perf_counter() - start) * 1000,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': sorted(sys.modules),
+}}))
+"""
+
+
+def parse_importtime(text):
+    """Output `python -X importtime` -> list {'name', 'self_us', 'cumulative_us', 'depth'}."""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        head, cumulative, name = line.split('|')
+        rows.append({
+            'name': name.strip(),
+            'self_us': int(head.split(':')[1]),
+            'cumulative_us': int(cumulative),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+    return rows
+
+
+def startup_profile(runs=5, extra_imports=()):
+    """
+    Boot worker (aplikasi WSGI + URLconf) di interpreter baru, `runs` kali.
+    Return median boot_ms, rss_kb & import_ms, modul berat yang ikut dimuat,
+    dan 10 import level atas termahal.
+    """
+    script = BOOT_SCRIPT.format(extra="\n".join(f"import {name}" for name in extra_imports))
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR, check=True,
+        )
+        # Baris terakhir stdout; baris sebelumnya bisa berisi log saat setup
+        sample = json.loads(proc.stdout.strip().splitlines()[-1])
+        sample['imports'] = parse_importtime(proc.stderr)
+        samples.append(sample)
+
+    last = samples[-1]
+    top = sorted((row for row in last['imports'] if row['depth'] == 0), key=lambda row: -row['cumulative_us'])
+    return {
+        'boot_ms': round(statistics.median(s['boot_ms'] for s in samples), 1),
+        'rss_kb': int(statistics.median(s['rss_kb'] for s in samples)),
+        'import_ms': round(statistics.median(sum(r['self_us'] for r in s['imports']) for s in samples) / 1000, 1),
+        'heavy': [name for name in HEAVY_MODULES if name in last['modules']],
+        'top': [(row['name'], round(row['cumulative_us'] / 1000, 1)) for row in top[:10]],
+    }
+
+
+def compare(results, baseline, tolerance=0.5):
+    """
+    Bandingkan hasil dengan baseline. Return list pesan regresi:
+    - jumlah query tidak boleh naik sama sekali;
+    - p50 & peak memori boleh naik maksimal `tolerance` (default 50%, timer mesin bersama berisik);
+    - p95 lebih berisik, diberi kelonggaran dua kali lipat.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current['queries'] > base['queries']:
+            regressions.append(f"{name}: query {base['queries']} -> {current['queries']}")
+        for metric, slack, floor in (('p50_ms', tolerance, 2), ('p95_ms', tolerance * 2, 5), ('peak_kb', tolerance, 64)):
+            # Selisih absolut kecil (< floor) dianggap noise timer/alokasi
+            if current[metric] > base[metric] * (1 + slack) and current[metric] - base[metric] > floor:
+                regressions.append(f"{name}: {metric} {base[metric]} -> {current[metric]}")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['scenarios']
+
+
+def save_baseline(path, results, meta):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'scenarios': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
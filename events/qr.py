@@ -0,0 +1,61 @@
+"""
+Render QR tiket on-demand. Isi QR sepenuhnya ditentukan oleh validation_id,
+jadi hasilnya bisa di-cache selamanya: LRU di memori proses + Django cache.
+"""
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import tickets, tracing
+
+# Naikkan jika tampilan QR diubah, supaya ETag & cache lama tidak terpakai
+QR_VERSION = 1
+
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+
+def validation_url(validation_id, token=None):
+    # Token bertanda tangan ikut di QR agar scanner bisa memverifikasi tanpa DB (lihat tickets.py)
+    url = f"https://{settings.SITE_DOMAIN}/scan/{validation_id}/"
+    return f"{url}?t={token}" if token else url
+
+
+def qr_etag(validation_id, fmt, token=None):
+    suffix = f"-{tickets.token_digest(token)}" if token else ""
+    return f'"qr-v{QR_VERSION}-{fmt}-{validation_id}{suffix}"'
+
+
+def render_qr(validation_id, fmt='png', token=None):
+    # Import di sini: qrcode (+ Pillow untuk PNG) hanya dimuat proses yang benar-benar merender QR
+    import qrcode
+    from qrcode.image.svg import SvgPathImage
+
+    with tracing.span('qr.render', fmt=fmt):
+        qr = qrcode.QRCode(box_size=10, border=4)
+        qr.add_data(validation_url(validation_id, token))
+        qr.make(fit=True)
+
+        buffer = BytesIO()
+        if fmt == 'svg':
+            qr.make_image(image_factory=SvgPathImage).save(buffer)
+        else:
+            qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+        return buffer.getvalue()
+
+
+@lru_cache(maxsize=1024)
+def get_qr(validation_id, fmt='png', token=None):
+    """Ambil QR dari LRU proses -> Django cache -> render baru."""
+    key = f"qr:v{QR_VERSION}:{fmt}:{validation_id}"
+    if token:
+        key += f":{tickets.token_digest(token)}"
+    data = cache.get(key)
+    if data is None:
+        data = render_qr(validation_id, fmt, token)
+        cache.set(key, data, timeout=None)
+    return data
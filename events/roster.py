@@ -0,0 +1,99 @@
+"""
+Daftar peserta per event untuk organizer (halaman peserta & infinite scroll).
+
+- Keyset pagination pada (registered_at, id) menurun, memakai index
+  participant_event_reg_idx, jadi halaman ke-400 sama cepatnya dengan halaman 1.
+- Filter status (lunas/pending) dan instansi dijalankan di SQL.
+- Pencarian nama/email/instansi:
+  PostgreSQL: index GIN trigram (pg_trgm) atas ekspresi SEARCH_EXPR, dipakai LIKE '%q%'.
+  Lainnya (SQLite): LIKE tanpa index, tetap dibatasi ke satu event lewat index event.
+"""
+from datetime import datetime
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Participant
+from .search import decode_cursor, encode_cursor
+
+PAGE_SIZE = 50
+TRGM_INDEX = 'participant_search_trgm'
+
+# Ekspresi harus sama persis dengan yang di-index agar planner memakai index trigram
+SEARCH_EXPR = (
+    "lower(events_participant.full_name || ' ' || events_participant.email"
+    " || ' ' || events_participant.institution)"
+)
+
+# Kolom yang dirender di baris tabel; tanpa event (tidak ada query tambahan per baris)
+ROW_FIELDS = (
+    'id', 'full_name', 'email', 'phone', 'institution',
+    'payment_proof', 'payment_proof_variants', 'is_verified', 'registered_at',
+)
+
+
+def install(conn=None):
+    """Pasang index trigram di PostgreSQL (idempoten). Tanpa hak CREATE EXTENSION: dilewati."""
+    conn = conn or connection
+    if conn.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON events_participant "
+                f"USING GIN (({SEARCH_EXPR.replace('events_participant.', '')}) gin_trgm_ops)"
+            )
+    except Exception:
+        # Pencarian tetap jalan (LIKE biasa), hanya tanpa index
+        return
+
+
+def uninstall(conn=None):
+    conn = conn or connection
+    if conn.vendor == 'postgresql':
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {TRGM_INDEX}")
+
+
+def _like_pattern(q):
+    escaped = q.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _search(queryset, q):
+    if connection.vendor == 'postgresql':
+        return queryset.extra(where=[f"{SEARCH_EXPR} LIKE %s"], params=[_like_pattern(q)])
+    return queryset.filter(
+        Q(full_name__icontains=q) | Q(email__icontains=q) | Q(institution__icontains=q)
+    )
+
+
+def participant_page(event, status=None, institution=None, q=None, cursor=None, limit=PAGE_SIZE):
+    """Return (list peserta, cursor halaman berikutnya atau None)."""
+    queryset = Participant.objects.filter(event=event).only(*ROW_FIELDS)
+    if status == 'verified':
+        queryset = queryset.filter(is_verified=True)
+    elif status == 'pending':
+        queryset = queryset.filter(is_verified=False)
+    if institution:
+        queryset = queryset.filter(institution__iexact=institution.strip())
+    q = (q or '').strip()
+    if q:
+        queryset = _search(queryset, q)
+
+    # Cursor rusak / dimanipulasi (waktu atau id tidak valid) diabaikan: kembali ke halaman pertama
+    after = decode_cursor(cursor, datetime.fromisoformat) if cursor else None
+    if after:
+        registered_at, last_id = after
+        queryset = queryset.filter(
+            Q(registered_at__lt=registered_at) | Q(registered_at=registered_at, id__lt=last_id)
+        )
+
+    results = list(queryset.order_by('-registered_at', '-id')[:limit + 1])
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        next_cursor = encode_cursor([last.registered_at.isoformat(), last.id])
+    return results, next_cursor
@@ -0,0 +1,221 @@
+"""
+Pencarian full-text event.
+
+- PostgreSQL: kolom generated `search_vector` (tsvector) + GIN index.
+- SQLite: virtual table FTS5 `events_event_fts`, disinkronkan oleh trigger.
+- Backend lain / FTS5 tidak tersedia: fallback icontains (tanpa index).
+
+Hasil diurutkan berdasarkan relevansi dan dipaginasi dengan keyset (cursor).
+"""
+import base64
+import json
+import re
+from datetime import datetime
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Event
+
+FTS_TABLE = 'events_event_fts'
+PAGE_SIZE = 20
+
+# Bobot kolom: judul > kategori > lokasi > deskripsi
+SQLITE_SETUP = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, location, category,
+        content='events_event', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON events_event BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, location, category)
+        VALUES (new.id, new.title, new.description, new.location, new.category);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON events_event BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location, category)
+        VALUES ('delete', old.id, old.title, old.description, old.location, old.category);
+    END""",
+    # Hanya kolom yang diindex; update counter peserta tidak memicu reindex
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF title, description, location, category ON events_event BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location, category)
+        VALUES ('delete', old.id, old.title, old.description, old.location, old.category);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, location, category)
+        VALUES (new.id, new.title, new.description, new.location, new.category);
+    END""",
+]
+
+POSTGRES_SETUP = [
+    """ALTER TABLE events_event ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(category, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(location, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS events_event_search_gin ON events_event USING GIN (search_vector)",
+]
+
+
+def _sqlite_triggers(cursor):
+    cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+        [f'{FTS_TABLE}_a%'],
+    )
+    return cursor.fetchone()[0]
+
+
+def install(conn=None):
+    """
+    Pasang index full-text (idempoten). Dipanggil dari migrasi & post_migrate,
+    karena SQLite membuang trigger saat Django membangun ulang tabel events_event.
+    """
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for sql in POSTGRES_SETUP:
+                cursor.execute(sql)
+        elif conn.vendor == 'sqlite':
+            if _sqlite_triggers(cursor) == 3:
+                return
+            try:
+                for sql in SQLITE_SETUP:
+                    cursor.execute(sql)
+            except Exception:
+                # SQLite tanpa modul FTS5: pencarian memakai fallback icontains
+                return
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall(conn=None):
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS events_event_search_gin")
+            cursor.execute("ALTER TABLE events_event DROP COLUMN IF EXISTS search_vector")
+        elif conn.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def backend():
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        return 'sqlite'
+    return None
+
+
+def _fts5_query(q):
+    # Setiap kata jadi prefix-term yang di-quote, semua kata wajib ada (AND)
+    terms = re.findall(r'\w+', q, flags=re.UNICODE)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _with_rank(queryset, q):
+    engine = backend()
+    if engine == 'postgresql':
+        tsquery = "websearch_to_tsquery('simple', %s)"
+        # Kolom search_vector tidak dideklarasikan di model (generated column), jadi pakai SQL langsung
+        return queryset.extra(
+            where=[f"events_event.search_vector @@ {tsquery}"], params=[q],
+        ).annotate(rank=RawSQL(f"ts_rank_cd(events_event.search_vector, {tsquery})", [q], output_field=FloatField()))
+
+    if engine == 'sqlite':
+        match = _fts5_query(q)
+        if not match:
+            return queryset.none()
+        # Join langsung ke tabel FTS: MATCH dan bm25 dihitung sekali per baris hasil
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = events_event.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        ).annotate(rank=RawSQL(
+            # bm25 makin kecil makin relevan -> dinegasikan agar urutan sama dengan Postgres
+            f"-bm25({FTS_TABLE}, 10.0, 1.0, 3.0, 5.0)", [], output_field=FloatField(),
+        ))
+
+    words = q.split()
+    condition = Q()
+    for word in words:
+        condition &= (
+            Q(title__icontains=word) | Q(description__icontains=word)
+            | Q(location__icontains=word) | Q(category__icontains=word)
+        )
+    return queryset.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _parse_rank(value):
+    # Rank selalu angka JSON; string angka ("1.5") atau boolean berarti cursor dimanipulasi
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(value)
+    return float(value)
+
+
+def decode_cursor(cursor, parse_key=None):
+    """
+    [key, id] dari cursor; None jika cursor rusak atau dimanipulasi (dianggap tanpa cursor).
+    parse_key: konversi key (float, datetime.fromisoformat, ...), ValueError/TypeError = tidak valid.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        return None
+    if not (isinstance(values, list) and len(values) == 2):
+        return None
+    key, last_id = values
+    if isinstance(last_id, bool) or not isinstance(last_id, int):
+        return None
+    if parse_key is not None:
+        try:
+            key = parse_key(key)
+        except (ValueError, TypeError):
+            return None
+    return [key, last_id]
+
+
+def search_events(q='', category=None, date_from=None, date_to=None, price=None, cursor=None, limit=PAGE_SIZE):
+    """Return (list event, cursor halaman berikutnya atau None)."""
+    queryset = Event.objects.filter(status='active')
+    if category:
+        queryset = queryset.filter(category=category)
+    if date_from:
+        queryset = queryset.filter(date_time__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date_time__date__lte=date_to)
+    if price == 'free':
+        queryset = queryset.filter(price=0)
+    elif price == 'paid':
+        queryset = queryset.filter(price__gt=0)
+
+    q = (q or '').strip()
+    if q:
+        queryset = _with_rank(queryset, q)
+        after = decode_cursor(cursor, _parse_rank) if cursor else None
+        if after:
+            rank, last_id = after
+            queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, id__gt=last_id))
+        queryset = queryset.order_by('-rank', 'id')
+    else:
+        # Tanpa kata kunci: event terdekat lebih dulu
+        after = decode_cursor(cursor, datetime.fromisoformat) if cursor else None
+        if after:
+            date_time, last_id = after
+            queryset = queryset.filter(Q(date_time__gt=date_time) | Q(date_time=date_time, id__gt=last_id))
+        queryset = queryset.order_by('date_time', 'id')
+
+    results = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        next_cursor = encode_cursor([last.rank if q else last.date_time.isoformat(), last.id])
+    return results, next_cursor
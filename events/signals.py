@@ -1,7 +1,12 @@
 from django.dispatch import receiver
+from django.db import connections
+from django.db.models.signals import post_save, post_delete, post_migrate
 from allauth.account.signals import user_signed_up
 from django.contrib.auth import get_user_model
 
+from .models import Blacklist, Event, Participant
+from . import blacklist, capacity, pagecache, search
+
 User = get_user_model()
 
 @receiver(user_signed_up)
@@ -9,4 +14,39 @@ def user_signed_up_(request, user, **kwargs):
     # Logika: Setiap ada user baru yang daftar lewat Google (Social Account),
     # otomatis jadikan dia Organizer.
     user.is_organizer = True
-    user.save()
\ No newline at end of file
+    user.save()
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_cache(sender, instance, **kwargs):
+    # Event berubah/dihapus: buang cache halaman publik yang memuatnya
+    pagecache.invalidate_event(instance)
+
+
+@receiver(post_save, sender=Event)
+def promote_after_capacity_change(sender, instance, created, **kwargs):
+    # Kuota dinaikkan/dihapus: isi kursi kosong dari daftar tunggu
+    if not created and instance.waitlist.filter(status='waiting').exists():
+        capacity.fill_from_waitlist(instance)
+
+
+@receiver(post_delete, sender=Participant)
+def release_participant_seat(sender, instance, origin=None, **kwargs):
+    # Ikut terhapus bersama event-nya: tidak ada kursi yang perlu dialihkan
+    if isinstance(origin, Event) or getattr(origin, 'model', None) is Event:
+        return
+    capacity.release_seat(instance)
+
+
+@receiver(post_save, sender=Blacklist)
+@receiver(post_delete, sender=Blacklist)
+def invalidate_blacklist(sender, instance, **kwargs):
+    # Matcher di setiap proses dibangun ulang saat versi berubah
+    blacklist.invalidate()
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using, **kwargs):
+    # SQLite membuang trigger FTS saat tabel event dibangun ulang oleh migrasi
+    if sender.name == 'events':
+        search.install(connections[using])
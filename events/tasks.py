@@ -0,0 +1,56 @@
+"""
+Task background yang dijalankan oleh `manage.py run_worker`.
+
+Notifikasi (email, Telegram) berupa task `async def`: satu batch dikirim bersamaan
+di satu event loop (lihat jobs.run_pending), bukan satu thread per kiriman.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.mail import send_mail
+
+from . import images, tracing
+from .blast import run_campaign
+from .jobs import task
+from .models import BlastCampaign
+from .notifier import digest_message
+from .utils import asend_telegram_message
+
+logger = logging.getLogger(__name__)
+
+
+@task('send_email')
+async def send_email(subject, message, from_email, recipient_list):
+    # fail_silently=False: biarkan error naik supaya job di-retry.
+    # smtplib blocking: jalan di thread terpisah (tanpa ORM) agar event loop tetap bebas
+    with tracing.span('smtp.send_mail', recipients=len(recipient_list)):
+        await sync_to_async(send_mail, thread_sensitive=False)(
+            subject, message, from_email, recipient_list, fail_silently=False,
+        )
+    logger.info("Email berhasil dikirim ke: %s", recipient_list)
+
+
+@task('send_telegram')
+async def send_telegram(message):
+    if not await asend_telegram_message(message):
+        raise RuntimeError("Gagal kirim Telegram")
+    logger.info("Telegram notif terkirim.")
+
+
+@task('send_telegram_digest')
+async def send_telegram_digest(lines):
+    if not await asend_telegram_message(digest_message(lines)):
+        raise RuntimeError("Gagal kirim digest Telegram")
+    logger.info("Digest Telegram terkirim (%d event).", len(lines))
+
+
+@task('process_image')
+def process_image(model_label, pk, field, temp_name):
+    images.process(model_label, pk, field, temp_name)
+
+
+@task('send_blast')
+def send_blast(campaign_id):
+    campaign = BlastCampaign.objects.get(pk=campaign_id)
+    if campaign.status != 'done':
+        run_campaign(campaign)
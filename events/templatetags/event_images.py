@@ -0,0 +1,55 @@
+"""
+Tag gambar responsif untuk varian hasil events/images.py.
+
+    {% load event_images %}
+    {% responsive_image event.poster_variants event.poster alt=event.title sizes="(max-width: 768px) 100vw, 33vw" class="card-img-top" %}
+    <a href="{% image_url p.payment_proof_variants p.payment_proof 'large' %}">...</a>
+
+Argumen kedua = field Cloudinary lama, dipakai jika varian belum ada (data lama).
+"""
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from .. import images
+
+register = template.Library()
+
+
+def _legacy_url(legacy):
+    try:
+        return legacy.url if legacy else None
+    except AttributeError:
+        return None
+
+
+@register.simple_tag
+def image_url(variants, legacy=None, label='large', fmt='jpeg'):
+    """URL satu varian (default JPEG terbesar), atau URL lama jika belum diproses."""
+    return images.variant_url(variants, label, fmt) or _legacy_url(legacy) or ''
+
+
+@register.filter
+def image_pending(variants):
+    return bool(variants) and variants.get('status') == images.PENDING
+
+
+@register.simple_tag
+def responsive_image(variants, legacy=None, alt='', sizes='100vw', default='medium', **attrs):
+    """<picture> dengan srcset WebP + JPEG; lazy-load kecuali diberi loading="eager"."""
+    attrs.setdefault('loading', 'lazy')
+    extra = format_html_join('', ' {}="{}"', attrs.items())
+
+    fallback = images.variant_url(variants, default, 'jpeg')
+    if fallback is None:
+        legacy_url = _legacy_url(legacy)
+        if not legacy_url:
+            return ''
+        return format_html('<img src="{}" alt="{}"{}>', legacy_url, alt, extra)
+
+    item = next(i for i in images.sources(variants, 'jpeg') if i['url'] == fallback)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}"{}></picture>',
+        images.srcset(variants, 'webp'), sizes,
+        fallback, images.srcset(variants, 'jpeg'), sizes, item['width'], item['height'], alt, extra,
+    )
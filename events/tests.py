@@ -1,3 +1,1714 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs
+from unittest import mock
 
-# Create your tests here.
+import openpyxl
+from asgiref.sync import iscoroutinefunction
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.models import QuerySet
+from django.template import Context, Template
+from django.test import AsyncClient, Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import blacklist, capacity, certificates, checkin, exports, images, jobs, metrics, notifier, pagecache, payments, perf, qr, roster, search, tickets, tracing, warmup
+from .blast import Throttle, run_campaign
+from .forms import RegistrationForm
+from .models import User, Event, Participant, Attendance, Blacklist, Job, BlastCampaign, WaitlistEntry
+
+
+# base.html memanggil provider_login_url 'google', butuh SocialApp
+GOOGLE_APP = override_settings(SOCIALACCOUNT_PROVIDERS={
+    'google': {'APP': {'client_id': 'test', 'secret': 'test', 'key': ''}},
+})
+
+
+def make_event(organizer, **kwargs):
+    data = {
+        'title': 'Seminar Nasional',
+        'description': 'Deskripsi',
+        'date_time': timezone.now() + timedelta(days=7),
+        'location': 'Aula',
+        'price': 50000,
+        'status': 'active',
+    }
+    data.update(kwargs)
+    return Event.objects.create(organizer=organizer, **data)
+
+
+def make_participant(event, **kwargs):
+    data = {
+        'full_name': 'Budi',
+        'email': 'budi@example.com',
+        'phone': '0812',
+    }
+    data.update(kwargs)
+    return Participant.objects.create(event=event, **data)
+
+
+@GOOGLE_APP
+class EventStatsTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username='org', email='org@example.com', password='x', is_organizer=True,
+        )
+
+    def test_with_stats_annotations(self):
+        event = make_event(self.organizer)
+        make_participant(event, is_verified=True)
+        make_participant(event, is_verified=True, email='ani@example.com')
+        make_participant(event, email='citra@example.com')
+
+        event = Event.objects.with_stats().get(pk=event.pk)
+        self.assertEqual(event.num_participants, 3)
+        self.assertEqual(event.num_verified, 2)
+        self.assertEqual(event.current_revenue, 100000)
+
+    def test_dashboard_query_count_is_constant(self):
+        self.client.force_login(self.organizer)
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse('organizer_dashboard'))
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        event = make_event(self.organizer)
+        make_participant(event, is_verified=True)
+        count_queries()  # warm-up (Site di-cache setelah request pertama)
+        baseline = count_queries()
+
+        for i in range(10):
+            event = make_event(self.organizer, title=f'Event {i}')
+            make_participant(event, is_verified=True)
+            make_participant(event, email='ani@example.com')
+        self.assertEqual(count_queries(), baseline)
+
+
+@GOOGLE_APP
+class EventCounterTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username='org', email='org@example.com', password='x', is_organizer=True,
+        )
+        self.event = make_event(self.organizer)
+
+    def test_verify_payment_bumps_counters_once(self):
+        participant = make_participant(self.event)
+        self.event.bump_counters(participants=1)
+        self.client.force_login(self.organizer)
+
+        url = reverse('verify_payment', args=[participant.id])
+        self.client.get(url)
+        self.client.get(url)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 1)
+        self.assertEqual(self.event.verified_count, 1)
+        self.assertEqual(self.event.revenue, 50000)
+
+    def test_bulk_verify(self):
+        pending = [make_participant(self.event, email=f'p{i}@example.com') for i in range(3)]
+        paid = make_participant(self.event, email='lunas@example.com', is_verified=True)
+        elsewhere = make_participant(make_event(self.organizer, title='Lain'), email='lain@example.com')
+        ids = [p.id for p in pending] + [paid.id, elsewhere.id]
+        url = reverse('verify_payments_bulk', args=[self.event.id])
+
+        intruder = User.objects.create_user(username='lain', password='x')
+        self.client.force_login(intruder)
+        self.assertEqual(self.client.post(url, {'ids': ids}).json()['verified'], 0)
+
+        self.client.force_login(self.organizer)
+        # session, user, select peserta, update peserta, update counter, insert job (+ savepoint)
+        with self.assertNumQueries(8):
+            response = self.client.post(url, {'ids': ids})
+        self.assertEqual(response.json(), {
+            'requested': 5, 'verified': 3, 'skipped': 2,
+            'verified_ids': [p.id for p in pending], 'emails_queued': 3,
+        })
+        self.assertEqual(Participant.objects.filter(is_verified=True).count(), 4)
+        self.assertEqual(
+            sorted(job.payload['args'][3] for job in Job.objects.filter(task='send_email')),
+            [['p0@example.com'], ['p1@example.com'], ['p2@example.com']],
+        )
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.verified_count, self.event.revenue), (3, 150000))
+        self.assertEqual(self.client.post(url, {'ids': ['x']}).status_code, 400)
+
+    def test_status_changes_do_not_overwrite_counters(self):
+        self.client.force_login(self.organizer)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('finish_event', args=[self.event.id]))
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "events_event"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('participant_count', updates[0])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.status, 'finished')
+
+    def test_bulk_verify_counts_only_rows_it_changed(self):
+        pending = [make_participant(self.event, email=f'p{i}@example.com') for i in range(3)]
+        original = QuerySet.update
+        rival = []
+
+        def rival_verifies_first(queryset, **kwargs):
+            # Request lain memverifikasi p0 di antara SELECT dan UPDATE (SQLite tanpa row lock)
+            if kwargs.get('is_verified') and not rival:
+                rival.append(original(Participant.objects.filter(pk=pending[0].pk), is_verified=True))
+            return original(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', rival_verifies_first):
+            result = payments.verify_participants(self.organizer, self.event.id, [p.id for p in pending])
+        self.assertEqual(result['verified_ids'], [pending[1].id, pending[2].id])
+        self.assertEqual(
+            sorted(job.payload['args'][3] for job in Job.objects.filter(task='send_email')),
+            [['p1@example.com'], ['p2@example.com']],
+        )
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.verified_count, self.event.revenue), (2, 100000))
+
+    def test_reconcile_fixes_drift(self):
+        make_participant(self.event, is_verified=True)
+        make_participant(self.event, email='ani@example.com')
+        Event.objects.filter(pk=self.event.pk).update(participant_count=99, revenue=7)
+
+        call_command('reconcile_event_counters', stdout=StringIO())
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 2)
+        self.assertEqual(self.event.verified_count, 1)
+        self.assertEqual(self.event.revenue, 50000)
+
+
+class JobQueueTests(TestCase):
+    def test_worker_runs_enqueued_email(self):
+        jobs.enqueue('send_email', 'Halo', 'Isi', 'admin@example.com', ['a@example.com'])
+
+        with self.assertLogs('events.tasks', 'INFO') as logs:
+            call_command('run_worker', '--once', stdout=StringIO())
+
+        self.assertIn('Email berhasil dikirim', logs.output[0])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Job.objects.get().status, 'done')
+        self.assertGreaterEqual(jobs.queue_stats()['avg_run_last_hour'], 0)
+
+    def test_failed_job_is_retried_with_backoff(self):
+        jobs.TASKS['always_fails'] = lambda: 1 / 0
+        self.addCleanup(jobs.TASKS.pop, 'always_fails')
+        job = jobs.enqueue('always_fails', max_attempts=2)
+
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+        self.assertGreater(job.next_run_at, timezone.now())
+
+        Job.objects.filter(pk=job.pk).update(next_run_at=timezone.now())
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertIn('ZeroDivisionError', job.last_error)
+
+    def test_claim_skips_jobs_taken_by_another_worker(self):
+        taken = jobs.enqueue('send_telegram', 'diambil worker lain')
+        free = jobs.enqueue('send_telegram', 'bebas')
+        original = QuerySet.update
+        rival = []
+
+        def rival_claims_first(queryset, **kwargs):
+            # Worker lain mengklaim `taken` di antara SELECT dan UPDATE kita (SQLite tanpa row lock)
+            if kwargs.get('status') == 'running' and not rival:
+                rival.append(original(
+                    Job.objects.filter(pk=taken.pk), status='running', started_at=timezone.now() - timedelta(seconds=1),
+                ))
+            return original(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', rival_claims_first):
+            claimed = jobs.claim_jobs(10)
+        self.assertEqual([job.pk for job in claimed], [free.pk])
+
+    def test_heartbeat_keeps_long_job_out_of_requeue(self):
+        requeued = []
+
+        def long_task():
+            # Seolah sudah berjalan lebih lama dari STALE_AFTER, lalu melapor masih hidup
+            Job.objects.filter(status='running').update(started_at=timezone.now() - 2 * jobs.STALE_AFTER)
+            jobs.heartbeat()
+            requeued.append(jobs.requeue_stale())
+        jobs.TASKS['long_task'] = long_task
+        self.addCleanup(jobs.TASKS.pop, 'long_task')
+        jobs.enqueue('long_task')
+        stale = jobs.enqueue('send_telegram', 'tes')
+        Job.objects.filter(pk=stale.pk).update(status='running', started_at=timezone.now() - 2 * jobs.STALE_AFTER)
+
+        jobs.heartbeat()  # di luar worker: no-op
+        jobs.run_pending()
+        self.assertEqual(requeued, [1])
+        self.assertEqual(Job.objects.get(task='long_task').status, 'done')
+        self.assertEqual(Job.objects.get(pk=stale.pk).status, 'pending')
+
+    def test_async_tasks_in_batch_run_concurrently(self):
+        async def slow():
+            await asyncio.sleep(0.3)
+        jobs.TASKS['slow'] = slow
+        self.addCleanup(jobs.TASKS.pop, 'slow')
+        for _ in range(4):
+            jobs.enqueue('slow')
+
+        start = time.monotonic()
+        self.assertEqual(jobs.run_pending(), 4)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(set(Job.objects.values_list('status', flat=True)), {'done'})
+
+    def test_failed_async_job_is_retried(self):
+        async def fails():
+            raise RuntimeError('gagal kirim')
+        jobs.TASKS['async_fails'] = fails
+        self.addCleanup(jobs.TASKS.pop, 'async_fails')
+        job = jobs.enqueue('async_fails', max_attempts=2)
+
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+        self.assertIn('gagal kirim', job.last_error)
+
+    def test_queue_stats(self):
+        jobs.enqueue('send_telegram', 'tes')
+        stats = jobs.queue_stats()
+        self.assertEqual(stats['depth']['pending'], 1)
+        self.assertGreaterEqual(stats['oldest_pending_age'], 0)
+
+
+class BlastCampaignTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user(username='org', email='org@example.com', password='x')
+        self.event = make_event(organizer)
+        for i in range(5):
+            make_participant(self.event, full_name=f'Peserta {i}', email=f'p{i}@example.com')
+        self.campaign = BlastCampaign.objects.create(
+            event=self.event, subject='Info', message='Halo {nama}', total=5,
+        )
+
+    def test_sends_one_personalized_message_per_recipient(self):
+        run_campaign(self.campaign, chunk_size=2, rate_limit=0)
+
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertTrue(all(len(m.to) == 1 for m in mail.outbox))
+        self.assertEqual(mail.outbox[0].body, 'Halo Peserta 0')
+
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.status, self.campaign.sent, self.campaign.failed), ('done', 5, 0))
+        self.assertEqual(self.campaign.progress, 100)
+
+    def test_bad_address_does_not_abort_blast(self):
+        from django.core.mail.backends.locmem import EmailBackend
+        original = EmailBackend.send_messages
+
+        def flaky(backend, messages):
+            if messages[0].to == ['p2@example.com']:
+                raise ValueError('alamat ditolak')
+            return original(backend, messages)
+
+        with mock.patch.object(EmailBackend, 'send_messages', flaky):
+            run_campaign(self.campaign, chunk_size=2, rate_limit=0)
+
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.sent, self.campaign.failed), (4, 1))
+        self.assertEqual(self.campaign.failures[0]['email'], 'p2@example.com')
+
+    def test_rerun_does_not_send_claimed_chunks_again(self):
+        # Job diulang saat pelaksana pertama masih jalan: salinan lama campaign (cursor 0)
+        stale = BlastCampaign.objects.get(pk=self.campaign.pk)
+        with mock.patch.object(jobs, 'heartbeat') as heartbeat:
+            run_campaign(self.campaign, chunk_size=2, rate_limit=0)
+        self.assertEqual(heartbeat.call_count, 3)
+
+        run_campaign(stale, chunk_size=2, rate_limit=0)
+        self.assertEqual(len(mail.outbox), 5)
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.status, self.campaign.sent), ('done', 5))
+
+    def test_chunk_lost_to_dead_worker_still_completes_progress(self):
+        import events.blast
+        original = events.blast.send_chunk
+        calls = []
+
+        def dies_on_first_chunk(*args):
+            calls.append(1)
+            if len(calls) == 1:
+                raise SystemError('worker mati')
+            return original(*args)
+
+        with mock.patch.object(events.blast, 'send_chunk', dies_on_first_chunk):
+            with self.assertRaises(SystemError):
+                run_campaign(self.campaign, chunk_size=2, rate_limit=0)
+            # Job di-retry: lanjut setelah chunk yang sudah diklaim, sisa chunk itu terlewat
+            run_campaign(BlastCampaign.objects.get(pk=self.campaign.pk), chunk_size=2, rate_limit=0)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.status, self.campaign.sent, self.campaign.progress), ('done', 3, 100))
+
+    def test_throttle_spaces_sends(self):
+        sleeps = []
+        throttle = Throttle(10, clock=lambda: 0.0, sleep=sleeps.append)
+        for _ in range(3):
+            throttle.wait()
+        self.assertEqual(len(sleeps), 2)
+
+
+class TicketQRTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user(username='org', email='org@example.com', password='x')
+        self.participant = make_participant(make_event(organizer))
+
+    def test_png_with_long_lived_cache_headers(self):
+        response = self.client.get(self.participant.qr_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+        self.assertEqual(response['ETag'], qr.qr_etag(self.participant.validation_id, 'png', self.participant.ticket_token))
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_signed_url_served_without_queries(self):
+        url = self.participant.qr_url
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        other = make_participant(self.participant.event, email='lain@example.com')
+        forged = reverse('ticket_qr', args=[other.validation_id, 'png']) + f'?t={self.participant.ticket_token}'
+        self.assertEqual(self.client.get(forged).status_code, 404)
+        self.assertEqual(self.client.get(url[:-4] + 'AAAA').status_code, 404)
+
+    def test_svg_variant(self):
+        url = reverse('ticket_qr', args=[self.participant.validation_id, 'svg'])
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn(b'<svg', response.content)
+
+    def test_if_none_match_returns_304_without_queries(self):
+        etag = qr.qr_etag(self.participant.validation_id, 'png', self.participant.ticket_token)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.participant.qr_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_ticket_or_format_is_404(self):
+        self.assertEqual(self.client.get(reverse('ticket_qr', args=[uuid.uuid4(), 'png'])).status_code, 404)
+        url = reverse('ticket_qr', args=[self.participant.validation_id, 'gif'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class ExportParticipantsTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', email='org@example.com', password='x')
+        self.event = make_event(self.organizer)
+        make_participant(self.event, full_name='Ani', email='ani@example.com', is_verified=True)
+        make_participant(self.event, full_name='Budi', email='budi@example.com')
+        self.client.force_login(self.organizer)
+        self.url = reverse('export_participants', args=[self.event.id])
+
+    def test_xlsx(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        wb = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        rows = list(wb.active.values)
+        self.assertEqual(rows[0][0], 'Nama Lengkap')
+        self.assertEqual([r[0] for r in rows[1:]], ['Ani', 'Budi'])
+        self.assertEqual(rows[1][4], 'Lunas')
+
+    def test_csv_is_streamed(self):
+        response = self.client.get(self.url, {'format': 'csv'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith('Budi,budi@example.com'))
+
+    def test_ndjson(self):
+        response = self.client.get(self.url, {'format': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([r['email'] for r in rows], ['ani@example.com', 'budi@example.com'])
+        self.assertTrue(rows[0]['is_verified'])
+
+    async def test_csv_streams_asynchronously_under_asgi(self):
+        await self.async_client.aforce_login(self.organizer)
+        with mock.patch.object(exports, 'ASYNC_BATCH', 1):
+            response = await self.async_client.get(self.url, {'format': 'csv'})
+            # Iterator async: Django ASGI tidak mengumpulkan seluruh output via sync_to_async(list)
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(b''.join(chunks).decode('utf-8-sig').splitlines()[1].startswith('Ani,ani@example.com'))
+
+
+class CertificateTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', email='org@example.com', password='x')
+        self.event = make_event(self.organizer, status='finished')
+        self.participant = make_participant(self.event, email='org@example.com', is_verified=True)
+        make_participant(self.event, full_name='Citra', email='citra@example.com', is_verified=True)
+        make_participant(self.event, full_name='Pending', email='pending@example.com')
+        self.client.force_login(self.organizer)
+        cache.clear()
+
+    def test_certificate_pdf_is_cached_by_content(self):
+        url = reverse('generate_certificate', args=[self.participant.validation_id])
+        with mock.patch.object(certificates, 'render_certificate', wraps=certificates.render_certificate) as render:
+            first = b''.join(self.client.get(url).streaming_content)
+            second = b''.join(self.client.get(url).streaming_content)
+        self.assertTrue(first.startswith(b'%PDF'))
+        self.assertEqual(first, second)
+        self.assertEqual(render.call_count, 1)
+
+    def test_zip_contains_verified_participants_only(self):
+        response = self.client.get(reverse('download_certificates_zip', args=[self.event.id]))
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        names = archive.namelist()
+        self.assertEqual(len(names), 2)
+        self.assertTrue(any('CITRA' in name for name in names))
+        self.assertTrue(all(archive.read(name).startswith(b'%PDF') for name in names))
+
+    def test_zip_reuses_process_pool(self):
+        url = reverse('download_certificates_zip', args=[self.event.id])
+        b''.join(self.client.get(url).streaming_content)
+        executor = certificates.get_executor()
+        cache.clear()
+        b''.join(self.client.get(url).streaming_content)
+        self.assertIs(certificates.get_executor(), executor)
+
+    async def test_zip_streams_asynchronously_under_asgi(self):
+        await self.async_client.aforce_login(self.organizer)
+        response = await self.async_client.get(reverse('download_certificates_zip', args=[self.event.id]))
+        self.assertTrue(response.is_async)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join([chunk async for chunk in response.streaming_content])))
+        self.assertEqual(len(archive.namelist()), 2)
+
+
+@GOOGLE_APP
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        pagecache.stats.reset()
+        self.organizer = User.objects.create_user(username='org', email='org@example.com', password='x')
+        self.event = make_event(self.organizer, title='Seminar AI')
+
+    def test_anonymous_home_served_from_cache(self):
+        first = self.client.get(reverse('home'))
+        self.assertEqual(first['X-Page-Cache'], 'MISS')
+        self.assertContains(first, 'Seminar AI')
+
+        # Hanya query agregat validator ETag; halaman dari cache
+        with self.assertNumQueries(1):
+            second = self.client.get(reverse('home'))
+        self.assertEqual(second['X-Page-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(pagecache.stats.snapshot()['home']['hit_rate'], 0.5)
+
+    def test_event_save_invalidates_home(self):
+        self.client.get(reverse('home'))
+        make_event(self.organizer, title='Workshop Django')
+
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Workshop Django')
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_login(self.organizer)
+        self.client.get(reverse('home'))
+        response = self.client.get(reverse('home'))
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_home_is_paginated(self):
+        for i in range(settings.HOME_PAGE_SIZE):
+            make_event(self.organizer, title=f'Event {i}')
+        response = self.client.get(reverse('home'), {'page': 2})
+        self.assertEqual(response.context['events'].number, 2)
+        self.assertEqual(len(response.context['event_cards']), 1)
+
+    def test_event_detail_lookup_cached_and_invalidated(self):
+        url = reverse('event_detail', args=[self.event.slug])
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(pagecache.stats.snapshot()['event_lookup'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+        self.event.title = 'Seminar AI Lanjutan'
+        self.event.save()
+        self.assertContains(self.client.get(url), 'Seminar AI Lanjutan')
+
+
+@GOOGLE_APP
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(username='org', email='org@example.com', password='x')
+        self.event = make_event(self.organizer)
+        self.participant = make_participant(self.event, email='budi@example.com')
+
+    def assert_revalidates(self, url, data=None):
+        first = self.client.get(url, data)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Last-Modified', first)
+
+        # 304 hanya menjalankan satu query validator, tanpa render template
+        with self.assertNumQueries(1), mock.patch('events.views.render') as render:
+            second = self.client.get(url, data, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        render.assert_not_called()
+        return first
+
+    def test_home(self):
+        first = self.assert_revalidates(reverse('home'))
+        make_event(self.organizer, title='Event Baru')
+        response = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_event_detail(self):
+        url = reverse('event_detail', args=[self.event.slug])
+        first = self.assert_revalidates(url)
+        self.event.location = 'Gedung B'
+        self.event.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_check_ticket(self):
+        url = reverse('check_ticket')
+        first = self.assert_revalidates(url, {'email': 'BUDI@example.com'})
+        self.assertContains(first, self.event.title)
+
+        self.client.force_login(self.organizer)
+        self.client.get(reverse('verify_payment', args=[self.participant.id]))
+        self.client.logout()
+        response = self.client.get(url, {'email': 'budi@example.com'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+
+@GOOGLE_APP
+class EventSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(username='org', email='org@example.com', password='x')
+        self.title_hit = make_event(
+            self.organizer, title='Workshop Python Dasar', description='Belajar coding', category='workshop',
+        )
+        self.desc_hit = make_event(self.organizer, title='Seminar Karier', description='Tips karier untuk developer python')
+        make_event(self.organizer, title='Lomba Desain', description='Poster digital', price=0, category='lomba')
+        make_event(self.organizer, title='Python Rahasia', description='-', status='pending')
+
+    def test_uses_full_text_index(self):
+        self.assertEqual(search.backend(), 'sqlite')
+
+    def test_ranks_title_matches_first(self):
+        results, _ = search.search_events('python')
+        self.assertEqual([e.id for e in results], [self.title_hit.id, self.desc_hit.id])
+
+    def test_filters(self):
+        results, _ = search.search_events(price='free')
+        self.assertEqual([e.title for e in results], ['Lomba Desain'])
+        results, _ = search.search_events('python', category='workshop')
+        self.assertEqual([e.id for e in results], [self.title_hit.id])
+
+    def test_keyset_pagination(self):
+        page1, cursor = search.search_events('python', limit=1)
+        page2, cursor2 = search.search_events('python', cursor=cursor, limit=1)
+        self.assertEqual([e.id for e in page1 + page2], [self.title_hit.id, self.desc_hit.id])
+        self.assertIsNone(cursor2)
+
+    def test_tampered_cursor_is_ignored(self):
+        expected = [e.id for e in search.search_events('python')[0]]
+        for values in (['x', 'y'], [1, 'y'], [None, None], ['1.5', 2], [1.0, True], 'bukan-list'):
+            cursor = search.encode_cursor(values)
+            self.assertEqual([e.id for e in search.search_events('python', cursor=cursor)[0]], expected, values)
+            response = self.client.get(reverse('search_events'), {'q': 'python', 'after': cursor})
+            self.assertEqual(response.status_code, 200, values)
+        response = self.client.get(reverse('search_events'), {'after': search.encode_cursor(['kemarin', 1])})
+        self.assertEqual(response.status_code, 200)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.title_hit.title = 'Workshop Golang'
+        self.title_hit.description = '-'
+        self.title_hit.save()
+        self.desc_hit.delete()
+        self.assertEqual(search.search_events('python')[0], [])
+        self.assertEqual(search.search_events('golang')[0], [self.title_hit])
+
+    def test_view(self):
+        response = self.client.get(reverse('search_events'), {'q': 'python'})
+        self.assertContains(response, 'Workshop Python Dasar')
+        self.assertNotContains(response, 'Python Rahasia')
+
+
+def full_scans(sql):
+    """Tabel events_* yang dibaca dengan sequential scan menurut EXPLAIN."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Tabel test kecil: paksa planner memilih index jika memang ada
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + sql)
+            plan = [row[0] for row in cursor.fetchall()]
+            return [line for line in plan if 'Seq Scan on events_' in line]
+        cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        plan = [row[-1] for row in cursor.fetchall()]
+    # "SCAN tabel" tanpa "USING ... INDEX" = baca seluruh tabel
+    return [line for line in plan if line.startswith('SCAN events_') and 'USING' not in line and 'VIRTUAL TABLE' not in line]
+
+
+@GOOGLE_APP
+class QueryPlanTests(TestCase):
+    """Regression: query di halaman yang sering diakses tidak boleh full table scan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user(
+            username='org', email='org@example.com', password='x', is_organizer=True,
+        )
+        cls.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        cls.peserta = User.objects.create_user(username='peserta', email='Budi@Example.com', password='x')
+        for i in range(30):
+            event = make_event(cls.organizer, title=f'Event {i}', status=['active', 'pending', 'finished'][i % 3])
+            for j in range(5):
+                make_participant(event, email=f'peserta{j}@example.com', full_name=f'Peserta {j}')
+        cls.event = event
+        make_participant(event, email='budi@example.com')
+
+    def setUp(self):
+        cache.clear()
+
+    def assertNoFullScan(self, url, user=None, data=None):
+        if user is not None:
+            self.client.force_login(user)
+        self.client.get(url, data)  # pemanasan: cache Site, session, dll
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        queries = [q['sql'] for q in ctx.captured_queries if 'events_' in q['sql'] and q['sql'].startswith('SELECT')]
+        self.assertTrue(queries)
+        for sql in queries:
+            self.assertEqual(full_scans(sql), [], sql)
+
+    def test_home(self):
+        self.assertNoFullScan(reverse('home'))
+
+    def test_event_detail(self):
+        self.assertNoFullScan(reverse('event_detail', args=[self.event.slug]))
+
+    def test_check_ticket_is_case_insensitive_and_indexed(self):
+        self.assertNoFullScan(reverse('check_ticket'), data={'email': 'BUDI@example.com'})
+        self.assertEqual(Participant.objects.for_email('BUDI@EXAMPLE.COM').count(), 1)
+
+    def test_participant_dashboard(self):
+        self.assertNoFullScan(reverse('participant_dashboard'), user=self.peserta)
+
+    def test_organizer_dashboard(self):
+        self.assertNoFullScan(reverse('organizer_dashboard'), user=self.organizer)
+
+    def test_event_participants(self):
+        self.assertNoFullScan(reverse('event_participants', args=[self.event.id]), user=self.organizer)
+
+    def test_admin_approval_list(self):
+        self.assertNoFullScan(reverse('admin_approval_list'), user=self.admin)
+
+
+class BlacklistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_matcher_rules(self):
+        matcher = blacklist.BlacklistMatcher(['Budi@Spam.com', '@tempmail.id', '*.throwaway.net', 'bukan-aturan'])
+        self.assertEqual(matcher.invalid, 1)
+        self.assertTrue(matcher.is_blocked('budi@spam.COM'))
+        self.assertFalse(matcher.is_blocked('ani@spam.com'))
+        self.assertTrue(matcher.is_blocked('siapa@tempmail.id'))
+        self.assertFalse(matcher.is_blocked('siapa@mail.tempmail.id'))
+        self.assertTrue(matcher.is_blocked('x@a.b.throwaway.net'))
+        self.assertFalse(matcher.is_blocked('x@throwaway.net'))
+        self.assertFalse(matcher.is_blocked('x@notthrowaway.net'))
+
+    def test_registration_check_is_cached_and_invalidated_by_signals(self):
+        Blacklist.objects.create(email='@spam.com')
+        data = {'full_name': 'Budi', 'email': 'budi@spam.com', 'phone': '0812'}
+        self.assertFalse(RegistrationForm(data, is_free=True).is_valid())
+
+        with self.assertNumQueries(0):
+            self.assertFalse(RegistrationForm(data, is_free=True).is_valid())
+
+        Blacklist.objects.get(email='@spam.com').delete()
+        self.assertTrue(RegistrationForm(data, is_free=True).is_valid())
+
+    def test_matcher_expires_without_shared_cache(self):
+        self.assertFalse(blacklist.is_blocked('budi@spam.com'))
+        # Perubahan dari worker lain: versi di cache proses ini tidak ikut naik
+        Blacklist.objects.bulk_create([Blacklist(email='@spam.com')])
+        self.assertFalse(blacklist.is_blocked('budi@spam.com'))
+
+        later = time.monotonic() + blacklist.MATCHER_TTL
+        with mock.patch('events.blacklist.time.monotonic', return_value=later):
+            self.assertTrue(blacklist.is_blocked('budi@spam.com'))
+
+    def test_import_command(self):
+        Blacklist.objects.create(email='lama@spam.com')
+        blacklist.is_blocked('warmup@example.com')
+        with mock.patch('sys.stdin', StringIO("# daftar spam\nlama@spam.com\n*.spam.xyz\nbaru@x.com\nrusak\n")):
+            out = StringIO()
+            call_command('import_blacklist', '-', stdout=out)
+        self.assertIn('2 aturan baru', out.getvalue())
+        self.assertIn('1 baris tidak valid', out.getvalue())
+        self.assertTrue(blacklist.is_blocked('a@mx.spam.xyz'))
+
+
+class StubTelegram:
+    """Server HTTP lokal pengganti api.telegram.org. `responses`: antrian (status, body, delay)."""
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, agar reuse koneksi bisa diamati
+
+            def do_POST(self):
+                length = int(self.headers['Content-Length'])
+                data = parse_qs(self.rfile.read(length).decode('utf-8'))
+                stub.requests.append({'path': self.path, 'client': self.client_address, 'text': data['text'][0]})
+                status, body, delay = stub.responses.pop(0) if stub.responses else (200, {'ok': True, 'result': {}}, 0)
+                time.sleep(delay)
+                raw = json.dumps(body).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(raw)))
+                    self.end_headers()
+                    self.wfile.write(raw)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client sudah timeout
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TelegramNotifierTests(TestCase):
+    def setUp(self):
+        self.stub = StubTelegram()
+        self.addCleanup(self.stub.close)
+        self.sleeps = []
+        self.client_ = notifier.TelegramNotifier('TOKEN', '42', api_url=self.stub.url, sleep=self.sleeps.append)
+        self.addCleanup(self.client_.close)
+
+    def test_reuses_connection(self):
+        self.client_.send('satu')
+        self.client_.send('dua')
+        self.assertEqual([r['text'] for r in self.stub.requests], ['satu', 'dua'])
+        self.assertEqual(self.stub.requests[0]['path'], '/botTOKEN/sendMessage')
+        self.assertEqual(len({r['client'] for r in self.stub.requests}), 1)
+
+    def test_retries_server_errors_and_rate_limit(self):
+        self.stub.responses = [
+            (502, {'ok': False}, 0),
+            (429, {'ok': False, 'parameters': {'retry_after': 7}}, 0),
+        ]
+        self.client_.send('halo')
+        self.assertEqual(len(self.stub.requests), 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertEqual(self.sleeps[1], 7.0)
+
+    def test_client_errors_are_not_retried(self):
+        self.stub.responses = [(400, {'ok': False, 'description': "Bad Request: can't parse entities"}, 0)]
+        with self.assertRaisesMessage(notifier.TelegramError, "can't parse entities"):
+            self.client_.send('*rusak')
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_read_timeout_is_bounded(self):
+        slow = notifier.TelegramNotifier(
+            'TOKEN', '42', api_url=self.stub.url, read_timeout=0.2, max_retries=1, sleep=lambda s: None,
+        )
+        self.addCleanup(slow.close)
+        self.stub.responses = [(200, {'ok': True}, 1), (200, {'ok': True}, 1)]
+        start = time.monotonic()
+        with self.assertRaises(notifier.TelegramError):
+            slow.send('lambat')
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_async_send_retries_and_reuses_connection(self):
+        sleeps = []
+
+        async def record(seconds):
+            sleeps.append(seconds)
+
+        client = notifier.TelegramNotifier('TOKEN', '42', api_url=self.stub.url, async_sleep=record)
+        self.stub.responses = [
+            (502, {'ok': False}, 0),
+            (429, {'ok': False, 'parameters': {'retry_after': 3}}, 0),
+        ]
+
+        async def run():
+            try:
+                await client.asend('satu')
+                await client.asend('dua')
+            finally:
+                await client.aclose()
+
+        asyncio.run(run())
+        self.assertEqual([r['text'] for r in self.stub.requests], ['satu', 'satu', 'satu', 'dua'])
+        self.assertEqual(sleeps[1], 3.0)
+        self.assertEqual(len({r['client'] for r in self.stub.requests}), 1)
+
+    def test_async_sends_overlap(self):
+        client = notifier.TelegramNotifier('TOKEN', '42', api_url=self.stub.url)
+        self.stub.responses = [(200, {'ok': True, 'result': {}}, 0.3)] * 5
+        self.stub.responses.append((400, {'ok': False, 'description': 'Bad Request: chat not found'}, 0))
+
+        async def run():
+            try:
+                await asyncio.gather(*(client.asend(f'pesan {i}') for i in range(5)))
+                with self.assertRaisesMessage(notifier.TelegramError, 'chat not found'):
+                    await client.asend('rusak')
+            finally:
+                await client.aclose()
+
+        start = time.monotonic()
+        asyncio.run(run())
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(len(self.stub.requests), 6)
+
+    def test_digest_coalesces_pending_events(self):
+        organizer = User.objects.create_user(username='org', password='x')
+        events = [make_event(organizer, title=f'Seminar {i}', status='pending') for i in range(3)]
+        with override_settings(TELEGRAM_DIGEST_SECONDS=60, TELEGRAM_API_URL=self.stub.url):
+            notifier.reset_notifier()
+            self.addCleanup(notifier.reset_notifier)
+            for event in events:
+                notifier.notify_pending_event(event)
+
+            job = Job.objects.get()
+            self.assertEqual(job.task, 'send_telegram_digest')
+            self.assertGreater(job.next_run_at, timezone.now() + timedelta(seconds=50))
+            Job.objects.update(next_run_at=timezone.now())
+            jobs.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertIn('3 EVENT MENUNGGU VALIDASI', self.stub.requests[0]['text'])
+        self.assertIn('Seminar 2', self.stub.requests[0]['text'])
+
+
+@GOOGLE_APP
+class PerfHarnessTests(TestCase):
+    def test_seed_and_bench(self):
+        call_command('seed_perf_data', participants_per_event=3, stdout=StringIO())
+        self.assertEqual(Event.objects.filter(slug__startswith='perf-').count(), 100)
+        event = Event.objects.get(slug='perf-event-0')
+        self.assertEqual(event.participant_count, event.participants.count())
+        self.assertTrue(blacklist.is_blocked('x@perf-spam-0.xyz'))
+
+        out = StringIO()
+        call_command('bench_views', runs=2, only=['home', 'check_ticket', 'export_csv'],
+                     baseline='/nonexistent/baseline.json', stdout=out)
+        self.assertIn('check_ticket', out.getvalue())
+        # Data yang ditulis selama benchmark di-rollback
+        self.assertFalse(Participant.objects.filter(email='bench@example.com').exists())
+
+    def test_compare_flags_query_and_latency_regressions(self):
+        base = {'home': {'p50_ms': 10, 'p95_ms': 12, 'queries': 2, 'peak_kb': 100}}
+        same = {'home': {'p50_ms': 11, 'p95_ms': 14, 'queries': 2, 'peak_kb': 110}}
+        worse = {'home': {'p50_ms': 30, 'p95_ms': 14, 'queries': 3, 'peak_kb': 110}}
+        self.assertEqual(perf.compare(same, base), [])
+        self.assertEqual(perf.compare(worse, base), ['home: query 2 -> 3', 'home: p50_ms 10 -> 30'])
+        self.assertEqual(perf.percentile([5, 1, 4, 2, 3], 95), 5)
+
+
+@GOOGLE_APP
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.registry.reset()
+        self.organizer = User.objects.create_user(username='org', password='x')
+        make_event(self.organizer)
+
+    def test_records_per_view_metrics(self):
+        self.client.get(reverse('home'))
+        self.client.get('/tidak-ada/')
+        stats = metrics.registry.views['home']
+        self.assertEqual(stats.requests, {('GET', 200): 1})
+        self.assertGreater(stats.queries, 0)
+        self.assertGreater(stats.response_bytes, 0)
+        self.assertIn(metrics.UNRESOLVED, metrics.registry.views)
+
+    @override_settings(METRICS_TOKEN='rahasia')
+    def test_endpoint_is_protected_prometheus_text(self):
+        self.client.get(reverse('home'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.assertEqual(
+            self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer salah').status_code, 403,
+        )
+
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer rahasia')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('portalevent_http_requests_total{view="home",method="GET",status="200"} 1', body)
+        self.assertIn('portalevent_http_request_duration_seconds_bucket{view="home",le="+Inf"} 1', body)
+        self.assertIn('portalevent_db_queries_total{view="home"}', body)
+
+        admin = User.objects.create_superuser(username='admin', password='x')
+        self.client.force_login(admin)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+
+class TracingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        qr.get_qr.cache_clear()
+        organizer = User.objects.create_user(username='org', password='x')
+        self.participant = make_participant(make_event(organizer))
+
+    def test_span_without_trace_is_noop(self):
+        with tracing.span('qr.render') as s:
+            pass
+        self.assertIsNone(s.trace)
+
+    def test_nested_spans_and_decorator(self):
+        @tracing.traced('inner')
+        def inner():
+            return 1
+
+        with tracing.trace('job test') as current:
+            with tracing.span('outer', a=1) as outer:
+                inner()
+            with self.assertRaises(ValueError):
+                with tracing.span('gagal'):
+                    raise ValueError('x')
+        spans = {s['name']: s for s in current.spans}
+        self.assertEqual(spans['inner']['parent_id'], outer.span_id)
+        self.assertIsNone(spans['outer']['parent_id'])
+        self.assertEqual(spans['outer']['attrs'], {'a': 1})
+        self.assertEqual(spans['gagal']['error'], 'ValueError: x')
+
+    @override_settings(TRACE_SLOW_MS=0, TRACE_SAMPLE_RATE=0)
+    def test_slow_request_logged_with_span_breakdown(self):
+        with self.assertLogs('events.tracing', level='WARNING') as logs:
+            response = self.client.get(self.participant.qr_url, HTTP_X_REQUEST_ID='abc123')
+        self.assertEqual(response['X-Request-ID'], 'abc123')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['trace_id'], 'abc123')
+        self.assertTrue(record['slow'])
+        self.assertEqual(record['view'], 'ticket_qr')
+        self.assertEqual([s['name'] for s in record['spans']], ['qr.render'])
+
+    @override_settings(TRACE_SLOW_MS=60000, TRACE_SAMPLE_RATE=0)
+    def test_fast_unsampled_request_not_logged(self):
+        with self.assertNoLogs('events.tracing'):
+            self.client.get(self.participant.qr_url)
+
+    @override_settings(TRACE_SLOW_MS=60000, TRACE_SAMPLE_RATE=1)
+    def test_worker_job_traced(self):
+        jobs.enqueue('send_email', 'Halo', 'Isi', 'admin@example.com', ['a@example.com', 'b@example.com'])
+        with self.assertLogs('events.tracing', level='INFO') as logs:
+            jobs.run_pending()
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['name'], 'job send_email')
+        self.assertEqual(record['spans'][0]['name'], 'smtp.send_mail')
+        self.assertEqual(record['spans'][0]['attrs'], {'recipients': 2})
+
+
+class CheckinTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', password='x')
+        self.event = make_event(self.organizer)
+        self.participant = make_participant(self.event, is_verified=True)
+        self.client.force_login(self.organizer)
+
+    def post(self, name, body):
+        return self.client.post(reverse(name), json.dumps(body), content_type='application/json')
+
+    def test_single_lookup_then_atomic_insert(self):
+        # lookup (select_related) + savepoint + INSERT + release
+        with self.assertNumQueries(4):
+            result = checkin.check_in(self.organizer, self.participant.validation_id)
+        self.assertEqual(result['status'], 'ok')
+        self.assertEqual(result['name'], 'Budi')
+
+    def test_duplicate_scan_rejected(self):
+        first = self.post('api_checkin', {'validation_id': str(self.participant.validation_id), 'device': 'pintu-1'})
+        self.assertEqual(first.status_code, 200)
+        second = self.post('api_checkin', {'validation_id': str(self.participant.validation_id)})
+        self.assertEqual(second.status_code, 409)
+        self.assertEqual(second.json()['status'], 'duplicate')
+        self.assertEqual(second.json()['checked_in_at'], first.json()['checked_in_at'])
+        self.assertEqual(Attendance.objects.get().device, 'pintu-1')
+
+    def test_non_string_device_is_coerced(self):
+        others = [make_participant(self.event, email=f'p{i}@example.com', is_verified=True) for i in range(2)]
+        response = self.post('api_checkin', {'validation_id': str(self.participant.validation_id), 'device': 7})
+        self.assertEqual(response.status_code, 200)
+        response = self.post('api_checkin_batch', {'scans': [{'validation_id': str(others[0].validation_id)}], 'device': None})
+        self.assertEqual(response.status_code, 200)
+        response = self.post('api_checkin_batch', {'scans': [{'validation_id': str(others[1].validation_id)}], 'device': {'id': 1}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(Attendance.objects.values_list('device', flat=True)), ['', '7', "{'id': 1}"],
+        )
+
+    def test_rejections(self):
+        pending = make_participant(self.event, email='x@example.com')
+        self.assertEqual(self.post('api_checkin', {'validation_id': str(pending.validation_id)}).status_code, 409)
+        self.assertEqual(self.post('api_checkin', {'validation_id': str(uuid.uuid4())}).status_code, 404)
+        self.assertEqual(self.post('api_checkin', {'validation_id': 'bukan-uuid'}).status_code, 400)
+
+        other = User.objects.create_user(username='lain', password='x')
+        self.client.force_login(other)
+        self.assertEqual(self.post('api_checkin', {'validation_id': str(self.participant.validation_id)}).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.post('api_checkin', {'validation_id': str(self.participant.validation_id)}).status_code, 401)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_batch(self):
+        others = [make_participant(self.event, email=f'p{i}@example.com', is_verified=True) for i in range(3)]
+        checkin.check_in(self.organizer, others[0].validation_id)
+        scanned_at = (timezone.now() - timedelta(minutes=5)).isoformat()
+        scans = [
+            {'validation_id': str(self.participant.validation_id), 'scanned_at': scanned_at},
+            {'validation_id': str(self.participant.validation_id)},
+            {'validation_id': str(others[0].validation_id)},
+            {'validation_id': str(others[1].validation_id)},
+            {'validation_id': str(uuid.uuid4())},
+        ]
+        with self.assertNumQueries(6):  # session, user, lookup, kehadiran lama, insert, cek hasil insert
+            response = self.post('api_checkin_batch', {'scans': scans, 'device': 'offline-1'})
+        data = response.json()
+        self.assertEqual([r['status'] for r in data['results']], ['ok', 'duplicate', 'duplicate', 'ok', 'not_found'])
+        self.assertEqual(data['summary'], {'ok': 2, 'duplicate': 2, 'not_found': 1})
+        attendance = Attendance.objects.get(participant=self.participant)
+        self.assertEqual(attendance.checked_in_at.isoformat(), scanned_at)
+        self.assertEqual(Attendance.objects.count(), 3)
+
+
+class TicketSigningTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', password='x')
+        self.event = make_event(self.organizer)
+        self.participant = make_participant(self.event, is_verified=True)
+
+    def test_round_trip_and_tamper(self):
+        token = tickets.issue_token(self.participant)
+        claims = tickets.read_token(token)
+        self.assertEqual(claims.validation_id, self.participant.validation_id)
+        self.assertEqual((claims.participant_id, claims.event_id, claims.verified), (self.participant.id, self.event.id, True))
+
+        raw = bytearray(tickets._b64decode(token))
+        raw[10] ^= 1
+        with self.assertRaisesMessage(tickets.InvalidTicket, 'signature'):
+            tickets.read_token(tickets._b64encode(bytes(raw)))
+        with self.assertRaisesMessage(tickets.InvalidTicket, 'format'):
+            tickets.read_token('pendek')
+        with self.assertRaisesMessage(tickets.InvalidTicket, 'expired'):
+            tickets.read_token(token, now=self.event.date_time + timedelta(days=2))
+        with self.settings(TICKET_SIGNING_KEY='kunci-lain'):
+            with self.assertRaises(tickets.InvalidTicket):
+                tickets.read_token(token)
+
+    def test_offline_verification(self):
+        pending = make_participant(self.event, email='pending@example.com')
+        cancelled = make_participant(self.event, email='batal@example.com', is_verified=True)
+        cancelled_token = tickets.issue_token(cancelled)
+        cancelled.delete()
+        checkin.check_in(self.organizer, self.participant.validation_id)
+
+        manifest = json.loads(json.dumps(tickets.build_manifest(self.event)))
+        self.assertEqual(tickets.verify_offline(tickets.issue_token(self.participant), manifest), 'duplicate')
+        self.assertEqual(tickets.verify_offline(tickets.issue_token(pending), manifest), 'unverified')
+        self.assertEqual(tickets.verify_offline(cancelled_token, manifest), 'unverified')
+
+        other_event = make_event(self.organizer, title='Lain')
+        fresh = make_participant(other_event, is_verified=True)
+        self.assertEqual(tickets.verify_offline(tickets.issue_token(fresh), manifest), 'invalid')
+        other_manifest = tickets.build_manifest(other_event)
+        self.assertEqual(tickets.verify_offline(tickets.issue_token(fresh), other_manifest), 'ok')
+
+    def test_manifest_endpoint(self):
+        url = reverse('ticket_manifest', args=[self.event.id])
+        self.client.force_login(User.objects.create_user(username='lain', password='x'))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.organizer)
+        response = self.client.get(url)
+        self.assertEqual(response.json()['valid']['count'], 1)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        checkin.check_in(self.organizer, self.participant.validation_id)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_scanner_device_uses_bearer_token_without_csrf(self):
+        self.client.force_login(self.organizer)
+        token = self.client.get(reverse('scanner_token')).json()['token']
+        device = Client(enforce_csrf_checks=True)
+        body = json.dumps({'validation_id': str(self.participant.validation_id), 'device': 'pintu-2'})
+
+        def scan(client, **headers):
+            return client.post(reverse('api_checkin'), body, content_type='application/json', **headers)
+
+        # Sesi browser tanpa token CSRF tetap ditolak; perangkat tanpa sesi cukup header token
+        browser = Client(enforce_csrf_checks=True)
+        browser.force_login(self.organizer)
+        self.assertEqual(scan(browser).status_code, 403)
+        self.assertEqual(scan(device).status_code, 401)
+        self.assertEqual(scan(device, HTTP_AUTHORIZATION='Bearer palsu').status_code, 401)
+        self.assertEqual(scan(device, HTTP_AUTHORIZATION=f'Bearer {token}').status_code, 200)
+        self.assertEqual(Attendance.objects.get().checked_in_by, self.organizer)
+        manifest = device.get(reverse('ticket_manifest', args=[self.event.id]), HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(manifest.status_code, 200)
+
+        # Ganti password mencabut token lama
+        self.organizer.set_password('baru')
+        self.organizer.save()
+        self.assertEqual(scan(device, HTTP_AUTHORIZATION=f'Bearer {token}').status_code, 401)
+
+    def test_sync_uploads_offline_scans(self):
+        self.client.force_login(self.organizer)
+        token = tickets.issue_token(self.participant)
+        scanned_at = (timezone.now() - timedelta(minutes=30)).isoformat()
+        body = {'device': 'offline-2', 'scans': [
+            {'token': token, 'scanned_at': scanned_at},
+            {'token': token},
+            {'token': 'palsu'},
+        ]}
+        response = self.client.post(reverse('api_checkin_sync'), json.dumps(body), content_type='application/json')
+        self.assertEqual([r['status'] for r in response.json()['results']], ['ok', 'duplicate', 'invalid'])
+        attendance = Attendance.objects.get()
+        self.assertEqual((attendance.device, attendance.checked_in_at.isoformat()), ('offline-2', scanned_at))
+
+
+@GOOGLE_APP
+class ParticipantRosterTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', password='x', is_organizer=True)
+        self.event = make_event(self.organizer)
+        self.participants = [
+            make_participant(
+                self.event, full_name=f'Peserta {i}', email=f'p{i}@example.com',
+                institution='UGM' if i % 3 == 0 else 'ITB', is_verified=i % 2 == 0,
+            )
+            for i in range(7)
+        ]
+        # Sebagian waktu daftar sama persis: urutan harus tetap stabil lewat id
+        Participant.objects.filter(id__in=[p.id for p in self.participants[:4]]).update(
+            registered_at=timezone.now() - timedelta(hours=1),
+        )
+        self.client.force_login(self.organizer)
+
+    def test_keyset_pages_cover_everything_once(self):
+        seen, cursor = [], None
+        while True:
+            page, cursor = roster.participant_page(self.event, cursor=cursor, limit=2)
+            seen += [p.id for p in page]
+            if cursor is None:
+                break
+        expected = list(Participant.objects.filter(event=self.event).order_by('-registered_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_tampered_cursor_is_ignored(self):
+        first = [p.id for p in roster.participant_page(self.event, limit=2)[0]]
+        url = reverse('event_participants', args=[self.event.id])
+        for values in (['2020-01-01T00:00:00+00:00', 'y'], ['2020-01-01T00:00:00+00:00', None], ['kemarin', 1], [5, 1]):
+            cursor = search.encode_cursor(values)
+            self.assertEqual([p.id for p in roster.participant_page(self.event, cursor=cursor, limit=2)[0]], first, values)
+            self.assertEqual(self.client.get(url, {'after': cursor}).status_code, 200, values)
+
+    def test_filters_and_search(self):
+        def names(**kwargs):
+            return sorted(p.full_name for p in roster.participant_page(self.event, **kwargs)[0])
+        self.assertEqual(names(status='pending'), ['Peserta 1', 'Peserta 3', 'Peserta 5'])
+        self.assertEqual(names(institution='ugm', status='verified'), ['Peserta 0', 'Peserta 6'])
+        self.assertEqual(names(q='P4@EXAMPLE'), ['Peserta 4'])
+        self.assertEqual(names(q='100%'), [])
+
+    def test_page_cost_does_not_grow_with_event_size(self):
+        url = reverse('event_participants', args=[self.event.id])
+        self.client.get(url)  # pemanasan cache site/social app
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+        Participant.objects.bulk_create(
+            Participant(event=self.event, full_name=f'Massal {i}', email=f'm{i}@example.com', phone='08')
+            for i in range(roster.PAGE_SIZE * 2)
+        )
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(len(response.context['participants']), roster.PAGE_SIZE)
+
+        rows = self.client.get(reverse('participant_rows', args=[self.event.id]) + '?' + response.context['next_query'])
+        self.assertEqual(rows.content.count(b'<tr'), roster.PAGE_SIZE)
+        self.assertIn('X-Next-Page', rows)
+
+    def test_rows_endpoint_is_private(self):
+        self.client.force_login(User.objects.create_user(username='lain', password='x'))
+        self.assertEqual(self.client.get(reverse('participant_rows', args=[self.event.id])).status_code, 404)
+
+
+def photo_upload(size=(2000, 1000), orientation=6, name='bukti.jpg'):
+    """JPEG ala kamera HP: orientasi EXIF + koordinat GPS."""
+    from PIL import Image
+    image = Image.new('RGB', size, (200, 30, 30))
+    exif = image.getexif()
+    exif[0x0112] = orientation
+    exif[0x010F] = 'KameraHP'
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+@GOOGLE_APP
+class ImagePipelineTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.media = os.path.join(tmp.name, 'media')
+        self.temp = os.path.join(tmp.name, 'tmp')
+        settings_override = override_settings(
+            IMAGE_STORAGE='django.core.files.storage.FileSystemStorage',
+            MEDIA_ROOT=self.media, IMAGE_UPLOAD_TEMP_DIR=self.temp,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.organizer = User.objects.create_user(username='org', password='x', is_organizer=True)
+        self.event = make_event(self.organizer)
+
+    def register_with_proof(self):
+        data = {'full_name': 'Budi', 'email': 'budi@example.com', 'phone': '0812', 'payment_proof': photo_upload()}
+        response = self.client.post(reverse('event_detail', args=[self.event.slug]), data)
+        self.assertEqual(response.status_code, 200)
+        return Participant.objects.get(email='budi@example.com')
+
+    def test_staged_proof_removed_when_registration_fails(self):
+        make_participant(self.event, email='budi@example.com')
+        participant = Participant(full_name='Budi', email='BUDI@example.com', phone='0812')
+        images.stage(participant, 'payment_proof', photo_upload())
+        temp_path = os.path.join(self.temp, participant.payment_proof_variants['temp'])
+        self.assertTrue(os.path.exists(temp_path))
+
+        # Constraint menolak tapi pendaftaran lama tidak ditemukan lagi: error naik, file temp tetap dibersihkan
+        with mock.patch.object(capacity, 'find_registration', return_value=None):
+            with self.assertRaises(IntegrityError):
+                capacity.register(self.event, participant)
+        self.assertFalse(os.path.exists(temp_path))
+
+    def test_upload_is_deferred_to_worker(self):
+        with mock.patch('cloudinary.uploader.upload_resource') as upload:
+            participant = self.register_with_proof()
+        upload.assert_not_called()
+        self.assertEqual(participant.payment_proof_variants['status'], 'pending')
+        self.assertTrue(os.path.exists(os.path.join(self.temp, participant.payment_proof_variants['temp'])))
+        self.assertFalse(os.path.exists(self.media))
+        self.assertEqual(Job.objects.get().task, 'process_image')
+
+        call_command('run_worker', '--once', stdout=StringIO())
+        participant.refresh_from_db()
+        variants = participant.payment_proof_variants
+        self.assertEqual(variants['status'], 'ready')
+        # Orientasi 6 (diputar 90 derajat): 2000x1000 tersimpan -> tampil 1000x2000
+        self.assertEqual((variants['width'], variants['height']), (1000, 2000))
+        sizes = {(i['label'], i['format']): (i['width'], i['height']) for i in variants['items']}
+        self.assertEqual(sizes[('thumb', 'webp')], (320, 640))
+        self.assertEqual(sizes[('medium', 'jpeg')], (960, 1920))
+        # Tidak pernah diperbesar: large = ukuran asli
+        self.assertEqual(sizes[('large', 'jpeg')], (1000, 2000))
+        self.assertEqual(os.listdir(self.temp), [])
+
+        from PIL import Image
+        for item in variants['items']:
+            with Image.open(os.path.join(self.media, item['name'])) as stored:
+                self.assertEqual(len(stored.getexif()), 0)
+                self.assertEqual(stored.format, item['format'].upper())
+
+    def test_small_images_are_not_duplicated(self):
+        _, _, rendered = images.render_variants(photo_upload(size=(200, 100), orientation=1))
+        self.assertEqual([(label, fmt, w) for label, fmt, w, _, _ in rendered], [('thumb', 'webp', 200), ('thumb', 'jpeg', 200)])
+
+    def test_srcset_helpers(self):
+        participant = self.register_with_proof()
+        self.client.force_login(self.organizer)
+        response = self.client.get(reverse('event_participants', args=[self.event.id]))
+        self.assertContains(response, 'Diproses')
+
+        call_command('run_worker', '--once', stdout=StringIO())
+        participant.refresh_from_db()
+        response = self.client.get(reverse('event_participants', args=[self.event.id]))
+        self.assertContains(response, images.variant_url(participant.payment_proof_variants, 'large'))
+
+        html = Template(
+            '{% load event_images %}{% responsive_image v alt="Poster" sizes="50vw" class="card-img-top" %}'
+        ).render(Context({'v': participant.payment_proof_variants}))
+        self.assertIn('<source type="image/webp" srcset="', html)
+        self.assertIn(' 320w, ', html)
+        self.assertIn('class="card-img-top"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertEqual(Template('{% load event_images %}{% responsive_image v %}').render(Context({'v': {}})), '')
+
+    def test_rejects_non_images_and_oversized_files(self):
+        url = reverse('event_detail', args=[self.event.slug])
+        data = {'full_name': 'Budi', 'email': 'budi@example.com', 'phone': '0812',
+                'payment_proof': SimpleUploadedFile('bukti.jpg', b'bukan gambar')}
+        self.assertFalse(self.client.post(url, data).context['form'].is_valid())
+        with self.settings(IMAGE_MAX_UPLOAD_MB=0):
+            data['payment_proof'] = photo_upload()
+            self.assertIn('payment_proof', self.client.post(url, data).context['form'].errors)
+        self.assertFalse(Participant.objects.exists())
+
+
+def applicant(i):
+    return Participant(full_name=f'Pendaftar {i}', email=f'd{i}@example.com', phone='0812')
+
+
+@GOOGLE_APP
+class CapacityTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', password='x', is_organizer=True)
+        self.event = make_event(self.organizer, price=0, capacity=2)
+
+    def register(self, i):
+        participant = applicant(i)
+        participant.is_verified = True
+        return capacity.register(self.event, participant)
+
+    def test_overflow_goes_to_ordered_waitlist(self):
+        outcomes = [self.register(i)[0] for i in range(5)]
+        self.assertEqual(outcomes, ['registered'] * 2 + ['waitlisted'] * 3)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.participant_count, self.event.verified_count), (2, 2))
+        last = WaitlistEntry.objects.order_by('id').last()
+        self.assertEqual(capacity.position(last), 3)
+
+        response = self.client.post(reverse('event_detail', args=[self.event.slug]),
+                                    {'full_name': 'Citra', 'email': 'citra@example.com', 'phone': '0812'})
+        self.assertTemplateUsed(response, 'events/waitlisted.html')
+        self.assertEqual(response.context['position'], 4)
+        self.assertEqual(Participant.objects.count(), 2)
+
+    def test_released_seat_goes_to_head_of_queue(self):
+        first, _ = self.register(0)[1], self.register(1)
+        self.register(2)
+        self.register(3)
+        first.delete()
+
+        promoted = Participant.objects.get(email='d2@example.com')
+        self.assertTrue(promoted.is_verified)
+        self.assertEqual(WaitlistEntry.objects.get(email='d2@example.com').participant, promoted)
+        self.assertEqual(capacity.position(WaitlistEntry.objects.get(email='d3@example.com')), 1)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 2)
+        self.assertEqual(Job.objects.get(task='send_email').payload['args'][3], ['d2@example.com'])
+
+    def test_raising_capacity_promotes_and_event_delete_is_quiet(self):
+        for i in range(5):
+            self.register(i)
+        self.event.capacity = 4
+        self.event.save()
+        self.assertEqual(Participant.objects.count(), 4)
+        self.assertEqual(WaitlistEntry.objects.filter(status='waiting').count(), 1)
+
+        self.event.delete()
+        self.assertFalse(Participant.objects.exists())
+        self.assertFalse(WaitlistEntry.objects.exists())
+
+    def test_proof_processed_after_promotion_reaches_participant(self):
+        for i in range(3):
+            self.register(i)
+        entry = WaitlistEntry.objects.get()
+        Participant.objects.filter(email='d0@example.com').delete()
+        variants = {'status': 'ready', 'items': []}
+        entry.on_image_ready('payment_proof', variants)
+        self.assertEqual(Participant.objects.get(email='d2@example.com').payment_proof_variants, variants)
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    def test_no_overselling_under_parallel_registrations(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from django.db import connections
+
+        organizer = User.objects.create_user(username='org', password='x')
+        event = make_event(organizer, capacity=50)
+        total = 300
+
+        def attempt(i):
+            try:
+                return capacity.register(event, applicant(i))[0]
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            outcomes = list(pool.map(attempt, range(total)))
+
+        event.refresh_from_db()
+        self.assertEqual(outcomes.count('registered'), 50)
+        self.assertEqual(Participant.objects.filter(event=event).count(), 50)
+        self.assertEqual(event.participant_count, 50)
+        self.assertEqual(WaitlistEntry.objects.filter(event=event, status='waiting').count(), total - 50)
+
+
+class WorkerDispatchTests(TransactionTestCase):
+    def test_long_job_does_not_hold_back_other_slots(self):
+        from concurrent.futures import ThreadPoolExecutor, wait
+
+        release = threading.Event()
+        jobs.TASKS['long_task'] = lambda: release.wait(10)
+        jobs.TASKS['short_task'] = lambda: None
+        self.addCleanup(jobs.TASKS.pop, 'long_task')
+        self.addCleanup(jobs.TASKS.pop, 'short_task')
+        jobs.enqueue('long_task')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            running = jobs.dispatch(executor, set(), slots=2, batch_size=1, timeout=0.05)
+            for _ in range(3):
+                jobs.enqueue('short_task')
+            deadline = time.monotonic() + 5
+            # Slot kedua terus diisi job pendek selama job panjang masih jalan
+            while Job.objects.filter(task='short_task').exclude(status='done').exists() and time.monotonic() < deadline:
+                running = jobs.dispatch(executor, running, slots=2, timeout=0.05)
+            self.assertEqual(Job.objects.get(task='long_task').status, 'running')
+            self.assertEqual(Job.objects.filter(task='short_task', status='done').count(), 3)
+            release.set()
+            wait(running)
+        self.assertEqual(Job.objects.get(task='long_task').status, 'done')
+
+
+@GOOGLE_APP
+class DuplicateRegistrationTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', password='x', is_organizer=True)
+        self.event = make_event(self.organizer, price=0)
+        self.url = reverse('event_detail', args=[self.event.slug])
+
+    def test_resubmitted_form_returns_existing_ticket(self):
+        key = self.client.get(self.url).context['form'].initial['idempotency_key']
+        data = {'full_name': 'Budi', 'email': 'budi@example.com', 'phone': '0812', 'idempotency_key': key}
+        first = self.client.post(self.url, data)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.post(self.url, data)
+
+        self.assertTemplateUsed(second, 'events/success.html')
+        self.assertEqual(second.context['participant'].pk, first.context['participant'].pk)
+        self.assertFalse([q for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE'))])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 1)
+
+        # Form baru (token lain) dengan email sama, beda huruf besar/kecil: ditolak
+        response = self.client.post(self.url, dict(data, email='BUDI@Example.com', idempotency_key=uuid.uuid4()))
+        self.assertTemplateUsed(response, 'events/event_detail.html')
+        self.assertIn('sudah terdaftar', response.context['form'].errors['email'][0])
+        self.assertEqual(Participant.objects.count(), 1)
+
+    def test_reused_form_token_from_other_applicant(self):
+        key = self.client.get(self.url).context['form'].initial['idempotency_key']
+        alice = self.client.post(self.url, {
+            'full_name': 'Alice', 'email': 'alice@example.com', 'phone': '0812', 'idempotency_key': key,
+        }).context['participant']
+        # Form yang sama (token sama) dikirim orang lain: bukan tiket Alice, tapi pendaftaran baru
+        response = self.client.post(self.url, {
+            'full_name': 'Bob', 'email': 'bob@example.com', 'phone': '0813', 'idempotency_key': key,
+        })
+
+        self.assertTemplateUsed(response, 'events/success.html')
+        bob = response.context['participant']
+        self.assertNotEqual(bob.pk, alice.pk)
+        self.assertEqual(bob.email, 'bob@example.com')
+        self.assertIsNone(bob.idempotency_key)
+        self.assertNotContains(response, 'alice@example.com')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 2)
+
+    def test_concurrent_duplicate_is_rejected_by_constraint(self):
+        key = uuid.uuid4()
+        first = applicant(0)
+        first.idempotency_key = key
+        capacity.register(self.event, first)
+        # Submit kedua lolos pengecekan awal (mis. berjalan bersamaan): constraint menolak, kursi tidak terpakai
+        second = applicant(0)
+        second.email = 'D0@example.com'
+        outcome, existing = capacity.register(self.event, second)
+
+        self.assertEqual(outcome, capacity.DUPLICATE)
+        self.assertEqual(existing.pk, first.pk)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 1)
+
+    def test_waitlist_duplicates_and_promotion_conflict(self):
+        self.event.capacity = 1
+        self.event.save()
+        seated = capacity.register(self.event, applicant(0))[1]
+        capacity.register(self.event, applicant(1))
+        self.assertEqual(capacity.register(self.event, applicant(1))[0], capacity.DUPLICATE)
+        capacity.register(self.event, applicant(2))
+        # d1 sudah ditambahkan sebagai peserta lewat jalur lain sebelum kursinya tiba
+        make_participant(self.event, email='D1@example.com')
+
+        seated.delete()
+        self.assertEqual(WaitlistEntry.objects.get(email='d1@example.com').status, 'cancelled')
+        self.assertEqual(WaitlistEntry.objects.get(email='d2@example.com').status, 'promoted')
+
+    def drop_unique_indexes(self):
+        # Meniru data lama sebelum constraint ada (di-rollback bersama transaksi test)
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX participant_event_email_uniq")
+            cursor.execute("DROP INDEX waitlist_event_email_waiting_uniq")
+
+    def test_merge_command_keeps_best_ticket(self):
+        self.drop_unique_indexes()
+        other = make_event(self.organizer, title='Lain', price=50000)
+        proof = {'status': 'ready', 'items': []}
+        make_participant(self.event, payment_proof_variants=proof)
+        keeper = make_participant(self.event, email='BUDI@example.com', is_verified=True)
+        checked_in = make_participant(self.event, email='budi@Example.com')
+        Attendance.objects.create(participant=checked_in, event=self.event)
+        untouched = make_participant(other)
+        waiting = WaitlistEntry.objects.create(event=self.event, full_name='Budi', email='budi@example.com', phone='0')
+        Event.objects.filter(pk=self.event.pk).update(participant_count=3, verified_count=1)
+
+        out = StringIO()
+        call_command('merge_duplicate_participants', '--dry-run', stdout=out)
+        self.assertIn('2 peserta ditemukan', out.getvalue())
+        self.assertEqual(Participant.objects.count(), 4)
+
+        call_command('merge_duplicate_participants', stdout=StringIO())
+        keeper.refresh_from_db()
+        self.assertEqual(list(Participant.objects.filter(event=self.event)), [keeper])
+        self.assertEqual(keeper.payment_proof_variants, proof)
+        self.assertEqual(Attendance.objects.get().participant, keeper)
+        self.assertTrue(Participant.objects.filter(pk=untouched.pk).exists())
+        waiting.refresh_from_db()
+        self.assertEqual(waiting.status, 'cancelled')
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.participant_count, self.event.verified_count), (1, 1))
+
+    def test_merge_runs_on_historical_models(self):
+        from django.db.migrations.executor import MigrationExecutor
+        from . import dedupe
+
+        self.drop_unique_indexes()
+        make_participant(self.event)
+        make_participant(self.event, email='Budi@example.com')
+        state = MigrationExecutor(connection).loader.project_state(('events', '0018_participant_idempotency'))
+
+        report = dedupe.merge_duplicates(state.apps)
+        self.assertEqual((report['groups'], report['removed']), (1, 1))
+        self.assertEqual(Participant.objects.count(), 1)
+
+
+@GOOGLE_APP
+class AsyncRequestPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.registry.reset()
+        self.organizer = User.objects.create_user(
+            username='org', email='org@example.com', password='x', is_organizer=True,
+        )
+        self.event = make_event(self.organizer)
+        self.free = make_event(self.organizer, title='Seminar Gratis', price=0)
+        self.participant = make_participant(self.event)
+
+    def test_io_bound_views_are_async(self):
+        urls = [
+            reverse('check_ticket'),
+            reverse('event_detail', args=[self.event.slug]),
+            reverse('validate_scan', args=[self.participant.validation_id]),
+        ]
+        for url in urls:
+            self.assertTrue(iscoroutinefunction(resolve(url).func), url)
+
+    async def test_middleware_chain_is_native_async(self):
+        # Satu middleware sync-only saja membuat Django menjalankan sisa rantai lewat thread per request
+        for path in settings.MIDDLEWARE:
+            self.assertTrue(getattr(import_string(path), 'async_capable', False), path)
+        response = await AsyncClient().get(reverse('event_detail', args=[self.event.slug]))
+        self.assertContains(response, self.event.title)
+        self.assertIn('X-Request-ID', response)
+
+    async def test_check_ticket_revalidates(self):
+        url = reverse('check_ticket')
+        first = await self.async_client.get(url, {'email': 'BUDI@example.com'})
+        self.assertContains(first, self.event.title)
+
+        second = await self.async_client.get(url, {'email': 'budi@example.com'}, headers={'if-none-match': first['ETag']})
+        self.assertEqual(second.status_code, 304)
+        # Query ORM async tetap terhitung di MetricsMiddleware
+        self.assertGreater(metrics.registry.views['check_ticket'].queries, 0)
+
+    async def test_validate_scan_requires_login(self):
+        url = reverse('validate_scan', args=[self.participant.validation_id])
+        response = await self.async_client.get(url)
+        self.assertRedirects(response, reverse('account_login'), fetch_redirect_response=False)
+
+        await self.async_client.aforce_login(self.organizer)
+        self.assertContains(await self.async_client.get(url), 'Budi')
+        missing = await self.async_client.get(reverse('validate_scan', args=[uuid.uuid4()]))
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_event_detail_registration(self):
+        url = reverse('event_detail', args=[self.free.slug])
+        self.assertContains(await self.async_client.get(url), 'Seminar Gratis')
+
+        response = await self.async_client.post(url, {
+            'full_name': 'Ani', 'email': 'ani@example.com', 'phone': '0812', 'idempotency_key': uuid.uuid4(),
+        })
+        self.assertEqual(response.status_code, 200)
+        participant = await Participant.objects.aget(event=self.free, email='ani@example.com')
+        self.assertTrue(participant.is_verified)
+        missing = await self.async_client.get(reverse('event_detail', args=['tidak-ada']))
+        self.assertEqual(missing.status_code, 404)
+
+    @override_settings(WHITENOISE_USE_FINDERS=True, WHITENOISE_AUTOREFRESH=True)
+    async def test_static_files_stream_asynchronously(self):
+        response = await AsyncClient().get('/static/events/images/favicon-16x16.png')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        with open(os.path.join(settings.BASE_DIR, 'static', 'events', 'images', 'favicon-16x16.png'), 'rb') as f:
+            self.assertEqual(content, f.read())
+
+
+class StartupTests(TestCase):
+    def test_boot_does_not_import_heavy_modules(self):
+        # Interpreter baru: modul yang sudah dimuat proses test tidak ikut terhitung
+        profile = perf.startup_profile(runs=1)
+        self.assertEqual(profile['heavy'], [])
+        self.assertGreater(profile['import_ms'], 0)
+
+    def test_readiness_warms_once(self):
+        with mock.patch.object(warmup, '_warmed', False):
+            first = self.client.get(reverse('readiness'))
+            second = self.client.get(reverse('readiness'))
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()['checks'], {'database': 'ok', 'cache': 'ok'})
+        self.assertIsNotNone(first.json()['warmup_ms'])
+        self.assertIsNone(second.json()['warmup_ms'])
+        self.assertIn('no-cache', first['Cache-Control'])
+
+    def test_readiness_reports_unavailable_database(self):
+        with mock.patch.dict(warmup.CHECKS, database=mock.Mock(side_effect=DatabaseError('down'))):
+            response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks']['database'], 'error: DatabaseError')
+        self.assertIsNone(response.json()['warmup_ms'])
@@ -0,0 +1,186 @@
+"""
+Tiket bertanda tangan (HMAC) yang bisa diverifikasi scanner tanpa koneksi DB.
+
+Format token (base64url tanpa padding), 54 byte sebelum encode:
+
+    versi (1) | participant_id (8) | event_id (8) | flags (1) | expires (4, epoch detik)
+    | validation_id (16) | HMAC-SHA256 terpotong (16)
+
+flags bit 0 = sudah terverifikasi (lunas). Kunci HMAC diturunkan per event dari
+TICKET_SIGNING_KEY, jadi scanner hanya memegang kunci event yang dijaganya
+(dibagikan lewat manifest), bukan kunci induk.
+
+Manifest per event berisi kunci tersebut plus dua bloom filter: peserta yang
+masih valid (terhapus/batal -> tidak ada di filter) dan yang sudah check-in.
+"""
+import base64
+import hashlib
+import hmac
+import math
+import struct
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+VERSION = 1
+MAC_SIZE = 16
+_PAYLOAD = struct.Struct('>BQQBI16s')
+FLAG_VERIFIED = 1
+
+TicketClaims = namedtuple('TicketClaims', 'participant_id event_id verified expires validation_id')
+
+
+class InvalidTicket(Exception):
+    pass
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def master_key():
+    key = getattr(settings, 'TICKET_SIGNING_KEY', '') or settings.SECRET_KEY
+    return key.encode('utf-8')
+
+
+def event_key(event_id):
+    """Kunci HMAC khusus satu event (boleh dibagikan ke scanner event tsb)."""
+    return hmac.new(master_key(), f'portalevent.ticket.v{VERSION}:{event_id}'.encode(), hashlib.sha256).digest()
+
+
+def expires_at(event):
+    return event.date_time + timedelta(hours=getattr(settings, 'TICKET_VALID_HOURS_AFTER_EVENT', 24))
+
+
+def issue_token(participant, event=None):
+    event = event or participant.event
+    payload = _PAYLOAD.pack(
+        VERSION, participant.pk, event.pk,
+        FLAG_VERIFIED if participant.is_verified else 0,
+        int(expires_at(event).timestamp()),
+        participant.validation_id.bytes,
+    )
+    mac = hmac.new(event_key(event.pk), payload, hashlib.sha256).digest()[:MAC_SIZE]
+    return _b64encode(payload + mac)
+
+
+def read_token(token, key=None, check_expiry=True, now=None):
+    """
+    Verifikasi token dan kembalikan TicketClaims. `key` = kunci event (dari manifest);
+    tanpa key, kunci diturunkan dari TICKET_SIGNING_KEY (sisi server).
+    """
+    try:
+        raw = _b64decode(token)
+    except (ValueError, TypeError):
+        raise InvalidTicket('format')
+    if len(raw) != _PAYLOAD.size + MAC_SIZE:
+        raise InvalidTicket('format')
+    payload, mac = raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+    version, participant_id, event_id, flags, expires, vid = _PAYLOAD.unpack(payload)
+    if version != VERSION:
+        raise InvalidTicket('version')
+
+    expected = hmac.new(key or event_key(event_id), payload, hashlib.sha256).digest()[:MAC_SIZE]
+    if not hmac.compare_digest(mac, expected):
+        raise InvalidTicket('signature')
+
+    claims = TicketClaims(
+        participant_id, event_id, bool(flags & FLAG_VERIFIED),
+        datetime.fromtimestamp(expires, tz=dt_timezone.utc), uuid.UUID(bytes=vid),
+    )
+    if check_expiry and claims.expires < (now or timezone.now()):
+        raise InvalidTicket('expired')
+    return claims
+
+
+def token_digest(token):
+    """Sidik pendek token, untuk ETag/cache key QR."""
+    return hashlib.sha256(token.encode('ascii')).hexdigest()[:16]
+
+
+# --- Bloom filter (manifest scanner) ---
+class BloomFilter:
+    """
+    Bit array m bit, k hash (double hashing dari SHA-256 atas str(item)).
+    Scanner mengimplementasikan hal yang sama: bit ke-i = (h1 + i*h2) mod m,
+    h1/h2 = 8 byte pertama/berikutnya digest (big-endian).
+    """
+
+    def __init__(self, size_bits, hashes, data=None):
+        self.size = max(8, size_bits)
+        self.hashes = hashes
+        self.bits = bytearray(data) if data is not None else bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, hashes)
+
+    def _positions(self, item):
+        digest = hashlib.sha256(str(item).encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def to_dict(self):
+        return {'m': self.size, 'k': self.hashes, 'bits': _b64encode(bytes(self.bits))}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['m'], data['k'], _b64decode(data['bits']))
+
+
+def build_manifest(event, error_rate=0.01):
+    """Data yang di-cache perangkat scanner untuk memverifikasi tiket satu event secara offline."""
+    valid_ids = list(event.participants.filter(is_verified=True).values_list('id', flat=True))
+    checked_in_ids = list(event.attendances.values_list('participant_id', flat=True))
+
+    valid = BloomFilter.for_capacity(len(valid_ids), error_rate)
+    for pk in valid_ids:
+        valid.add(pk)
+    checked_in = BloomFilter.for_capacity(len(checked_in_ids), error_rate)
+    for pk in checked_in_ids:
+        checked_in.add(pk)
+
+    return {
+        'version': VERSION,
+        'event': {'id': event.pk, 'title': event.title, 'date_time': event.date_time.isoformat()},
+        'key': _b64encode(event_key(event.pk)),
+        'generated_at': timezone.now().isoformat(),
+        'valid': dict(valid.to_dict(), count=len(valid_ids)),
+        'checked_in': dict(checked_in.to_dict(), count=len(checked_in_ids)),
+    }
+
+
+def verify_offline(token, manifest, now=None):
+    """
+    Referensi logika scanner offline. Return status: ok / duplicate / unverified /
+    invalid / expired. Tiket event lain gagal di tanda tangan (kunci per event) -> invalid.
+    """
+    try:
+        claims = read_token(token, key=_b64decode(manifest['key']), now=now)
+    except InvalidTicket as e:
+        return 'expired' if str(e) == 'expired' else 'invalid'
+    # Manifest lebih baru dari token: peserta yang baru lunas setelah QR dibuat tetap lolos,
+    # peserta yang dibatalkan/dihapus tidak ada lagi di filter
+    if claims.participant_id not in BloomFilter.from_dict(manifest['valid']):
+        return 'unverified'
+    if claims.participant_id in BloomFilter.from_dict(manifest['checked_in']):
+        return 'duplicate'
+    return 'ok'
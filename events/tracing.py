@@ -0,0 +1,184 @@
+"""
+Tracing ringan untuk kerja eksternal (Cloudinary, SMTP, Telegram, QR, PDF).
+
+    with tracing.span('smtp.send_mail', recipients=3):
+        ...
+
+    @tracing.traced('qr.render')
+    def render_qr(...): ...
+
+Span disimpan di trace aktif (contextvar) yang dibuka TracingMiddleware per request
+atau `tracing.trace()` per job worker. Di akhir trace:
+- trace lambat (>= TRACE_SLOW_MS) selalu ditulis ke log beserta rincian span-nya;
+- sisanya ditulis dengan probabilitas TRACE_SAMPLE_RATE.
+Log berupa satu baris JSON per trace di logger `events.tracing`.
+Tanpa trace aktif, span tidak mencatat apa-apa (biaya hampir nol).
+"""
+import contextvars
+import json
+import logging
+import random
+import time
+import uuid
+from contextlib import ContextDecorator, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger('events.tracing')
+
+# Batas span per trace agar loop panjang (blast email) tidak membengkakkan memori
+MAX_SPANS = 200
+
+_current_trace = contextvars.ContextVar('trace', default=None)
+_current_span = contextvars.ContextVar('span', default=None)
+
+
+class Trace:
+    def __init__(self, name, trace_id=None):
+        self.name = name
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.start = time.perf_counter()
+        self.spans = []
+        self.dropped = 0
+        self.attrs = {}
+
+    def to_dict(self, duration):
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'duration_ms': round(duration * 1000, 2),
+            **self.attrs,
+            'spans': self.spans,
+            'dropped_spans': self.dropped,
+        }
+
+
+class span(ContextDecorator):
+    """Context manager / decorator yang mencatat durasi satu operasi di trace aktif."""
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def _recreate_cm(self):
+        # Dipakai sebagai decorator: instance baru per panggilan (aman untuk thread & rekursi)
+        return span(self.name, **self.attrs)
+
+    def __enter__(self):
+        self.trace = _current_trace.get()
+        if self.trace is None:
+            return self
+        self.parent = _current_span.get()
+        self.span_id = uuid.uuid4().hex[:16]
+        self.token = _current_span.set(self.span_id)
+        self.start = time.perf_counter()
+        return self
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __exit__(self, exc_type, exc, tb):
+        trace = self.trace
+        if trace is None:
+            return False
+        end = time.perf_counter()
+        _current_span.reset(self.token)
+        if len(trace.spans) >= MAX_SPANS:
+            trace.dropped += 1
+            return False
+        record = {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent,
+            'start_ms': round((self.start - trace.start) * 1000, 2),
+            'duration_ms': round((end - self.start) * 1000, 2),
+        }
+        if self.attrs:
+            record['attrs'] = self.attrs
+        if exc_type is not None:
+            record['error'] = f'{exc_type.__name__}: {exc}'[:200]
+        trace.spans.append(record)
+        return False
+
+
+# Alias agar pemakaian sebagai decorator terbaca jelas: @tracing.traced('pdf.render')
+traced = span
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def sample_rate():
+    return getattr(settings, 'TRACE_SAMPLE_RATE', 0.01)
+
+
+def slow_threshold():
+    return getattr(settings, 'TRACE_SLOW_MS', 1000) / 1000
+
+
+@contextmanager
+def trace(name, trace_id=None):
+    """Buka trace baru (per request / per job) lalu log sesuai sampling & ambang lambat."""
+    current = Trace(name, trace_id)
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+        finish(current)
+
+
+def finish(current):
+    duration = time.perf_counter() - current.start
+    if duration >= slow_threshold():
+        logger.warning(json.dumps(dict(current.to_dict(duration), slow=True), default=str))
+    elif random.random() < sample_rate():
+        logger.info(json.dumps(current.to_dict(duration), default=str))
+
+
+class TracingMiddleware:
+    """Satu trace per request; ID trace dikembalikan di header X-Request-ID."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with trace(self._name(request), self._trace_id(request)) as current:
+            response = self.get_response(request)
+            self._annotate(current, request, response)
+        response['X-Request-ID'] = current.trace_id
+        return response
+
+    async def __acall__(self, request):
+        # Contextvar trace ikut tersalin ke thread sync_to_async, jadi span di kode sync tetap tercatat
+        with trace(self._name(request), self._trace_id(request)) as current:
+            response = await self.get_response(request)
+            self._annotate(current, request, response)
+        response['X-Request-ID'] = current.trace_id
+        return response
+
+    @staticmethod
+    def _name(request):
+        return f'{request.method} {request.path}'
+
+    @staticmethod
+    def _trace_id(request):
+        incoming = request.headers.get('X-Request-ID', '')
+        return incoming if incoming.isalnum() and len(incoming) <= 64 else None
+
+    @staticmethod
+    def _annotate(current, request, response):
+        match = request.resolver_match
+        current.attrs.update(
+            view=match.view_name if match else None,
+            status=response.status_code,
+        )
@@ -7,6 +7,7 @@ from events import views
 urlpatterns = [
     path('', views.home, name='home'),
     path('event/<slug:slug>/', views.event_detail, name='event_detail'),
+    path('cari/', views.search_events, name='search_events'),
     
     # Organizer
     path('dashboard/', views.organizer_dashboard, name='organizer_dashboard'),
@@ -16,17 +17,31 @@ urlpatterns = [
     # Admin Khusus
     path('admin-panel/approval/', views.admin_approval_list, name='admin_approval_list'), # <-- Baru
     path('admin-panel/approve/<int:event_id>/', views.approve_event, name='approve_event'), # <-- Baru
+    path('admin-panel/jobs/', views.job_queue_stats, name='job_queue_stats'),
+    path('admin-panel/cache/', views.page_cache_stats, name='page_cache_stats'),
+    path('metrics', views.metrics_endpoint, name='metrics'),
+    path('ready/', views.readiness, name='readiness'),
     path('scan/<uuid:validation_id>/', views.validate_scan, name='validate_scan'),
+    path('api/scanner-token/', views.scanner_token, name='scanner_token'),
+    path('api/checkin/', views.api_checkin, name='api_checkin'),
+    path('api/checkin/batch/', views.api_checkin_batch, name='api_checkin_batch'),
+    path('api/checkin/sync/', views.api_checkin_sync, name='api_checkin_sync'),
+    path('api/events/<int:event_id>/manifest/', views.ticket_manifest, name='ticket_manifest'),
+    path('ticket/<uuid:validation_id>/qr.<str:fmt>', views.ticket_qr, name='ticket_qr'),
     path('cek-tiket/', views.check_ticket, name='check_ticket'),
     path('verify-payment/<int:participant_id>/', views.verify_payment, name='verify_payment'),
+    path('dashboard/event/<int:event_id>/rows/', views.participant_rows, name='participant_rows'),
+    path('dashboard/event/<int:event_id>/verify/', views.verify_payments_bulk, name='verify_payments_bulk'),
     path('dashboard/export/<int:event_id>/', views.export_participants_xls, name='export_participants'),
     path('dashboard/blast/<int:event_id>/', views.blast_email, name='blast_email'),
+    path('dashboard/blast/status/<int:campaign_id>/', views.blast_status, name='blast_status'),
     
     # FITUR PESERTA
     path('my-events/', views.participant_dashboard, name='participant_dashboard'),
     path('download-sertifikat/<int:peserta_id>/', views.generate_certificate, name='cetak_sertifikat'),
     path('certificate/<uuid:validation_id>/', views.generate_certificate, name='generate_certificate'),
     path('dashboard/finish/<int:event_id>/', views.finish_event, name='finish_event'),
+    path('dashboard/certificates/<int:event_id>/', views.download_certificates_zip, name='download_certificates_zip'),
 ]
 
 # Tambahan untuk melayani file media saat development
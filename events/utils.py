@@ -1,27 +1,26 @@
-import requests
-from django.conf import settings
+import logging
+
+from .notifier import TelegramError, get_notifier
+
+logger = logging.getLogger(__name__)
 
 def send_telegram_message(message):
     """
-    Fungsi untuk mengirim notifikasi ke Telegram Admin
+    Fungsi untuk mengirim notifikasi ke Telegram Admin.
+    Memakai notifier bersama (session dipakai ulang, ada timeout & retry).
     """
-    token = settings.TELEGRAM_BOT_TOKEN
-    chat_id = settings.TELEGRAM_CHAT_ID
-    
-    # URL API Telegram
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
-    
-    payload = {
-        "chat_id": chat_id,
-        "text": message,
-        "parse_mode": "Markdown", # Agar bisa pakai huruf tebal/miring
-    }
+    try:
+        get_notifier().send(message)
+        return True
+    except TelegramError:
+        logger.exception("Gagal kirim Telegram")
+        return False
 
+async def asend_telegram_message(message):
+    """Versi async send_telegram_message (untuk task worker `async def`)."""
     try:
-        response = requests.post(url, data=payload)
-        # Cek respon untuk debugging (opsional)
-        print(f"Status Telegram: {response.json()}") 
+        await get_notifier().asend(message)
         return True
-    except Exception as e:
-        print(f"Gagal kirim Telegram: {e}")
-        return False
\ No newline at end of file
+    except TelegramError:
+        logger.exception("Gagal kirim Telegram")
+        return False
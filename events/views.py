@@ -1,81 +1,150 @@
-from django.shortcuts import render, get_object_or_404, redirect
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import Event, Participant, Blacklist
-from .forms import RegistrationForm, EventForm, BlastEmailForm
+from .models import Event, Participant, Blacklist, BlastCampaign, WaitlistEntry
+from .forms import RegistrationForm, EventForm, BlastEmailForm, EventSearchForm, ParticipantFilterForm
+import hashlib
+import hmac
+import json
 import re
-from .utils import send_telegram_message
 from django.conf import settings
-from django.core.mail import send_mail
-import openpyxl 
-from django.http import HttpResponse
-from django.db.models import Sum, Count
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, landscape, A4
-from reportlab.lib.colors import HexColor
-import os
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.db.models import Sum, Count, Max
 import io
-from django.http import FileResponse
-
-# --- 1. IMPORT THREADING (Solusi Anti-Lemot) ---
-import threading
-
-# --- 2. FUNGSI BACKGROUND TASK (Jalan di belakang layar) ---
-def send_email_thread(subject, message, from_email, recipient_list):
-    """Fungsi ini berjalan di thread terpisah agar tidak memblokir user"""
-    try:
-        send_mail(
-            subject,
-            message,
-            from_email,
-            recipient_list,
-            fail_silently=False,
-        )
-        print(f"✅ Email berhasil dikirim ke: {recipient_list}")
-    except Exception as e:
-        print(f"❌ Gagal kirim email background: {e}")
-
-def send_telegram_thread(message):
-    """Fungsi kirim telegram di background"""
-    try:
-        send_telegram_message(message)
-        print("✅ Telegram notif terkirim.")
-    except Exception as e:
-        print(f"❌ Gagal kirim telegram: {e}")
-
-# ---------------------------------------------------------
-
+from django.http import FileResponse, JsonResponse
+from django.http import Http404
+from django.middleware.csrf import CsrfViewMiddleware
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import etag, require_POST
+from .jobs import enqueue, queue_stats
+from django.core.paginator import Paginator
+from django.urls import reverse
+from functools import wraps
+from .conditional import conditional_page
+from . import capacity, certificates, checkin, exports, images, metrics, notifier, pagecache, payments, qr, roster, search, tickets, warmup
+
+def _home_validators(request):
+    stats = Event.objects.filter(status='active').aggregate(last=Max('updated_at'), total=Count('id'))
+    return stats['last'], ('home', stats['total'], request.GET.get('page', '1'))
+
+def _home_cache_key(request):
+    page = request.GET.get('page', '1')
+    return f"v{pagecache.list_version()}:p{page if page.isdigit() else '1'}"
+
+@conditional_page(_home_validators)
+@pagecache.cache_page('home', _home_cache_key)
 def home(request):
     # Filter hanya yang status='active' agar yang pending tidak muncul di depan
     events = Event.objects.filter(status='active').order_by('-date_time')
-    return render(request, 'events/index.html', {'events': events})
+    page = Paginator(events, settings.HOME_PAGE_SIZE).get_page(request.GET.get('page'))
+    return render(request, 'events/index.html', {
+        'events': page,
+        'event_cards': pagecache.render_fragments('events/_event_card.html', page.object_list),
+    })
+
+async def _event_detail_validators(request, slug):
+    updated_at = await Event.objects.filter(slug=slug).values_list('updated_at', flat=True).afirst()
+    if updated_at is None:
+        return None
+    return updated_at, ('event', slug)
 
 # 1. HALAMAN PUBLIK: Detail Event & Form Daftar
-def event_detail(request, slug):
-    event = get_object_or_404(Event, slug=slug)
-    
+# Async: di ASGI satu worker bisa melayani banyak pengunjung link share yang lambat sekaligus.
+# Form dari cache browser (304) membawa token lama; aman karena token hanya berlaku untuk pendaftar yang sama
+@conditional_page(_event_detail_validators)
+async def event_detail(request, slug):
     if request.method == 'POST':
-        form = RegistrationForm(request.POST, request.FILES, is_free=event.is_free)
-        if form.is_valid():
-            participant = form.save(commit=False)
-            participant.event = event
-            # Logic auto-verify jika gratis
-            if event.is_free:
-                participant.is_verified = True
-            participant.save()
-            
-            return render(request, 'events/success.html', {
-                'event': event, 
-                'participant': participant 
-            })
+        # Pendaftaran (upload, transaksi & lock kursi) tetap kode sync, di thread milik request ini
+        return await sync_to_async(_event_detail_post)(request, slug)
+
+    # Pengunjung anonim (trafik link share) dilayani dari cache
+    if pagecache.is_cacheable(request):
+        event = await pagecache.aget_event_by_slug(slug, Event.objects.all())
+        if event is None:
+            raise Http404
     else:
-        form = RegistrationForm(is_free=event.is_free)
+        event = await aget_object_or_404(Event, slug=slug)
+    # Template (navbar, fragment cache) masih sync
+    return await sync_to_async(_event_detail_page)(request, event, RegistrationForm(is_free=event.is_free))
+
+def _event_detail_post(request, slug):
+    # POST selalu ke DB
+    event = get_object_or_404(Event, slug=slug)
 
+    # Klik ganda / refresh: token form sama -> tampilkan hasil submit pertama tanpa validasi & upload ulang.
+    # Token hanya dipercaya jika nama & email sama: form yang sama bisa saja dikirim orang lain
+    existing = capacity.find_registration(event, key=request.POST.get('idempotency_key'))
+    reused_key = existing is not None and not capacity.same_applicant(
+        existing, request.POST.get('email'), request.POST.get('full_name'),
+    )
+    if existing is not None and not reused_key:
+        return _registration_result(request, event, existing)
+
+    form = RegistrationForm(request.POST, request.FILES, is_free=event.is_free)
+    if form.is_valid():
+        participant = form.save(commit=False)
+        participant.event = event
+        # Token milik pendaftaran orang lain: proses sebagai pendaftaran baru tanpa token
+        participant.idempotency_key = None if reused_key else form.cleaned_data.get('idempotency_key')
+        # Logic auto-verify jika gratis
+        if event.is_free:
+            participant.is_verified = True
+        # Tanpa kuota cukup constraint unik (register() -> DUPLICATE). Dengan kuota perlu dicek dulu:
+        # email yang sudah jadi peserta tidak melanggar constraint jika masuk daftar tunggu
+        if event.capacity is not None and capacity.find_registration(event, email=participant.email) is not None:
+            form.reject_duplicate()
+        else:
+            # File mentah cukup ditulis ke disk lokal; kompres & upload dikerjakan worker
+            upload = form.cleaned_data.get('payment_proof')
+            if upload:
+                images.stage(participant, 'payment_proof', upload)
+            # Kursi direservasi atomik; kuota penuh -> masuk daftar tunggu
+            outcome, registration = capacity.register(event, participant)
+            # DUPLICATE dengan token sama = submit ganda yang berjalan bersamaan
+            if outcome != capacity.DUPLICATE or (
+                participant.idempotency_key and registration.idempotency_key == participant.idempotency_key
+            ):
+                return _registration_result(request, event, registration)
+            form.reject_duplicate()
+    return _event_detail_page(request, event, form)
+
+def _event_detail_page(request, event, form):
     return render(request, 'events/event_detail.html', {
         'event': event,
+        'event_info': pagecache.render_fragments('events/_event_info.html', [event])[0],
         'form': form,
     })
 
+def _registration_result(request, event, registration):
+    if isinstance(registration, WaitlistEntry):
+        return render(request, 'events/waitlisted.html', {
+            'event': event,
+            'entry': registration,
+            'position': capacity.position(registration),
+        })
+    return render(request, 'events/success.html', {'event': event, 'participant': registration})
+
+def search_events(request):
+    form = EventSearchForm(request.GET)
+    results, next_cursor = [], None
+    if form.is_valid():
+        results, next_cursor = search.search_events(cursor=request.GET.get('after'), **form.cleaned_data)
+
+    next_url = None
+    if next_cursor:
+        params = request.GET.copy()
+        params['after'] = next_cursor
+        next_url = f"?{params.urlencode()}"
+
+    return render(request, 'events/search.html', {
+        'form': form,
+        'event_cards': pagecache.render_fragments('events/_event_card.html', results),
+        'next_url': next_url,
+    })
+
 # 2. DASHBOARD ORGANIZER: List Event
 @login_required
 def organizer_dashboard(request):
@@ -102,11 +171,40 @@ def event_participants(request, event_id):
     
     if event.organizer != request.user and not request.user.is_superuser:
         return redirect('organizer_dashboard')
-        
-    participants = event.participants.all().order_by('-registered_at')
-    return render(request, 'events/participants.html', {'event': event, 'participants': participants})
 
-# --- REVISI CREATE EVENT (Hybrid & Threading) ---
+    form, participants, next_query = _participant_page(request, event)
+    return render(request, 'events/participants.html', {
+        'event': event, 'form': form, 'participants': participants, 'next_query': next_query,
+    })
+
+def _participant_page(request, event):
+    """Satu halaman peserta sesuai filter GET, plus query string halaman berikutnya (atau None)."""
+    form = ParticipantFilterForm(request.GET)
+    participants, next_cursor = [], None
+    if form.is_valid():
+        participants, next_cursor = roster.participant_page(event, cursor=request.GET.get('after'), **form.cleaned_data)
+
+    next_query = None
+    if next_cursor:
+        params = request.GET.copy()
+        params['after'] = next_cursor
+        next_query = params.urlencode()
+    return form, participants, next_query
+
+# Partial HTML (baris <tr>) untuk infinite scroll di halaman peserta
+@login_required
+def participant_rows(request, event_id):
+    event = get_object_or_404(Event.objects.only('id', 'organizer_id'), id=event_id)
+    if event.organizer_id != request.user.pk and not request.user.is_superuser:
+        raise Http404
+
+    _, participants, next_query = _participant_page(request, event)
+    response = render(request, 'events/_participant_rows.html', {'participants': participants})
+    if next_query:
+        response['X-Next-Page'] = f"{reverse('participant_rows', args=[event.id])}?{next_query}"
+    return response
+
+# --- REVISI CREATE EVENT (Hybrid & Antrian Job) ---
 @login_required
 def create_event(request):
     if not request.user.is_organizer and not request.user.is_superuser:
@@ -129,25 +227,18 @@ def create_event(request):
                 pesan_sukses = 'Seminar berhasil didaftarkan! Menunggu validasi Admin.'
                 butuh_validasi = True
             
+            poster = form.cleaned_data.get('poster')
+            if poster:
+                images.stage(event, 'poster', poster)
             event.save()
+            if poster:
+                images.schedule(event, 'poster')
             
-            # --- LOGIKA NOTIFIKASI TELEGRAM (THREADING) ---
+            # --- LOGIKA NOTIFIKASI TELEGRAM (ANTRIAN JOB) ---
             # Hanya kirim notif ke admin jika butuh validasi
             if butuh_validasi:
-                tele_message = (
-                    f"🔔 *PERMINTAAN VALIDASI BARU*\n\n"
-                    f"Halo Admin, ada seminar baru masuk:\n\n"
-                    f"📝 *Judul:* {event.title}\n"
-                    f"👤 *Organizer:* {event.organizer.username}\n"
-                    f"📅 *Tanggal:* {event.date_time.strftime('%d %b %Y, %H:%M')}\n"
-                    f"💰 *Harga:* Rp {event.price}\n\n"
-                    f"Mohon segera validasi di dashboard admin.\n"
-                    f"👉 [Klik Disini untuk Validasi](https://portalevent.onrender.com/admin-panel/approval/)" 
-                )
-                
-                # JALANKAN DI BACKGROUND
-                tele_thread = threading.Thread(target=send_telegram_thread, args=(tele_message,))
-                tele_thread.start()
+                # Dijalankan oleh `manage.py run_worker`; digest jika TELEGRAM_DIGEST_SECONDS > 0
+                notifier.notify_pending_event(event)
             # ---------------------------------------------
 
             messages.success(request, pesan_sukses)
@@ -166,7 +257,7 @@ def admin_approval_list(request):
     pending_events = Event.objects.filter(status='pending').order_by('created_at')
     return render(request, 'events/admin_approval.html', {'events': pending_events})
 
-# --- REVISI APPROVE EVENT (Threading Email) ---
+# --- REVISI APPROVE EVENT (Antrian Email) ---
 @login_required
 def approve_event(request, event_id):
     if not request.user.is_superuser:
@@ -174,9 +265,10 @@ def approve_event(request, event_id):
         
     event = get_object_or_404(Event, id=event_id)
     event.status = 'active'
-    event.save()
+    # Hanya status: counter peserta/pendapatan di instance ini bisa sudah basi
+    event.save(update_fields=['status', 'updated_at'])
     
-    # --- LOGIKA KIRIM EMAIL (THREADING) ---
+    # --- LOGIKA KIRIM EMAIL (ANTRIAN JOB) ---
     subject = f"Selamat! Event '{event.title}' Telah Disetujui"
     message = (
         f"Halo {event.organizer.username},\n\n"
@@ -189,39 +281,220 @@ def approve_event(request, event_id):
     )
     recipient_list = [event.organizer.email]
     
-    # JALANKAN DI BACKGROUND (Agar server tidak hang)
-    email_thread = threading.Thread(
-        target=send_email_thread,
-        args=(subject, message, settings.EMAIL_HOST_USER, recipient_list)
-    )
-    email_thread.start()
+    # Masuk antrian (tidak hilang walau worker gunicorn restart)
+    enqueue('send_email', subject, message, settings.EMAIL_HOST_USER, recipient_list)
     # -------------------------------------
 
     messages.success(request, f'Event "{event.title}" berhasil ditayangkan! Notifikasi email sedang dikirim.')
     return redirect('admin_approval_list')
 
-def validate_scan(request, validation_id):
-    participant = get_object_or_404(Participant, validation_id=validation_id)
-    
-    if not request.user.is_authenticated:
+@login_required
+def job_queue_stats(request):
+    if not request.user.is_superuser:
+        return redirect('home')
+    return JsonResponse(queue_stats())
+
+@login_required
+def page_cache_stats(request):
+    if not request.user.is_superuser:
+        return redirect('home')
+    return JsonResponse(pagecache.stats.snapshot())
+
+def metrics_endpoint(request):
+    # Bukan @login_required: scraper Prometheus memakai header Authorization: Bearer <METRICS_TOKEN>
+    token = settings.METRICS_TOKEN
+    auth = request.headers.get('Authorization', '')
+    allowed = request.user.is_superuser or (
+        token and hmac.compare_digest(auth.encode(), f'Bearer {token}'.encode())
+    )
+    if not allowed:
+        return HttpResponse("Forbidden", status=403, content_type='text/plain')
+    return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@never_cache
+def readiness(request):
+    # Dipanggil health check platform setelah worker start; tanpa login, tanpa detail sensitif
+    ready, report = warmup.readiness()
+    return JsonResponse(report, status=200 if ready else 503)
+
+async def validate_scan(request, validation_id):
+    participant = await aget_object_or_404(Participant.objects.select_related('event'), validation_id=validation_id)
+
+    if not (await request.auser()).is_authenticated:
         return redirect('account_login')
 
     context = {
         'participant': participant,
         'event': participant.event
     }
-    return render(request, 'events/scan_result.html', context)
+    return await sync_to_async(render)(request, 'events/scan_result.html', context)
 
-def check_ticket(request):
+# --- API CHECK-IN (scanner di pintu masuk) ---
+def _json_body(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def _scanner_api(view):
+    """
+    Auth endpoint scanner. Perangkat scanner: header `Authorization: Bearer <token>`
+    (token dari /api/scanner-token/), tanpa cookie sehingga tanpa CSRF. Tanpa header:
+    sesi login browser biasa, CSRF tetap dicek. Tidak login -> 401 JSON, bukan redirect.
+    """
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer':
+            user = checkin.scanner_user(token.strip())
+            if user is None:
+                return JsonResponse({'status': 'unauthenticated'}, status=401)
+            request.user = user
+        elif not request.user.is_authenticated:
+            return JsonResponse({'status': 'unauthenticated'}, status=401)
+        else:
+            rejected = CsrfViewMiddleware(view).process_view(request, None, (), {})
+            if rejected is not None:
+                return rejected
+        return view(request, *args, **kwargs)
+    return wrapper
+
+@login_required
+@never_cache
+def scanner_token(request):
+    """Token untuk perangkat scanner; dibuka organizer yang sedang login (mis. lalu dipindai ke aplikasi scanner)."""
+    return JsonResponse({
+        'token': checkin.issue_scanner_token(request.user),
+        'expires_in': settings.SCANNER_TOKEN_MAX_AGE,
+    })
+
+@require_POST
+@_scanner_api
+def api_checkin(request):
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({'status': checkin.INVALID}, status=400)
+    result = checkin.check_in(request.user, data.get('validation_id'), data.get('scanned_at'), data.get('device', ''))
+    return JsonResponse(result, status=checkin.HTTP_STATUS[result['status']])
+
+@require_POST
+@_scanner_api
+def api_checkin_batch(request):
+    data = _json_body(request)
+    scans = data.get('scans') if data else None
+    if not isinstance(scans, list) or not all(isinstance(s, dict) for s in scans):
+        return JsonResponse({'status': checkin.INVALID}, status=400)
+    if len(scans) > checkin.MAX_BATCH:
+        return JsonResponse({'status': checkin.INVALID, 'error': f'Maksimal {checkin.MAX_BATCH} scan per batch'}, status=400)
+    results = checkin.check_in_many(request.user, scans, data.get('device', ''))
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return JsonResponse({'summary': summary, 'results': results})
+
+# --- TIKET OFFLINE (manifest & sinkronisasi scanner) ---
+@_scanner_api
+def ticket_manifest(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    if not checkin.can_check_in(request.user, event):
+        return JsonResponse({'status': checkin.FORBIDDEN}, status=403)
+    manifest = tickets.build_manifest(event)
+    # ETag dari isi filter (bukan generated_at) agar scanner cukup revalidasi
+    digest = hashlib.sha256(json.dumps([manifest['valid'], manifest['checked_in']]).encode()).hexdigest()[:32]
+    etag_value = f'"manifest-{event.id}-{digest}"'
+    if request.headers.get('If-None-Match') == etag_value:
+        response = HttpResponse(status=304)
+    else:
+        response = JsonResponse(manifest)
+    response['ETag'] = etag_value
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+@require_POST
+@_scanner_api
+def api_checkin_sync(request):
+    """Unggah check-in offline: {'device': ..., 'scans': [{'token': ..., 'scanned_at': ...}]}."""
+    data = _json_body(request)
+    scans = data.get('scans') if data else None
+    if not isinstance(scans, list) or not all(isinstance(s, dict) for s in scans):
+        return JsonResponse({'status': checkin.INVALID}, status=400)
+    if len(scans) > checkin.MAX_BATCH:
+        return JsonResponse({'status': checkin.INVALID, 'error': f'Maksimal {checkin.MAX_BATCH} scan per batch'}, status=400)
+
+    # Token palsu ditolak sebelum menyentuh DB; scan offline boleh diunggah setelah tiket kedaluwarsa
+    normalized = []
+    for scan in scans:
+        try:
+            claims = tickets.read_token(str(scan.get('token', '')), check_expiry=False)
+        except tickets.InvalidTicket:
+            normalized.append({'validation_id': None})
+            continue
+        normalized.append({'validation_id': claims.validation_id, 'scanned_at': scan.get('scanned_at')})
+    results = checkin.check_in_many(request.user, normalized, data.get('device', ''))
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    return JsonResponse({'summary': summary, 'results': results})
+
+def _qr_token(request, validation_id):
+    """Token dari ?t= jika tanda tangannya sah dan milik tiket ini (tanpa query DB)."""
+    token = request.GET.get('t')
+    if not token:
+        return None
+    try:
+        claims = tickets.read_token(token, check_expiry=False)
+    except tickets.InvalidTicket:
+        raise Http404
+    if claims.validation_id != validation_id:
+        raise Http404
+    return token
+
+def _qr_etag(request, validation_id, fmt):
+    if fmt in qr.CONTENT_TYPES:
+        return qr.qr_etag(validation_id, fmt, request.GET.get('t'))
+    return None
+
+# Isi QR ditentukan penuh oleh URL (validation_id + token) -> cache 1 tahun
+@cache_control(public=True, max_age=31536000, immutable=True)
+@etag(_qr_etag)
+def ticket_qr(request, validation_id, fmt):
+    if fmt not in qr.CONTENT_TYPES:
+        raise Http404
+    token = _qr_token(request, validation_id)
+    # Token sah sudah membuktikan tiket ini kita terbitkan; tanpa token cek ke DB
+    if token is None and not Participant.objects.filter(validation_id=validation_id).exists():
+        raise Http404
+    return HttpResponse(qr.get_qr(validation_id, fmt, token), content_type=qr.CONTENT_TYPES[fmt])
+
+async def _check_ticket_validators(request):
+    email = request.GET.get('email')
+    if not email:
+        return None
+    stats = await Participant.objects.for_email(email).aaggregate(
+        last=Max('updated_at'), event_last=Max('event__updated_at'), total=Count('id'),
+    )
+    last = max(filter(None, [stats['last'], stats['event_last']]), default=None)
+    return last, ('tiket', email.lower(), stats['total'])
+
+@conditional_page(_check_ticket_validators)
+async def check_ticket(request):
     results = None
-    email_query = ''
-    
+    # GET (?email=) agar hasil bisa divalidasi ulang dengan ETag; POST tetap didukung
     if request.method == 'POST':
-        email_query = request.POST.get('email')
-        if email_query:
-            results = Participant.objects.filter(email__iexact=email_query).order_by('-registered_at')
-    
-    return render(request, 'events/check_ticket.html', {
+        email_query = request.POST.get('email', '')
+    else:
+        email_query = request.GET.get('email', '')
+
+    if email_query:
+        results = [
+            participant async for participant in Participant.objects.for_email(email_query)
+            .select_related('event')
+            .order_by('-registered_at')
+        ]
+
+    return await sync_to_async(render)(request, 'events/check_ticket.html', {
         'results': results,
         'email_query': email_query
     })
@@ -231,40 +504,65 @@ def verify_payment(request, participant_id):
     participant = get_object_or_404(Participant, id=participant_id)
     
     if request.user == participant.event.organizer or request.user.is_superuser:
-        participant.is_verified = True
-        participant.save()
+        # Update bersyarat: counter hanya naik sekali walau tombol diklik berkali-kali
+        payments.verify_participants(request.user, participant.event_id, [participant.pk])
         messages.success(request, f"Pembayaran atas nama {participant.full_name} berhasil diverifikasi!")
     else:
         messages.error(request, "Anda tidak memiliki izin.")
         
     return redirect('event_participants', event_id=participant.event.id)
 
+@require_POST
+def verify_payments_bulk(request, event_id):
+    """Verifikasi banyak peserta sekaligus (checkbox di halaman peserta). Return ringkasan JSON."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'status': 'unauthenticated'}, status=401)
+    data = _json_body(request) if request.content_type == 'application/json' else None
+    raw_ids = data.get('ids') if data else request.POST.getlist('ids')
+    if not isinstance(raw_ids, list):
+        return JsonResponse({'error': 'ids harus berupa list'}, status=400)
+    try:
+        ids = [int(pk) for pk in raw_ids]
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'ids harus berupa angka'}, status=400)
+    if not ids:
+        return JsonResponse({'error': 'Pilih minimal satu peserta'}, status=400)
+    if len(ids) > payments.MAX_BULK_VERIFY:
+        return JsonResponse({'error': f'Maksimal {payments.MAX_BULK_VERIFY} peserta per request'}, status=400)
+    return JsonResponse(payments.verify_participants(request.user, event_id, ids))
+
+def _streaming_response(request, chunks, content_type, batch=None):
+    # ASGI: iterator async, agar output tidak dikumpulkan seluruhnya di memori sebelum dikirim
+    if isinstance(request, ASGIRequest):
+        chunks = exports.aiterate(chunks, batch)
+    return StreamingHttpResponse(chunks, content_type=content_type)
+
 @login_required
 def export_participants_xls(request, event_id):
     event = get_object_or_404(Event, id=event_id)
     if event.organizer != request.user and not request.user.is_superuser:
         return redirect('home')
 
-    response = HttpResponse(content_type='application/ms-excel')
-    response['Content-Disposition'] = f'attachment; filename="Peserta-{event.slug}.xlsx"'
-
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Daftar Peserta"
-
-    headers = ['Nama Lengkap', 'Email', 'No HP', 'Instansi', 'Status Bayar', 'Tgl Daftar']
-    ws.append(headers)
-
-    participants = event.participants.all()
-    for p in participants:
-        status = "Lunas" if p.is_verified else "Pending"
-        tgl = p.registered_at.replace(tzinfo=None) 
-        ws.append([p.full_name, p.email, p.phone, p.institution, status, tgl])
+    # ?format=csv / ?format=ndjson untuk data besar; default tetap Excel
+    fmt = request.GET.get('format', 'xlsx')
+    if fmt not in exports.CONTENT_TYPES:
+        fmt = 'xlsx'
+    filename = f"Peserta-{event.slug}.{fmt}"
+
+    if fmt == 'xlsx':
+        return FileResponse(
+            exports.xlsx_file(event),
+            as_attachment=True,
+            filename=filename,
+            content_type=exports.CONTENT_TYPES[fmt],
+        )
 
-    wb.save(response)
+    rows = exports.stream_csv(event) if fmt == 'csv' else exports.stream_ndjson(event)
+    response = _streaming_response(request, rows, exports.CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
-# --- REVISI BLAST EMAIL (Threading) ---
+# --- REVISI BLAST EMAIL (Antrian Job) ---
 @login_required
 def blast_email(request, event_id):
     event = get_object_or_404(Event, id=event_id)
@@ -274,32 +572,48 @@ def blast_email(request, event_id):
     if request.method == 'POST':
         form = BlastEmailForm(request.POST)
         if form.is_valid():
-            subject = form.cleaned_data['subject']
-            message = form.cleaned_data['message']
-            
-            emails = list(event.participants.values_list('email', flat=True))
+            total = event.participants.count()
             
-            if emails:
-                # JALANKAN DI BACKGROUND
-                # Kirim email sekaligus tanpa membuat loading lama
-                email_thread = threading.Thread(
-                    target=send_email_thread,
-                    args=(subject, message, settings.EMAIL_HOST_USER, emails)
+            if total:
+                # Dikirim per peserta oleh worker (lihat events/blast.py)
+                campaign = BlastCampaign.objects.create(
+                    event=event,
+                    subject=form.cleaned_data['subject'],
+                    message=form.cleaned_data['message'],
+                    total=total,
                 )
-                email_thread.start()
+                enqueue('send_blast', campaign.id)
                 
-                messages.success(request, f"Proses pengiriman email ke {len(emails)} peserta sedang berjalan di latar belakang.")
+                messages.success(request, f"Proses pengiriman email ke {total} peserta sedang berjalan di latar belakang.")
+                return redirect('blast_email', event_id=event.id)
             else:
                 messages.warning(request, "Belum ada peserta di event ini.")
             return redirect('organizer_dashboard')
     else:
         form = BlastEmailForm()
 
-    return render(request, 'events/blast_email.html', {'form': form, 'event': event})
+    campaigns = event.blasts.order_by('-created_at')[:5]
+    return render(request, 'events/blast_email.html', {'form': form, 'event': event, 'campaigns': campaigns})
+
+@login_required
+def blast_status(request, campaign_id):
+    campaign = get_object_or_404(BlastCampaign.objects.select_related('event'), id=campaign_id)
+    if campaign.event.organizer != request.user:
+        return JsonResponse({'error': 'Akses ditolak'}, status=403)
+
+    return JsonResponse({
+        'id': campaign.id,
+        'status': campaign.status,
+        'total': campaign.total,
+        'sent': campaign.sent,
+        'failed': campaign.failed,
+        'progress': campaign.progress,
+        'failures': campaign.failures[:50],
+    })
 
 @login_required
 def generate_certificate(request, validation_id):
-    participant = get_object_or_404(Participant, validation_id=validation_id)
+    participant = get_object_or_404(Participant.objects.select_related('event'), validation_id=validation_id)
 
     if participant.email != request.user.email:
         return HttpResponse("Akses Ditolak: Email tidak cocok dengan akun login.", status=403)
@@ -310,54 +624,32 @@ def generate_certificate(request, validation_id):
     if not participant.is_verified:
         return HttpResponse("Maaf, sertifikat hanya untuk peserta yang sudah terverifikasi.", status=403)
 
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=landscape(A4))
-    width, height = landscape(A4)
-
-    bg_filename = 'sertifikat_bg.png' 
-    bg_path = os.path.join(settings.BASE_DIR, 'events',  'static', 'images', bg_filename)
-
-    if os.path.exists(bg_path):
-        c.drawImage(bg_path, 0, 0, width=width, height=height)
-    else:
-        c.setFillColor(HexColor("#cccccc"))
-        c.rect(0, 0, width, height, fill=1)
-
-    c.setFont("Helvetica-Bold", 36)
-    c.setFillColor(HexColor("#1a1a1a")) 
-    c.drawCentredString(width/2, height - 130, "SERTIFIKAT PENGHARGAAN")
-
-    c.setFont("Helvetica", 14)
-    c.setFillColor(HexColor("#555555")) 
-    c.drawCentredString(width/2, height - 170, "No. ID: " + participant.get_certificate_id())
-    c.drawCentredString(width/2, height - 210, "Diberikan kepada:")
-
-    c.setFont("Helvetica-Bold", 42)
-    c.setFillColor(HexColor("#000000")) 
-    c.drawCentredString(width/2, height/2 + 10, participant.full_name.upper())
-
-    c.setLineWidth(1)
-    c.line(width/2 - 150, height/2, width/2 + 150, height/2)
-
-    c.setFont("Helvetica", 16)
-    c.setFillColor(HexColor("#333333"))
-    c.drawCentredString(width/2, height/2 - 40, "Atas partisipasinya sebagai Peserta dalam acara:")
-
-    c.setFont("Helvetica-Bold", 24)
-    c.setFillColor(HexColor("#1e3a8a")) 
-    c.drawCentredString(width/2, height/2 - 80, participant.event.title)
-
-    tanggal_str = participant.event.date_time.strftime("%d %B %Y")
-    c.setFont("Helvetica", 12)
-    c.setFillColor(HexColor("#555555"))
-    c.drawCentredString(width/2, height/2 - 110, f"Dilaksanakan pada: {tanggal_str}")
-
-    c.showPage()
-    c.save()
-    buffer.seek(0)
+    buffer = io.BytesIO(certificates.certificate_pdf(participant))
     filename = f"Sertifikat-{participant.full_name}.pdf"
     return FileResponse(buffer, as_attachment=True, filename=filename)
 
+@login_required
+def download_certificates_zip(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    if event.organizer != request.user and not request.user.is_superuser:
+        return redirect('home')
+    if event.status != 'finished':
+        return HttpResponse("Sertifikat baru tersedia setelah acara selesai.", status=403)
+
+    participants = (
+        event.participants.filter(is_verified=True)
+        .only('id', 'full_name', 'registered_at')
+        .order_by('id')
+    )
+    items = [
+        (f"Sertifikat-{p.get_certificate_id()}.pdf", certificates.certificate_data(p, event))
+        for p in participants.iterator()
+    ]
+    # Satu sertifikat per giliran: PDF jauh lebih besar dari baris CSV
+    response = _streaming_response(request, certificates.stream_zip(items), 'application/zip', batch=1)
+    response['Content-Disposition'] = f'attachment; filename="Sertifikat-{event.slug}.zip"'
+    return response
+
 @login_required
 def participant_dashboard(request):
     my_activities = Participant.objects.filter(email=request.user.email).order_by('-registered_at')
@@ -371,7 +663,7 @@ def finish_event(request, event_id):
         return redirect('home')
     
     event.status = 'finished'
-    event.save()
+    event.save(update_fields=['status', 'updated_at'])
     
     messages.success(request, f"Event '{event.title}' telah ditandai SELESAI. Sertifikat kini dapat diakses peserta.")
     return redirect('organizer_dashboard')
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Readiness & pemanasan worker (endpoint /ready/).
+
+Boot worker sengaja ringan: openpyxl, reportlab, qrcode dan Pillow baru di-import
+saat fiturnya dipakai. Sisa kerja "request pertama" (membuka koneksi DB, mengompilasi
+template halaman publik, membangun matcher blacklist) dikerjakan di sini, sekali per
+proses, saat health check platform (Render) memanggil /ready/ setelah worker start.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.template.loader import get_template
+
+from . import blacklist
+
+# Template yang dirender request anonim (share link, halaman depan)
+TEMPLATES = (
+    'events/base.html',
+    'events/index.html',
+    'events/event_detail.html',
+    'events/_event_card.html',
+    'events/_event_info.html',
+    'events/success.html',
+)
+
+_lock = threading.Lock()
+_warmed = False
+
+
+def check_database():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def check_cache():
+    cache.set('ready:ping', 1, 10)
+    if cache.get('ready:ping') != 1:
+        raise RuntimeError("cache tidak bisa dibaca")
+
+
+CHECKS = {'database': check_database, 'cache': check_cache}
+
+
+def warm():
+    """Sekali per proses. Return durasi (ms), atau None jika sudah hangat."""
+    global _warmed
+    if _warmed:
+        return None
+    with _lock:
+        if _warmed:
+            return None
+        start = time.perf_counter()
+        for name in TEMPLATES:
+            get_template(name)
+        blacklist.get_matcher()
+        _warmed = True
+        return round((time.perf_counter() - start) * 1000, 2)
+
+
+def readiness():
+    """Return (siap?, laporan). Pemanasan hanya dijalankan jika semua cek lolos."""
+    checks = {}
+    for name, check in CHECKS.items():
+        try:
+            check()
+            checks[name] = 'ok'
+        except (DatabaseError, RuntimeError, OSError) as exc:
+            checks[name] = f'error: {exc.__class__.__name__}'
+    ready = all(status == 'ok' for status in checks.values())
+    return ready, {
+        'status': 'ok' if ready else 'unavailable',
+        'checks': checks,
+        'warmup_ms': warm() if ready else None,
+    }